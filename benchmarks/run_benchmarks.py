@@ -0,0 +1,362 @@
+# Synthetic-load benchmarks for taskflow-v1.py.
+#
+#     python benchmarks/run_benchmarks.py --sizes 100 1000 10000 100000 --members 50
+#
+# For each plan size a fresh worker process builds a SQLite database with two
+# plans of that many tasks spread over --members team members, then drives the
+# app headlessly with Streamlit's AppTest through these scenarios:
+#
+#   load         first render of a plan (cold task model)
+#   rerun        a plain rerun with nothing changed
+#   grid_filter  changing the Grid status filter and search
+#   grid_edit    a Grid cell edit (the editor's widget state is injected, since
+#                AppTest cannot drive st.data_editor directly)
+#   board_move   moving one card on the Board
+#   timeline     moving the Timeline's visible date window (rebuilds the Gantt figure)
+#   switch       switching between the two plans
+#   ai_generate  generating tasks against a local fake AI endpoint
+#
+# Each interaction is timed end to end (all reruns it triggers). The report
+# gives latency percentiles per scenario, the worker's peak RSS, per-scenario
+# peak traced memory (--trace-memory) and per-section latencies from the
+# app's own profiling spans (tab.grid, charts.build, timeline.build, ...).
+#
+# Results are written to benchmarks/results/<time>-<commit>.json. Pass
+# --compare <results file> (or keep a benchmarks/baseline.json, written with
+# --save-baseline) to flag scenarios whose p50 or p95 latency regressed by
+# more than --threshold; the exit status is 1 when any did.
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCHMARK_DIR.parent
+APP_PATH = REPO_DIR / 'taskflow-v1.py'
+RESULTS_DIR = BENCHMARK_DIR / 'results'
+BASELINE_PATH = BENCHMARK_DIR / 'baseline.json'
+
+SCENARIOS = ['load', 'rerun', 'grid_filter', 'grid_edit', 'board_move', 'timeline', 'switch', 'ai_generate']
+PLAN_NAMES = ['Bench A', 'Bench B']
+STATUSES = ['To Do', 'In Progress', 'Completed']
+PERCENTILES = [50, 90, 95, 99]
+
+
+# Local stand-in for the AI endpoint: answers every prompt with a fixed task
+# list after a configurable delay
+class FakeAIHandler(BaseHTTPRequestHandler):
+    delay = 0.05
+    tasks = [f"Generated task {i}" for i in range(10)]
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.delay)
+        body = json.dumps({'text': json.dumps(self.tasks)}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_fake_ai(delay):
+    FakeAIHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Create two plans of size tasks through the app's own store, so the search
+# index, revisions and plan history are set up as for plans made in the app
+def populate(db_path, size, members, seed):
+    from taskflow.schema import tasks_frame
+    from taskflow.storage import SQLiteTaskStore
+
+    rng = random.Random(seed)
+    first_day = date(2024, 1, 1)
+    store = SQLiteTaskStore(db_path)
+    for plan in PLAN_NAMES:
+        store.save_plan(plan, {'privacy': 'Shared', 'last_accessed': datetime.now(), 'shared_with': [], 'template': 'Custom',
+                               'pinned': False, 'group': None, 'ai_assisted': True})
+        rows = []
+        for i in range(size):
+            status = rng.choice(STATUSES)
+            if rng.random() < 0.8:
+                start = first_day + timedelta(days=rng.randrange(365))
+                start_date, end_date = start, start + timedelta(days=rng.randrange(1, 30))
+            else:
+                start_date = end_date = None
+            rows.append((f"{plan} task {i}", status, rng.choice(members), status == 'Completed', start_date, end_date))
+        store.add_tasks(plan, tasks_frame(rows, members=members))
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    summary = {f'p{p}': ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))] for p in PERCENTILES}
+    summary.update(mean=sum(ordered) / len(ordered), max=ordered[-1], count=len(ordered))
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+# Drives one AppTest session through the scenarios and collects timings
+class AppDriver:
+    def __init__(self, members, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.at.session_state['team_members'] = members
+        self.step = 0
+
+    # Time one interaction; returns milliseconds
+    def timed(self, interaction):
+        start = time.perf_counter()
+        interaction()
+        elapsed = (time.perf_counter() - start) * 1000
+        for exception in self.at.exception:
+            raise RuntimeError(f"app raised: {exception.value}\n{exception.stack_trace}")
+        return elapsed
+
+    def select_plan(self, plan):
+        self.at.selectbox(key='select_plan_Recent').select(plan).run()
+
+    def rerun(self):
+        self.at.run()
+
+    def grid_filter(self):
+        self.step += 1
+        self.at.selectbox(key='grid_status').select((['All'] + STATUSES)[self.step % 4])
+        self.at.text_input(key='grid_search').input(str(self.step % 10) if self.step % 2 else "").run()
+
+    def grid_edit(self):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self.step += 1
+        editor = next(element for element in self.at.get('arrow_data_frame') if element.proto.id)
+        states = self.at._tree.get_widget_states()
+        edit = WidgetState(id=editor.proto.id)
+        edit.string_value = json.dumps({
+            'edited_rows': {str(self.step % max(1, len(editor.value))): {'Status': STATUSES[self.step % 3]}},
+            'added_rows': [],
+            'deleted_rows': []
+        })
+        states.widgets.append(edit)
+        self.at._run(states)
+
+    def board_move(self):
+        self.step += 1
+        moves = [element for element in self.at.selectbox if element.key and element.key.startswith('move_')]
+        card = moves[self.step % len(moves)]
+        card.select(STATUSES[(STATUSES.index(card.value) + 1) % 3])
+        next(button for button in self.at.button if button.label == 'Apply Moves').click().run()
+
+    def timeline(self):
+        self.step += 1
+        window_start = date(2024, 1, 1) + timedelta(days=(self.step * 17) % 330)
+        window = next(element for element in self.at.date_input if element.key and element.key.startswith('timeline_window_'))
+        window.set_value((window_start, window_start + timedelta(days=30))).run()
+
+    def switch(self):
+        self.step += 1
+        self.select_plan(PLAN_NAMES[self.step % 2])
+
+    def ai_generate(self):
+        self.step += 1
+        self.at.text_area[0].input(f"Benchmark goal {self.step} {time.time()}")
+        next(button for button in self.at.button if button.label == 'Generate Tasks from Goal').click().run()
+        # AppTest doesn't run the progress fragment on its timer; poll with full runs
+        while self.at.session_state['ai_job'] is not None or not self.at.session_state['generated_tasks']:
+            time.sleep(0.02)
+            self.at.run()
+        # Dismiss the generated tasks; this also leaves a complete element tree
+        # (the tree of a run ended by st.rerun is partial under AppTest)
+        self.at.session_state['generated_tasks'] = []
+        self.at.run()
+
+
+# Runs in a fresh process per plan size, so caches and peak RSS are per size
+def run_worker(args):
+    work_dir = tempfile.mkdtemp(prefix='taskflow-bench-')
+    spans_path = os.path.join(work_dir, 'spans.jsonl')
+    fake_ai = start_fake_ai(args.ai_delay)
+    os.environ.update({
+        'TASKFLOW_DB_PATH': os.path.join(work_dir, 'bench.db'),
+        'TASKFLOW_STORE': 'sqlite',
+        'TASKFLOW_AI_URL': f"http://127.0.0.1:{fake_ai.server_address[1]}/generate",
+        'TASKFLOW_AI_POLL_SECONDS': '0.02',
+        'TASKFLOW_PROFILE': '1',
+        'TASKFLOW_PROFILE_LOG': spans_path
+    })
+    sys.path.insert(0, str(REPO_DIR))
+    members = ['Project Manager'] + [f"Member {i}" for i in range(1, args.members)] + ['Unassigned']
+
+    start = time.perf_counter()
+    populate(os.environ['TASKFLOW_DB_PATH'], args.size, members, args.seed)
+    populate_ms = (time.perf_counter() - start) * 1000
+
+    driver = AppDriver(members, args.timeout)
+    driver.at.run()
+    scenario_results = {}
+    span_marks = {}
+
+    def measure(name, interaction, iterations):
+        if args.trace_memory:
+            tracemalloc.start()
+        span_marks[name] = time.time()
+        samples = [driver.timed(interaction) for _ in range(iterations)]
+        result = {'latency_ms': percentiles(samples)}
+        if args.trace_memory:
+            result['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            tracemalloc.stop()
+        scenario_results[name] = result
+
+    selected = [scenario for scenario in SCENARIOS if scenario in args.scenarios]
+    if 'load' in selected:
+        measure('load', lambda: driver.select_plan(PLAN_NAMES[0]), 1)
+    else:
+        driver.select_plan(PLAN_NAMES[0])
+    for scenario in selected:
+        if scenario != 'load':
+            measure(scenario, getattr(driver, scenario), args.iterations)
+
+    with open(spans_path, encoding='utf-8') as spans_file:
+        spans = [json.loads(line) for line in spans_file]
+    sections = {}
+    for record in spans:
+        sections.setdefault(record['name'], []).append(record['duration_ms'])
+    fake_ai.shutdown()
+    return {
+        'size': args.size,
+        'members': args.members,
+        'populate_ms': round(populate_ms, 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'scenarios': scenario_results,
+        'sections': {name: percentiles(samples) for name, samples in sorted(sections.items())}
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def environment():
+    import pandas
+    import streamlit
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'streamlit': streamlit.__version__,
+        'pandas': pandas.__version__,
+        'cpus': os.cpu_count()
+    }
+
+def print_report(results):
+    print(f"\n{'size':>8} {'scenario':<12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'peak MB':>9}")
+    for run in results['runs']:
+        for scenario, result in run['scenarios'].items():
+            latency = result['latency_ms']
+            peak = result.get('peak_traced_mb', run['peak_rss_mb'])
+            print(f"{run['size']:>8} {scenario:<12} {latency['p50']:>10.1f} {latency['p95']:>10.1f} {latency['max']:>10.1f} {peak:>9.1f}")
+    print("\nSlowest sections (p95 ms):")
+    for run in results['runs']:
+        slowest = sorted(run['sections'].items(), key=lambda item: item[1]['p95'], reverse=True)[:6]
+        print(f"  {run['size']:>8}: " + ", ".join(f"{name} {summary['p95']:.1f}" for name, summary in slowest))
+
+# Regressions of p50/p95 beyond threshold against a previous results file
+def compare(results, previous, threshold):
+    previous_runs = {run['size']: run for run in previous['runs']}
+    regressions = []
+    print(f"\nCompared with {previous.get('commit', '?')} ({previous.get('timestamp', '?')}):")
+    for run in results['runs']:
+        old_run = previous_runs.get(run['size'])
+        if old_run is None:
+            continue
+        for scenario, result in run['scenarios'].items():
+            old_result = old_run['scenarios'].get(scenario)
+            if old_result is None:
+                continue
+            for stat in ('p50', 'p95'):
+                old, new = old_result['latency_ms'][stat], result['latency_ms'][stat]
+                ratio = new / old if old else 1.0
+                flag = ''
+                if ratio > 1 + threshold:
+                    flag = '  REGRESSION'
+                    regressions.append((run['size'], scenario, stat, old, new))
+                print(f"  {run['size']:>8} {scenario:<12} {stat}: {old:>9.1f} -> {new:>9.1f} ms ({ratio:.2f}x){flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic-load benchmarks for the TaskFlow app")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000], help="tasks per plan")
+    parser.add_argument('--members', type=int, default=50, help="team members tasks are spread over")
+    parser.add_argument('--iterations', type=int, default=20, help="interactions per scenario")
+    parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument('--ai-delay', type=float, default=0.05, help="fake AI response delay in seconds")
+    parser.add_argument('--trace-memory', action='store_true', help="per-scenario peak memory with tracemalloc (slower)")
+    parser.add_argument('--timeout', type=float, default=600, help="AppTest timeout per rerun in seconds")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', type=Path, default=RESULTS_DIR, help="directory for results files")
+    parser.add_argument('--compare', type=Path, help="results file to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown reported as a regression")
+    parser.add_argument('--save-baseline', action='store_true', help="also write the results to benchmarks/baseline.json")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        with open(args.result_file, 'w', encoding='utf-8') as result_file:
+            json.dump(run_worker(args), result_file)
+        return 0
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'environment': environment(),
+        'parameters': {key: value for key, value in vars(args).items() if key in ('members', 'iterations', 'scenarios', 'ai_delay', 'seed')},
+        'runs': []
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size} tasks per plan...", flush=True)
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as result_file:
+            result_path = result_file.name
+        command = [sys.executable, __file__, '--worker', '--size', str(size), '--result-file', result_path,
+                   '--members', str(args.members), '--iterations', str(args.iterations), '--scenarios', *args.scenarios,
+                   '--ai-delay', str(args.ai_delay), '--timeout', str(args.timeout), '--seed', str(args.seed)]
+        if args.trace_memory:
+            command.append('--trace-memory')
+        subprocess.run(command, check=True, cwd=REPO_DIR)
+        with open(result_path, encoding='utf-8') as result_file:
+            results['runs'].append(json.load(result_file))
+        os.unlink(result_path)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    output_path = args.output / f"{datetime.now():%Y%m%d-%H%M%S}-{results['commit']}.json"
+    output_path.write_text(json.dumps(results, indent=2))
+    print_report(results)
+    print(f"\nResults written to {output_path}")
+
+    regressions = []
+    compare_path = args.compare or (BASELINE_PATH if BASELINE_PATH.exists() else None)
+    if compare_path is not None:
+        regressions = compare(results, json.loads(compare_path.read_text()), args.threshold)
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {BASELINE_PATH}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
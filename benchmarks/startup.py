@@ -0,0 +1,97 @@
+# Cold-start benchmark for taskflow-v1.py.
+#
+#     python benchmarks/startup.py --repeat 5 --target-ms 400
+#
+# Each repetition starts a fresh Python process against an empty database and
+# measures the import of the app, the first full render with Streamlit's
+# AppTest and the process's peak RSS. It also records which heavy libraries
+# (plotly.express, PyPDF2, requests) the first render pulled in; they are
+# only needed once a chart is drawn, a PDF is read or an AI request is made.
+# The exit status is 1 when the median first render misses --target-ms
+# (default TASKFLOW_STARTUP_TARGET_MS, 400 ms). Importing Streamlit itself is
+# reported separately, since the app cannot make it faster.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCHMARK_DIR.parent
+APP_PATH = REPO_DIR / 'taskflow-v1.py'
+HEAVY_MODULES = ['plotly.express', 'PyPDF2', 'requests']
+
+
+# Runs in a fresh process: one cold start
+def run_once(args):
+    import resource
+    import time
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_ms = (time.perf_counter() - start) * 1000
+
+    sys.path.insert(0, str(REPO_DIR))
+    start = time.perf_counter()
+    at = AppTest.from_file(str(args.app), default_timeout=args.timeout).run()
+    first_render_ms = (time.perf_counter() - start) * 1000
+    for exception in at.exception:
+        raise RuntimeError(f"app raised: {exception.value}")
+    start = time.perf_counter()
+    at.run()
+    rerun_ms = (time.perf_counter() - start) * 1000
+    return {
+        'streamlit_import_ms': round(streamlit_ms, 1),
+        'first_render_ms': round(first_render_ms, 1),
+        'rerun_ms': round(rerun_ms, 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in sys.modules]
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure TaskFlow's cold start")
+    parser.add_argument('--repeat', type=int, default=5, help="cold starts to measure")
+    parser.add_argument('--target-ms', type=float, default=float(os.environ.get('TASKFLOW_STARTUP_TARGET_MS', 400)),
+                        help="median first render budget in milliseconds")
+    parser.add_argument('--app', type=Path, default=APP_PATH, help="app script to start")
+    parser.add_argument('--timeout', type=float, default=120, help="AppTest timeout in seconds")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_once(args)))
+        return 0
+
+    runs = []
+    for _ in range(args.repeat):
+        work_dir = tempfile.mkdtemp(prefix='taskflow-startup-')
+        env = dict(os.environ, TASKFLOW_STORE='sqlite', TASKFLOW_DB_PATH=os.path.join(work_dir, 'startup.db'))
+        command = [sys.executable, __file__, '--worker', '--app', str(args.app), '--timeout', str(args.timeout)]
+        output = subprocess.run(command, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            print(output.stderr, file=sys.stderr)
+            return 2
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key in ('streamlit_import_ms', 'first_render_ms', 'rerun_ms', 'peak_rss_mb')
+    }
+    summary['heavy_modules_loaded'] = sorted({name for run in runs for name in run['heavy_modules_loaded']})
+    summary['target_ms'] = args.target_ms
+    summary['within_target'] = summary['first_render_ms'] <= args.target_ms
+    if args.json:
+        print(json.dumps({'runs': runs, 'summary': summary}, indent=2))
+    else:
+        print(f"streamlit import  {summary['streamlit_import_ms']:>8.1f} ms")
+        print(f"first render      {summary['first_render_ms']:>8.1f} ms (target {args.target_ms:.0f} ms)")
+        print(f"rerun             {summary['rerun_ms']:>8.1f} ms")
+        print(f"peak RSS          {summary['peak_rss_mb']:>8.1f} MB")
+        print(f"heavy modules     {', '.join(summary['heavy_modules_loaded']) or 'none'}")
+    return 0 if summary['within_target'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
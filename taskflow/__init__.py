@@ -0,0 +1 @@
+# Helper modules for the TaskFlow Streamlit app (taskflow-v1.py)
@@ -0,0 +1,158 @@
+# Task generation with the AI endpoint. The HTTP client is imported when the
+# first generation starts. File data too large for one prompt is split into
+# chunks (see taskflow/prompts.py) that are generated concurrently, cached one
+# by one and merged, so a re-run only sends the chunks that changed.
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from taskflow.caching import LRUCache
+from taskflow.config import (AI_BACKOFF_SECONDS, AI_MAX_ATTEMPTS, AI_MODEL_PARAMS, AI_RETRY_STATUSES, AI_TIMEOUT,
+                             GOOGLE_AI_STUDIO_API_KEY, GOOGLE_AI_STUDIO_API_URL)
+from taskflow.profiling import profiler
+from taskflow.prompts import build_prompt, chunk_file_data, file_token_budget, merge_tasks
+
+# Raised inside a generation job when the user cancels it
+class GenerationCancelled(Exception):
+    pass
+
+
+# Process-wide AI client state: pooled HTTP session, worker pool and result cache
+@st.cache_resource
+def get_ai_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.environ.get('TASKFLOW_AI_WORKERS', 4)))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_ai_executor():
+    return ThreadPoolExecutor(max_workers=int(os.environ.get('TASKFLOW_AI_WORKERS', 4)), thread_name_prefix="taskflow-ai")
+
+# Chunk requests get their own pool: a job waits for its chunks, so running
+# them on the job pool could leave every worker waiting
+@st.cache_resource
+def get_ai_chunk_executor():
+    return ThreadPoolExecutor(max_workers=int(os.environ.get('TASKFLOW_AI_WORKERS', 4)), thread_name_prefix="taskflow-ai-chunk")
+
+@st.cache_resource
+def get_ai_cache():
+    return LRUCache(maxsize=int(os.environ.get('TASKFLOW_AI_CACHE_SIZE', 256)), ttl=float(os.environ.get('TASKFLOW_AI_CACHE_TTL', 3600)))
+
+# Content-addressed cache key for a generation request
+def generation_cache_key(goal, content, file_digest):
+    key_data = json.dumps([goal, content, file_digest, AI_MODEL_PARAMS, GOOGLE_AI_STUDIO_API_URL], sort_keys=True)
+    return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+# Function to call Google AI Studio API for task generation. Runs on the worker
+# pool: retries transient failures with exponential backoff and stops early
+# when cancel_event is set. Errors are raised to the caller. part is
+# (number, count) when file_data is one chunk of a larger upload.
+def generate_tasks_with_google_ai(goal, content, file_data, session=None, cancel_event=None, part=None):
+    import requests
+    session = session or requests.Session()
+    cancel_event = cancel_event or threading.Event()
+    # Prepare the prompt for the API
+    prompt = build_prompt(goal, content, file_data, part)
+
+    headers = {
+        "Authorization": f"Bearer {GOOGLE_AI_STUDIO_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+    payload = {"prompt": prompt, **AI_MODEL_PARAMS}
+
+    for attempt in range(AI_MAX_ATTEMPTS):
+        if cancel_event.is_set():
+            raise GenerationCancelled()
+        try:
+            with profiler.span('ai.request', attempt=attempt + 1):
+                response = session.post(GOOGLE_AI_STUDIO_API_URL, headers=headers, json=payload, timeout=AI_TIMEOUT)
+            if response.status_code in AI_RETRY_STATUSES and attempt < AI_MAX_ATTEMPTS - 1:
+                raise requests.HTTPError(f"{response.status_code} from AI endpoint", response=response)
+            response.raise_for_status()
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            retryable = not isinstance(e, requests.HTTPError) or e.response.status_code in AI_RETRY_STATUSES
+            if not retryable or attempt == AI_MAX_ATTEMPTS - 1:
+                raise
+            if cancel_event.wait(AI_BACKOFF_SECONDS * 2 ** attempt):
+                raise GenerationCancelled()
+
+    # Parse the response (assuming the API returns JSON with a 'text' field containing the task list)
+    result = response.json()
+    return json.loads(result.get('text', '[]'))  # Parse the task list from the response
+
+# Tasks for one chunk of file data, cached by the chunk's content
+def generate_chunk_tasks(cache, session, goal, content, chunk, part, cancel_event):
+    cache_key = generation_cache_key(goal, content, 'chunk:' + hashlib.sha256(chunk.encode('utf-8')).hexdigest())
+    cached_tasks = cache.get(cache_key)
+    if cached_tasks is not None:
+        return cached_tasks
+    with profiler.span('ai.chunk', part=part[0] if part else 1):
+        tasks = generate_tasks_with_google_ai(goal, content, chunk, session, cancel_event, part)
+    if tasks:
+        cache.put(cache_key, tasks)
+    return tasks
+
+# Cached wrapper run by the worker pool. Shared resources are passed in, since
+# worker threads have no Streamlit script context.
+@profiler.timed('ai.job')
+def run_generation_job(cache, cache_key, session, goal, content, file_data, cancel_event, chunk_executor=None):
+    if isinstance(file_data, dict):
+        file_data = {name: future.result() for name, future in file_data.items() if future.exception() is None}
+    chunks = chunk_file_data(file_data, file_token_budget(goal, content)) or [""]
+    if len(chunks) == 1 or chunk_executor is None:
+        task_lists = [
+            generate_chunk_tasks(cache, session, goal, content, chunk, (number, len(chunks)) if len(chunks) > 1 else None, cancel_event)
+            for number, chunk in enumerate(chunks, 1)
+        ]
+    else:
+        futures = [
+            chunk_executor.submit(profiler.bind(generate_chunk_tasks), cache, session, goal, content, chunk,
+                                  (number, len(chunks)), cancel_event)
+            for number, chunk in enumerate(chunks, 1)
+        ]
+        try:
+            task_lists = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    tasks = merge_tasks(task_lists)
+    if tasks:
+        cache.put(cache_key, tasks)
+    return tasks
+
+# Start generating tasks in the background, or return cached tasks right away.
+# file_data may be a {file name -> extraction Future} dict from the upload spool.
+def start_task_generation(goal, content, file_data, file_digest=""):
+    cache_key = generation_cache_key(goal, content, file_digest)
+    cache = get_ai_cache()
+    cached_tasks = cache.get(cache_key)
+    if cached_tasks is not None:
+        return list(cached_tasks)
+    cancel_event = threading.Event()
+    st.session_state.ai_job = {
+        'future': get_ai_executor().submit(profiler.bind(run_generation_job), cache, cache_key, get_ai_session(), goal, content, file_data,
+                                           cancel_event, get_ai_chunk_executor()),
+        'cancel_event': cancel_event,
+        'started': time.monotonic()
+    }
+    return None
+
+# Cancel the session's running generation job
+def cancel_task_generation():
+    job = st.session_state.get('ai_job')
+    if job:
+        job['cancel_event'].set()
+        job['future'].cancel()
+        st.session_state.ai_job = None
@@ -0,0 +1,97 @@
+# Page layout of the TaskFlow app: sidebar, plan details and tabs. taskflow-v1.py
+# calls main() on every full rerun; the sidebar and each tab are fragments
+# that rerun on their own (see taskflow/fragments.py).
+# Heavy libraries (plotly, PyPDF2, requests) are imported by the code that
+# first needs them.
+import os
+
+import pandas as pd
+import streamlit as st
+
+from taskflow.fragments import active_tab_only, app_run_started, fragment, rerun_app
+from taskflow.plans import get_task_model, init_session
+from taskflow.profiling import current_session_id, profiler
+from taskflow.views import board, charts, diagnostics, goals, grid, history, people, sidebar, timeline, whiteboard
+
+TAB_VIEWS = {
+    "Grid": grid,
+    "Board": board,
+    "Timeline": timeline,
+    "Charts": charts,
+    "Whiteboard": whiteboard,
+    "People": people,
+    "Goals": goals,
+    "History": history,
+    "Diagnostics": diagnostics
+}
+
+
+# One tab as a fragment. Interacting with it reruns only the tab, unless the
+# plan's tasks changed since the last full run (by this tab's callbacks, another
+# session or another server process) while the other tabs, built on the same
+# page, show them too. The model is looked up on every run of the fragment, so
+# a fragment rerun also pulls in other processes' writes.
+@fragment
+def render_tab(view, plan):
+    task_model = get_task_model(plan)
+    if not active_tab_only() and st.session_state.seen_versions.get(plan) != task_model.version:
+        rerun_app()
+    view.render(plan, st.session_state.plans[plan], task_model)
+
+def main():
+    # Copy-on-write lets task snapshots and template clones share memory with
+    # their source frame until one side is modified. It is a process-wide
+    # pandas option, so the app turns it on for its own server process rather
+    # than on import of a taskflow module
+    pd.set_option('mode.copy_on_write', True)
+    profiler.begin_run(current_session_id())
+    app_run_started()
+    init_session()
+
+    # Title and Introduction
+    st.title("Streamlit TaskFlow")
+    st.write("A simple project management tool for your team!")
+
+    with st.sidebar:
+        sidebar.render()
+
+    if st.session_state.current_plan:
+        plan = st.session_state.current_plan
+        plan_data = st.session_state.plans[plan]
+        task_model = get_task_model(plan)
+
+        # Tell the user about changes other sessions made since this session last looked
+        seen_version = st.session_state.seen_versions.get(plan)
+        if seen_version is not None and seen_version < task_model.version:
+            changes = task_model.changes_since(seen_version)
+            if changes is None:
+                st.toast("This plan was updated by other users.")
+            else:
+                updates_from_others = [entry for entry in changes if entry[1] != current_session_id()]
+                if updates_from_others:
+                    st.toast(f"{len(updates_from_others)} update(s) to this plan from other users.")
+        st.session_state.seen_versions[plan] = task_model.version
+        if st.session_state.get('write_conflict'):
+            st.warning(st.session_state.pop('write_conflict'))
+        sidebar.render_plan_details(plan_data)
+
+        # Navigation Tabs (Diagnostics only with TASKFLOW_DIAGNOSTICS=1 or ?diagnostics=1)
+        tabs = ["Grid", "Board", "Timeline", "Charts", "Whiteboard", "People", "Goals", "History"]
+        show_diagnostics = os.environ.get('TASKFLOW_DIAGNOSTICS') == '1' or st.query_params.get('diagnostics') == '1'
+        if show_diagnostics:
+            tabs.append("Diagnostics")
+        if active_tab_only():
+            # Build only the selected tab; switching tabs is a full rerun
+            selected = st.radio("Tab", tabs, horizontal=True, key="active_tab", label_visibility="collapsed")
+            containers = {selected: st.container()}
+        else:
+            containers = dict(zip(tabs, st.tabs(tabs)))
+
+        for name, container in containers.items():
+            with container, profiler.span(f'tab.{name.lower()}'):
+                render_tab(TAB_VIEWS[name], plan)
+
+    else:
+        st.write("Please select a plan to view its details.")
+
+    profiler.end_run()
@@ -0,0 +1,83 @@
+# Shared constants and environment-driven settings for the TaskFlow app
+import os
+
+# Task columns as shown in the UI, mapped to their storage column names
+TASK_COLUMNS = ['Task', 'Status', 'Assigned To', 'Completed', 'Start Date', 'End Date']
+TASK_DB_COLUMNS = {
+    'Task': 'task',
+    'Status': 'status',
+    'Assigned To': 'assigned_to',
+    'Completed': 'completed',
+    'Start Date': 'start_date',
+    'End Date': 'end_date'
+}
+TASK_STATUSES = ['To Do', 'In Progress', 'Completed']
+DEFAULT_TEAM_MEMBERS = ['Unassigned', 'Project Manager', 'Member 1', 'Member 2', 'Member 3']
+AGGREGATE_COLUMNS = ['Status', 'Assigned To', 'Completed']
+PLAN_FIELDS = ['privacy', 'last_accessed', 'shared_with', 'template', 'pinned', 'group', 'ai_assisted']
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_COLUMNS = ['Start Date', 'End Date']
+
+# Entries kept in the shared change logs
+CHANGE_LOG_SIZE = int(os.environ.get('TASKFLOW_CHANGE_LOG_SIZE', 1000))
+
+# Grid pagination, overridable with TASKFLOW_GRID_PAGE_SIZE
+GRID_PAGE_SIZE = int(os.environ.get('TASKFLOW_GRID_PAGE_SIZE', 50))
+GRID_PAGE_SIZES = sorted({25, 50, 100, 250, GRID_PAGE_SIZE})
+
+# Cards per Board column page, overridable with TASKFLOW_BOARD_PAGE_SIZE
+BOARD_PAGE_SIZE = int(os.environ.get('TASKFLOW_BOARD_PAGE_SIZE', 20))
+
+# Define a list of predefined groups
+predefined_groups = [None, 'Contoso', 'Operations Department', 'Leadership', 'Public']
+
+# Google AI Studio API setup (placeholder). The URL can be pointed at a local
+# stub server with TASKFLOW_AI_URL.
+GOOGLE_AI_STUDIO_API_KEY = os.environ.get('GOOGLE_AI_STUDIO_API_KEY', "YOUR_API_KEY_HERE")  # Replace with your API key
+GOOGLE_AI_STUDIO_API_URL = os.environ.get('TASKFLOW_AI_URL', "https://api.googleaistudio.com/v1/models/gemini:generate")  # Placeholder URL
+AI_MODEL_PARAMS = {"max_tokens": 500, "temperature": 0.7}
+AI_TIMEOUT = (float(os.environ.get('TASKFLOW_AI_CONNECT_TIMEOUT', 5)), float(os.environ.get('TASKFLOW_AI_READ_TIMEOUT', 60)))
+AI_MAX_ATTEMPTS = int(os.environ.get('TASKFLOW_AI_MAX_ATTEMPTS', 3))
+AI_BACKOFF_SECONDS = float(os.environ.get('TASKFLOW_AI_BACKOFF_SECONDS', 1))
+AI_POLL_SECONDS = float(os.environ.get('TASKFLOW_AI_POLL_SECONDS', 1))
+AI_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Prompt budget (see taskflow/prompts.py). File data that does not fit in
+# TASKFLOW_AI_PROMPT_TOKENS is split into chunks generated concurrently, at
+# most TASKFLOW_AI_MAX_CHUNKS of them; generated titles at least
+# TASKFLOW_AI_DUPLICATE_SIMILARITY alike are merged.
+AI_PROMPT_TOKENS = int(os.environ.get('TASKFLOW_AI_PROMPT_TOKENS', 3000))
+AI_MIN_CHUNK_TOKENS = 500
+AI_MAX_CHUNKS = int(os.environ.get('TASKFLOW_AI_MAX_CHUNKS', 16))
+AI_CHARS_PER_TOKEN = 4
+AI_DUPLICATE_SIMILARITY = float(os.environ.get('TASKFLOW_AI_DUPLICATE_SIMILARITY', 0.85))
+
+# Uploaded file extraction: text is capped before it goes into the prompt
+MAX_FILE_CHARS = int(os.environ.get('TASKFLOW_MAX_FILE_CHARS', 100000))
+EXTRACTION_PROCESSES = int(os.environ.get('TASKFLOW_EXTRACTION_PROCESSES', max(1, (os.cpu_count() or 2) - 1)))
+
+# Plan templates directory (see taskflow/templates.py)
+TEMPLATE_DIR = os.environ.get('TASKFLOW_TEMPLATE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates'))
+
+# Rows per chunk when importing or exporting plans (see taskflow/transfer.py)
+TRANSFER_CHUNK_ROWS = int(os.environ.get('TASKFLOW_TRANSFER_CHUNK_ROWS', 10000))
+
+# Hits shown by the sidebar search across all plans
+SEARCH_RESULTS = int(os.environ.get('TASKFLOW_SEARCH_RESULTS', 20))
+
+# Plan notes (see taskflow/notes.py): edits are saved at most once per
+# TASKFLOW_NOTE_AUTOSAVE_SECONDS, and a note's revision log is compacted into
+# a snapshot every TASKFLOW_NOTE_COMPACT_REVISIONS saves
+NOTE_AUTOSAVE_SECONDS = float(os.environ.get('TASKFLOW_NOTE_AUTOSAVE_SECONDS', 2))
+NOTE_COMPACT_REVISIONS = int(os.environ.get('TASKFLOW_NOTE_COMPACT_REVISIONS', 50))
+
+# Open dated tasks a member can work on at once before the cross-plan
+# workload report (see taskflow/workload.py) flags them as over-allocated
+WORKLOAD_CAPACITY = int(os.environ.get('TASKFLOW_WORKLOAD_CAPACITY', 1))
+
+# Plan history (see taskflow/history.py): a snapshot of the plan is written
+# once TASKFLOW_HISTORY_SNAPSHOT_CHANGES field changes (or as many as the plan
+# has tasks, if more) have been logged since the last one; the History tab
+# lists the latest TASKFLOW_HISTORY_FEED_SIZE entries
+HISTORY_SNAPSHOT_CHANGES = int(os.environ.get('TASKFLOW_HISTORY_SNAPSHOT_CHANGES', 1000))
+HISTORY_FEED_SIZE = int(os.environ.get('TASKFLOW_HISTORY_FEED_SIZE', 50))
@@ -0,0 +1,111 @@
+# Document text extraction for uploaded files.
+#
+# Files are read from disk (memory-mapped where possible). Text is streamed
+# page by page (PDF) or paragraph by paragraph (DOCX) and collected in a list,
+# stopping as soon as the character cap is reached. Large PDFs are split into
+# page ranges that run on a process pool; the page range worker lives in this
+# module so the pool can import it. PyPDF2 is imported on first use, so
+# starting the app does not pay for it.
+import mmap
+import os
+import zipfile
+from contextlib import contextmanager
+from io import BytesIO
+from xml.etree import ElementTree
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PAGES_PER_JOB = 25
+
+
+# Read-only, memory-mapped view of a file (empty files cannot be mapped)
+@contextmanager
+def open_mapped(path):
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield BytesIO()
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+# Number of pages in a PDF
+def count_pdf_pages(path):
+    import PyPDF2
+    with open_mapped(path) as data:
+        return len(PyPDF2.PdfReader(data).pages)
+
+# Yield the text of each page in [start, stop)
+def iter_pdf_pages(path, start=0, stop=None):
+    import PyPDF2
+    with open_mapped(path) as data:
+        pdf_reader = PyPDF2.PdfReader(data)
+        for page in pdf_reader.pages[start:stop]:
+            yield page.extract_text() or ""
+
+# Process-pool worker: the text of each page in [start, stop)
+def extract_pdf_range(path, start, stop):
+    return list(iter_pdf_pages(path, start, stop))
+
+# Yield the text of each paragraph of a .docx file, parsing document.xml incrementally
+def iter_docx_paragraphs(path):
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        parts = []
+        for event, element in ElementTree.iterparse(document, events=('end',)):
+            if element.tag == f'{WORD_NAMESPACE}t':
+                parts.append(element.text or "")
+            elif element.tag == f'{WORD_NAMESPACE}tab':
+                parts.append("\t")
+            elif element.tag == f'{WORD_NAMESPACE}p':
+                yield "".join(parts)
+                parts = []
+                element.clear()
+
+# Yield page texts, fanning page ranges out to the process pool for large PDFs.
+# Ranges are consumed in order, and unstarted ranges are cancelled once the
+# caller stops iterating.
+def iter_pdf_text(path, process_pool=None, parallel_min_pages=2 * PAGES_PER_JOB):
+    page_count = count_pdf_pages(path)
+    if process_pool is None or page_count < parallel_min_pages:
+        yield from iter_pdf_pages(path)
+        return
+    futures = [
+        process_pool.submit(extract_pdf_range, path, start, min(start + PAGES_PER_JOB, page_count))
+        for start in range(0, page_count, PAGES_PER_JOB)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+# Yield a text file in blocks
+def iter_text_file(path, block_chars=1 << 20):
+    with open(path, encoding='utf-8') as file:
+        while block := file.read(block_chars):
+            yield block
+
+# Extract text from the file at path (named name), truncated to max_chars characters
+def extract_text(name, path, max_chars=None, process_pool=None):
+    lower_name = name.lower()
+    if lower_name.endswith('.pdf'):
+        pieces = iter_pdf_text(path, process_pool)
+        separator = ""
+    elif lower_name.endswith('.docx'):
+        pieces = iter_docx_paragraphs(path)
+        separator = "\n"
+    elif lower_name.endswith('.txt'):
+        pieces = iter_text_file(path)
+        separator = ""
+    else:
+        return ""
+
+    parts = []
+    length = 0
+    for piece in pieces:
+        parts.append(piece)
+        length += len(piece) + len(separator)
+        if max_chars is not None and length >= max_chars:
+            pieces.close()
+            break
+    text = separator.join(parts)
+    return text if max_chars is None else text[:max_chars]
@@ -0,0 +1,50 @@
+# Plotly figures for the Timeline and Charts tabs. Plotly is imported on first
+# use, so sessions that never draw a chart don't pay for it.
+import pandas as pd
+import streamlit as st
+
+from taskflow.profiling import profiler
+
+CRITICAL_COLOR = 'crimson'
+
+
+# Memoized chart figures, rebuilt only when the underlying counts change
+@st.cache_resource(max_entries=256)
+@profiler.timed('charts.build')
+def status_pie_figure(status_counts):
+    import plotly.express as px
+    return px.pie(values=[count for _, count in status_counts], names=[status for status, _ in status_counts], title="Task Status Distribution")
+
+@st.cache_resource(max_entries=256)
+@profiler.timed('charts.build')
+def assignee_bar_figure(assignee_counts):
+    import plotly.express as px
+    return px.bar(x=[assignee for assignee, _ in assignee_counts], y=[count for _, count in assignee_counts],
+                  labels={'x': 'Assignee', 'y': 'Number of Tasks'}, title="Tasks per Assignee")
+
+# Gantt chart of the tasks overlapping [window_start, window_end], cached per
+# model version and window. End dates are inclusive, so bars run to the end
+# of their last day. Tasks in _critical (ids) are outlined.
+@st.cache_resource(max_entries=64)
+@profiler.timed('timeline.build')
+def timeline_figure(model_key, version, window_start, window_end, _tasks, _critical=frozenset()):
+    import plotly.express as px
+    window_start, window_end = pd.Timestamp(window_start), pd.Timestamp(window_end)
+    visible = _tasks[(_tasks['Start Date'] <= window_end) & (_tasks['End Date'] >= window_start)]
+    if visible.empty:
+        return None
+    df_gantt = pd.DataFrame({
+        'Task': visible['Task'],
+        'Start': visible['Start Date'],
+        'Finish': visible['End Date'] + pd.Timedelta(days=1),
+        'Resource': visible['Assigned To'].astype(object),
+        'Critical': visible.index.isin(list(_critical))
+    })
+    fig = px.timeline(df_gantt, x_start='Start', x_end='Finish', y='Task', color='Resource', custom_data=['Critical'], title="Task Timeline")
+    for trace in fig.data:
+        critical = trace.customdata[:, 0].astype(bool)
+        trace.marker.line = {'color': CRITICAL_COLOR, 'width': [3 if flag else 0 for flag in critical]}
+    fig.update_yaxes(autorange="reversed")
+    fig.update_xaxes(range=[window_start, window_end + pd.Timedelta(days=1)])
+    fig.update_layout(height=max(400, 22 * len(df_gantt)))
+    return fig
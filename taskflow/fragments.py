@@ -0,0 +1,55 @@
+# Partial reruns. With st.fragment (Streamlit 1.37+, see requirements.txt) a
+# widget change inside a decorated function reruns only that function instead
+# of the whole script; the sidebar and each tab are such fragments.
+#
+# A fragment rerun redraws only its own fragment, so callbacks whose effect
+# shows elsewhere on the page (opening, creating or importing a plan) call
+# request_app_rerun(); the fragment then reruns the whole app instead of
+# drawing itself.
+import functools
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+APP_RERUN_KEY = 'app_rerun_requested'
+
+
+def fragment(function=None, *, run_every=None):
+    if function is None:
+        return lambda function: fragment(function, run_every=run_every)
+
+    @functools.wraps(function)
+    def run(*args, **kwargs):
+        if st.session_state.pop(APP_RERUN_KEY, False):
+            st.rerun()
+        return function(*args, **kwargs)
+    return st.fragment(run, run_every=run_every)
+
+# Callbacks: rerun the whole app rather than only the fragment the widget is in
+def request_app_rerun():
+    st.session_state[APP_RERUN_KEY] = True
+
+# Called at the top of every full run, which already redraws everything
+def app_run_started():
+    st.session_state.pop(APP_RERUN_KEY, None)
+
+# Whether this run reruns only fragments, rather than the whole app
+def fragment_rerun():
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+# Rerun the whole app from inside a fragment when the change shows outside it
+def rerun_app():
+    st.rerun()
+
+# Rerun only the calling fragment. During a full run of the app Streamlit
+# doesn't allow a fragment-scoped rerun, so the app reruns instead.
+def rerun_fragment():
+    st.rerun(scope='fragment' if fragment_rerun() else 'app')
+
+# Only the selected tab is built on each run (TASKFLOW_ACTIVE_TAB_ONLY=1 or
+# ?active_tab_only=1), with a tab selector that reruns the app, instead of
+# st.tabs, which builds every tab and switches between them in the browser
+def active_tab_only():
+    return os.environ.get('TASKFLOW_ACTIVE_TAB_ONLY') == '1' or st.query_params.get('active_tab_only') == '1'
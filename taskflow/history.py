@@ -0,0 +1,86 @@
+# Plan history: an activity entry per task write, a delta log of the field
+# values each write set, and periodic snapshots of the whole plan.
+#
+# A delta is one (task id, column, value) triple in storage form, so an edit
+# to one field of one task costs one small row however large the plan is.
+# Reading a plan as of a revision decodes the nearest snapshot at or before it
+# and replays the deltas written after the snapshot. A new snapshot replaces
+# the deltas of a write once the deltas since the last snapshot would reach
+# HISTORY_SNAPSHOT_CHANGES or the plan's size, whichever is larger: replays
+# stay bounded by that, and snapshots never cost more space than the deltas
+# they stand in for, so history grows with the changes made rather than with
+# copies of the plan.
+import json
+import zlib
+
+import pandas as pd
+
+from taskflow.config import HISTORY_SNAPSHOT_CHANGES, TASK_COLUMNS
+
+HISTORY_ACTIONS = {
+    'create': "Created the plan",
+    'add': "Added tasks",
+    'import': "Imported tasks",
+    'update': "Edited tasks",
+    'restore': "Restored tasks",
+    'dependencies': "Changed dependencies"
+}
+COLUMN_POSITIONS = {column: position for position, column in enumerate(TASK_COLUMNS)}
+
+
+# Whether a write adding changes deltas to pending ones should be stored as a
+# snapshot instead; snapshot_size is the task count of the latest snapshot,
+# None when the plan has none yet
+def should_snapshot(pending, changes, snapshot_size):
+    return snapshot_size is None or pending + changes >= max(HISTORY_SNAPSHOT_CHANGES, snapshot_size)
+
+# Deltas for new rows given as (id, *TASK_COLUMNS values)
+def row_deltas(rows):
+    return [(row[0], column, value) for row in rows for column, value in zip(TASK_COLUMNS, row[1:])]
+
+# Compact snapshot of (id, *TASK_COLUMNS values) rows: one zlib-compressed
+# JSON list per column
+def encode_snapshot(rows):
+    columns = list(zip(*rows)) if rows else [()] * (len(TASK_COLUMNS) + 1)
+    return zlib.compress(json.dumps([list(column) for column in columns], separators=(',', ':')).encode())
+
+def decode_snapshot(data):
+    ids, *columns = json.loads(zlib.decompress(data))
+    return {task_id: list(values) for task_id, values in zip(ids, zip(*columns))} if ids else {}
+
+# (id, *TASK_COLUMNS values) rows of a snapshot after applying deltas in order
+def replay_snapshot(snapshot, deltas):
+    rows = decode_snapshot(snapshot)
+    for task_id, column, value in deltas:
+        row = rows.get(task_id)
+        if row is None:
+            row = rows[task_id] = [None] * len(TASK_COLUMNS)
+        row[COLUMN_POSITIONS[column]] = value
+    return [(task_id, *values) for task_id, values in sorted(rows.items())]
+
+# Activity entry details: the first task titles added, the columns edited or
+# the dependencies changed
+def describe_added(titles):
+    shown = ', '.join(str(title) for title in titles[:3])
+    return shown + (f" and {len(titles) - 3:,} more" if len(titles) > 3 else "")
+
+def describe_changed(changes):
+    columns = {column for fields in changes.values() for column in fields}
+    return ', '.join(column for column in TASK_COLUMNS if column in columns)
+
+def describe_dependencies(added, removed):
+    parts = [f"#{predecessor} → #{successor}" for predecessor, successor in added]
+    parts += [f"removed #{predecessor} → #{successor}" for predecessor, successor in removed]
+    return ', '.join(parts)
+
+# One row per field that differs between two task frames (before may lack
+# tasks added since): Id, Task, Field, Before and After
+def diff_tasks(before, after):
+    before = before.reindex(after.index)
+    rows = []
+    for column in TASK_COLUMNS:
+        old, new = before[column].astype(object), after[column].astype(object)
+        changed = ~((old == new) | (old.isna() & new.isna()))
+        for task_id in changed.index[changed]:
+            rows.append((task_id, after.at[task_id, 'Task'], column, old[task_id], new[task_id]))
+    return pd.DataFrame(rows, columns=['Id', 'Task', 'Field', 'Before', 'After']).sort_values('Id', kind='stable')
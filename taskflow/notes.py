@@ -0,0 +1,41 @@
+# Plan notes (whiteboard and goals text) as a revision log. Each save appends
+# the edit as a delta, the span of the previous text that changed and its
+# replacement, so typing into a large note writes a few bytes instead of the
+# whole note. Every NOTE_COMPACT_REVISIONS saves (or when an edit replaces
+# most of the text) a full snapshot is written instead and the revisions
+# before it are dropped, which keeps loading a note to one snapshot plus a
+# bounded number of deltas.
+#
+# A revision is a (snapshot, start, stop, body) tuple: a snapshot's body is the
+# full text, a delta's body replaces text[start:stop].
+from taskflow.config import NOTE_COMPACT_REVISIONS
+
+NOTE_TITLES = {'whiteboard': 'Whiteboard notes', 'goals': 'Goals'}
+
+
+# (start, stop, replacement) turning old into new, found by trimming the
+# common prefix and suffix
+def text_delta(old, new):
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    return start, len(old) - end, new[start:len(new) - end]
+
+# Text of a note from its revisions since the last snapshot, oldest first
+def replay(revisions):
+    text = ''
+    for snapshot, start, stop, body in revisions:
+        text = body if snapshot else text[:start] + body + text[stop:]
+    return text
+
+# The revision that saves new over old, given the number of deltas written
+# since the last snapshot
+def next_revision(old, new, deltas):
+    start, stop, body = text_delta(old, new)
+    if deltas + 1 >= NOTE_COMPACT_REVISIONS or len(body) * 2 >= len(new):
+        return 1, None, None, new
+    return 0, start, stop, body
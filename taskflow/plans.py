@@ -0,0 +1,294 @@
+# Plan and task actions shared by the views: widget callbacks, plan creation
+# and per-session plan state
+import os
+import re
+from datetime import datetime
+
+import streamlit as st
+
+from taskflow.config import DEFAULT_TEAM_MEMBERS
+from taskflow.fragments import request_app_rerun
+from taskflow.profiling import profiler
+from taskflow.schema import new_tasks_frame
+from taskflow.state import PlanIndex, TaskModel, get_note_writer, get_shared_plans
+from taskflow.storage import WriteConflict, get_task_store
+from taskflow.templates import get_template_registry
+from taskflow.transfer import EXPORT_FORMATS, describe_report, detect_format, export_plans, import_plans
+from taskflow.uploads import UploadSpool
+
+# Shared model for a plan, brought up to date with writes from other server processes
+def get_task_model(plan):
+    model = get_shared_plans().model(plan)
+    model.refresh()
+    return model
+
+# Flush a model from a callback, keeping a message for the user when edits lost a write conflict
+def flush_changes(task_model, **history):
+    try:
+        task_model.flush(**history)
+    except WriteConflict as conflict:
+        st.session_state.write_conflict = f"{conflict}; their changes have been loaded. Please reapply your edits."
+
+# Update plan metadata in the session, the store and the sidebar index
+# together, and publish it to other sessions
+def update_plan_fields(name, **fields):
+    st.session_state.plans[name].update(fields)
+    get_task_store().update_plan(name, **fields)
+    st.session_state.plan_index.add(name, st.session_state.plans[name])
+    get_shared_plans().publish_plan(name, st.session_state.plans[name])
+
+# Pull plan metadata changes made by other sessions (and server processes) into this session
+@profiler.timed('plans.sync')
+def sync_plans():
+    shared_plans = get_shared_plans()
+    shared_plans.refresh_plans()
+    changes = shared_plans.plan_changes_since(st.session_state.plans_version)
+    version = shared_plans.meta_version
+    if changes is None:
+        st.session_state.plans = get_task_store().list_plans()
+        st.session_state.plan_index = PlanIndex(st.session_state.plans)
+    else:
+        for name, meta in changes:
+            st.session_state.plans[name] = meta
+            st.session_state.plan_index.add(name, meta)
+    st.session_state.plans_version = version
+
+# Make plan the current plan, loading its metadata first when another
+# session created it since the last sync
+def open_plan(plan):
+    if plan not in st.session_state.plans:
+        sync_plans()
+    if plan in st.session_state.plans and plan != st.session_state.current_plan:
+        st.session_state.current_plan = plan
+        update_plan_fields(plan, last_accessed=datetime.now())
+        request_app_rerun()
+
+# Sidebar plan selectbox callback
+def select_plan(widget_key):
+    selected_plan = st.session_state[widget_key]
+    if selected_plan is not None:
+        open_plan(selected_plan)
+
+# Search result callback: open the hit's plan and, for a task, filter the
+# grid down to that task
+def open_search_hit(hit):
+    open_plan(hit['plan'])
+    if hit['kind'] == 'task':
+        st.session_state.grid_search = hit['title']
+        st.session_state.grid_status = 'All'
+        st.session_state.grid_assignee = 'All'
+        st.session_state.grid_page = 1
+        request_app_rerun()
+
+# First free plan name based on name: "Name", "Name (2)", "Name (3)", ...
+def unique_plan_name(name):
+    candidate = name
+    suffix = 2
+    while candidate in st.session_state.plans or get_task_store().plan_exists(candidate):
+        candidate = f"{name} ({suffix})"
+        suffix += 1
+    return candidate
+
+# Plan factory: create a uniquely named plan from a registered template
+def create_plan_from_template(template_name, plan_name=None):
+    templates = get_template_registry()
+    meta, tasks = templates.instantiate(template_name)
+    name = unique_plan_name((plan_name or '').strip() or templates.get(template_name)['plan_name'])
+    save_new_plan(name, meta, tasks)
+    return name
+
+# Grid editor callback: turn the editor's row diff for the page that was shown
+# into task updates, then start a fresh editor so stale positions aren't replayed
+def apply_grid_edits(plan, editor_key, page_ids):
+    changes = {}
+    for position, fields in st.session_state[editor_key]['edited_rows'].items():
+        fields = dict(fields)
+        # Keep the Completed checkbox and the Status column in step
+        if 'Completed' in fields and 'Status' not in fields:
+            fields['Status'] = 'Completed' if fields['Completed'] else 'To Do'
+        elif 'Status' in fields and 'Completed' not in fields:
+            fields['Completed'] = fields['Status'] == 'Completed'
+        changes[page_ids[int(position)]] = fields
+    if changes:
+        task_model = get_task_model(plan)
+        task_model.update(changes)
+        flush_changes(task_model)
+    st.session_state.grid_editor_version = st.session_state.get('grid_editor_version', 0) + 1
+
+# Grid buttons for the generated tasks: add all of them, or (selected_only)
+# the checked ones, assigned to assigned_to
+def add_generated_tasks(plan, assigned_to='Unassigned', selected_only=False):
+    tasks = st.session_state.generated_tasks
+    if selected_only:
+        tasks = [task for task in tasks if st.session_state.get(f"generated_{task}")]
+        if not tasks:
+            st.session_state.generated_warning = "Please select at least one task to add."
+            return
+    get_task_model(plan).add(new_tasks_frame(tasks, assigned_to, st.session_state.team_members))
+    st.session_state.generated_tasks = []
+
+# Grid custom task form callback
+def add_custom_task(plan):
+    if st.session_state.custom_task:
+        get_task_model(plan).add(new_tasks_frame([st.session_state.custom_task], st.session_state.custom_assigned_to,
+                                                 st.session_state.team_members))
+
+# Board form callback: apply every changed "Move to" choice, one vectorized update per target status
+def apply_board_moves(plan, shown_tasks):
+    moves = {}
+    for task_id, status in shown_tasks.items():
+        new_status = st.session_state.get(f"move_{task_id}", status)
+        if new_status != status:
+            moves.setdefault(new_status, []).append(task_id)
+    if moves:
+        task_model = get_task_model(plan)
+        for new_status, task_ids in moves.items():
+            task_model.set_values(task_ids, 'Status', new_status)
+        flush_changes(task_model)
+
+# Timeline bulk date form callback: date the selected undated tasks, or all of them
+def apply_bulk_dates(plan, task_labels):
+    start_date, end_date = st.session_state.bulk_start, st.session_state.bulk_end
+    if end_date < start_date:
+        st.session_state.bulk_dates_error = "End date must not be before the start date."
+        return
+    task_ids = [task_labels[label] for label in st.session_state.bulk_tasks] or list(task_labels.values())
+    task_model = get_task_model(plan)
+    task_model.update({task_id: {'Start Date': start_date, 'End Date': end_date} for task_id in task_ids})
+    flush_changes(task_model)
+
+# Timeline dependency form callback: add or remove the dependency between the
+# two task ids entered, then save the successors it moved
+def apply_dependency_change(plan, action):
+    edge = (st.session_state.dependency_predecessor, st.session_state.dependency_successor)
+    task_model = get_task_model(plan)
+    try:
+        if action == 'add':
+            task_model.add_dependencies([edge])
+        else:
+            task_model.remove_dependencies([edge])
+    except ValueError as error:
+        st.session_state.dependency_error = str(error)
+        return
+    flush_changes(task_model)
+
+# History tab callback: put the plan's tasks back to how they were at revision
+def restore_plan_version(plan, revision):
+    task_model = get_task_model(plan)
+    try:
+        restored = task_model.restore(revision)
+    except ValueError as error:
+        st.session_state.history_message = ('error', str(error))
+        return
+    flush_changes(task_model, action='restore', detail=f"to revision {revision}")
+    st.session_state.history_message = ('success', f"Restored {restored:,} task(s) to revision {revision}.")
+
+# Persist a new plan with its initial tasks and make it the current plan
+def save_new_plan(name, meta, tasks):
+    store, shared_plans = get_task_store(), get_shared_plans()
+    store.save_plan(name, meta)
+    st.session_state.plans[name] = dict(meta)
+    st.session_state.plan_index.add(name, meta)
+    st.session_state.current_plan = name
+    request_app_rerun()
+    task_model = TaskModel(store, name)
+    task_model.add(tasks)
+    shared_plans.replace(name, task_model)
+    shared_plans.publish_plan(name, meta)
+
+# Sidebar import callback: stream the uploaded file into the store chunk by
+# chunk. New and re-created plans reach every session through the store's
+# metadata revision; tasks appended to existing plans through their revision.
+def import_plan_file(uploader_key):
+    uploaded_file = st.session_state.get(uploader_key)
+    if uploaded_file is None:
+        st.session_state.import_message = ('warning', "Choose a file to import.", [])
+        return
+    default_plan = st.session_state.import_plan_name.strip() or os.path.splitext(uploaded_file.name)[0]
+    try:
+        report = import_plans(get_task_store(), uploaded_file, detect_format(uploaded_file.name), default_plan,
+                              st.session_state.import_mode, members=st.session_state.team_members)
+    except ValueError as e:
+        st.session_state.import_message = ('error', f"Could not import {uploaded_file.name}: {e}", [])
+        return
+    st.session_state.import_message = ('warning' if report['rejected'] else 'success', describe_report(report), report['errors'])
+    st.session_state.import_uploader_version += 1
+    sync_plans()
+    if report['plans']:
+        st.session_state.current_plan = next(iter(report['plans']))
+        request_app_rerun()
+
+# Sidebar export callback: write the current plan or all plans to a file in
+# the session's export directory, ready for the download button
+def prepare_export(plan):
+    discard_export()
+    plans = [plan] if st.session_state.export_scope == "Current plan" and plan else None
+    file_format = st.session_state.export_format
+    file_name = re.sub(r'[^\w\- ]+', '_', plan if plans else 'taskflow-plans') + EXPORT_FORMATS[file_format]
+    path = os.path.join(st.session_state.upload_spool.export_directory, file_name)
+    rows = export_plans(get_task_store(), path, plans, file_format)
+    st.session_state.export_file = {'path': path, 'name': file_name, 'rows': rows}
+
+# Download button callback: a prepared export is served once, then removed,
+# so the file is no longer read into memory on every rerun
+def discard_export():
+    export_file = st.session_state.pop('export_file', None)
+    if export_file and os.path.exists(export_file['path']):
+        os.remove(export_file['path'])
+
+# Note text area callbacks: autosave_note queues the edit for the debounced
+# writer, save_note (the Save buttons) writes it right away
+def autosave_note(plan, kind, widget_key):
+    get_note_writer().submit(plan, kind, st.session_state[widget_key])
+
+def save_note(plan, kind, widget_key):
+    note_writer = get_note_writer()
+    note_writer.submit(plan, kind, st.session_state[widget_key])
+    note_writer.flush()
+
+# Session setup run at the top of every rerun
+def init_session():
+    store, shared_plans = get_task_store(), get_shared_plans()
+
+    # Initialize session state for plan metadata, team members, and uploaded files.
+    # Task rows stay in the store and are loaded per view. Plan metadata is
+    # read once per session (later reruns sync only what changed), and an
+    # empty store is seeded with the default plan on first start.
+    if 'plans' not in st.session_state:
+        st.session_state.plans_version = shared_plans.meta_version
+        plans = store.list_plans()
+        if not plans:
+            store.save_plan('Workplace Strategy', {
+                'privacy': 'Shared',
+                'last_accessed': datetime.now(),
+                'shared_with': ['Leadership'],
+                'template': 'Custom',
+                'pinned': False,
+                'group': None,
+                'ai_assisted': True
+            })
+            plans = store.list_plans()
+        st.session_state.plans = plans
+        st.session_state.plan_index = PlanIndex(st.session_state.plans)
+        st.session_state.seen_versions = {}
+
+    else:
+        sync_plans()
+
+    if 'current_plan' not in st.session_state:
+        st.session_state.current_plan = 'Workplace Strategy'
+
+    if 'team_members' not in st.session_state:
+        st.session_state.team_members = list(DEFAULT_TEAM_MEMBERS)
+
+    if 'generated_tasks' not in st.session_state:
+        st.session_state.generated_tasks = []
+
+    if 'ai_job' not in st.session_state:
+        st.session_state.ai_job = None
+
+    # Uploaded files for this session
+    if 'upload_spool' not in st.session_state:
+        st.session_state.upload_spool = UploadSpool(os.environ.get('TASKFLOW_UPLOAD_DIR'))
+        st.session_state.uploader_version = 0
+        st.session_state.import_uploader_version = 0
@@ -0,0 +1,149 @@
+# Timing spans for script reruns and background jobs.
+#
+# A span is a named, timed block (`with profiler.span("tab.grid"):` or the
+# `@profiler.timed("store.flush")` decorator). Spans recorded on the script
+# thread are tagged with the rerun and session that begin_run() registered
+# (spans from widget callbacks, which run just before the script, join the
+# rerun that follows them); work handed to a pool keeps those tags when
+# wrapped with bind(). Spans are kept in a bounded ring buffer and can also be
+# appended to a JSON lines file.
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Profiler:
+    # session_resolver: returns the id of the session running on the calling thread, if any
+    def __init__(self, max_spans=20000, enabled=True, log_path=None, session_resolver=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.session_resolver = session_resolver
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._run_ids = itertools.count(1)
+
+    # Start a new rerun on the calling thread; returns its run id
+    def begin_run(self, session_id=None):
+        run = next(self._run_ids)
+        self._local.run, self._local.session, self._local.stack = run, session_id, []
+        self._local.run_started = time.time(), time.perf_counter()
+        for record in getattr(self._local, 'pending', ()):
+            if record['session'] == session_id:
+                record['run'] = run
+        self._local.pending = []
+        return run
+
+    # Record the whole rerun as one span (reruns stopped early by st.rerun are not recorded)
+    def end_run(self):
+        started = getattr(self._local, 'run_started', None)
+        if started is not None:
+            wall_start, start = started
+            self._record('rerun', wall_start, time.perf_counter() - start, 0, None)
+            self._local.run_started = None
+            self._local.run = None
+
+    # (run, session) of the calling thread
+    def context(self):
+        return getattr(self._local, 'run', None), getattr(self._local, 'session', None)
+
+    # Wrap fn so spans it records on another thread are tagged with the caller's run
+    def bind(self, fn):
+        run, session = self.context()
+
+        @wraps(fn)
+        def bound(*args, **kwargs):
+            previous = self.context(), getattr(self._local, 'stack', None)
+            self._local.run, self._local.session, self._local.stack = run, session, []
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                (self._local.run, self._local.session), self._local.stack = previous
+        return bound
+
+    @contextmanager
+    def span(self, name, **attributes):
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        wall_start = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self._record(name, wall_start, duration, len(stack) + 1, parent, attributes)
+
+    def timed(self, name):
+        def decorator(fn):
+            @wraps(fn)
+            def timed_fn(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return timed_fn
+        return decorator
+
+    def _record(self, name, wall_start, duration, depth, parent, attributes=None):
+        run, session = self.context()
+        if session is None and self.session_resolver is not None:
+            session = self.session_resolver()
+        record = {
+            'name': name,
+            'run': run,
+            'session': session,
+            'start': round(wall_start, 6),
+            'duration_ms': round(duration * 1000, 3),
+            'depth': depth,
+            'parent': parent,
+            'thread': threading.current_thread().name
+        }
+        if attributes:
+            record['attributes'] = attributes
+        if run is None and session is not None:
+            pending = getattr(self._local, 'pending', None)
+            if pending is None:
+                pending = self._local.pending = []
+            pending.append(record)
+        with self._lock:
+            self._spans.append(record)
+            if self.log_path:
+                with open(self.log_path, 'a', encoding='utf-8') as log:
+                    log.write(json.dumps(record, default=str) + "\n")
+
+    # Recorded spans, optionally only those of one session and/or run
+    def spans(self, session=None, run=None):
+        with self._lock:
+            spans = list(self._spans)
+        return [
+            record for record in spans
+            if (session is None or record['session'] == session) and (run is None or record['run'] == run)
+        ]
+
+    @staticmethod
+    def to_jsonl(spans):
+        return "".join(json.dumps(record, default=str) + "\n" for record in spans)
+
+
+# Id of the Streamlit session running on the calling thread, if any
+def current_session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+# Process-wide profiler for reruns, tabs and I/O paths. TASKFLOW_PROFILE=0
+# turns spans off; TASKFLOW_PROFILE_LOG appends every span to a JSON lines file.
+profiler = Profiler(max_spans=int(os.environ.get('TASKFLOW_PROFILE_SPANS', 20000)),
+                    enabled=os.environ.get('TASKFLOW_PROFILE', '1') != '0',
+                    log_path=os.environ.get('TASKFLOW_PROFILE_LOG'),
+                    session_resolver=current_session_id)
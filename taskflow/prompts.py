@@ -0,0 +1,125 @@
+# Prompt building for task generation: token estimates, splitting large file
+# text into chunks that fit the prompt budget, and merging the task lists
+# generated for each chunk.
+#
+# Tokens are estimated from characters (about four per token for English
+# text), which is close enough to size chunks without a tokenizer.
+import re
+from difflib import SequenceMatcher
+
+from taskflow.config import AI_CHARS_PER_TOKEN, AI_DUPLICATE_SIMILARITY, AI_MAX_CHUNKS, AI_MIN_CHUNK_TOKENS, AI_PROMPT_TOKENS
+
+PROMPT_TEMPLATE = """
+    Based on the following project goal, content, and file data, generate a list of tasks for a project management plan. Return the tasks as a JSON array of strings.
+
+    Goal: {goal}
+    Content: {content}
+    File Data{part}: {file_data}
+
+    Example output format:
+    ["Task 1", "Task 2", "Task 3"]
+    """
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def estimate_tokens(text):
+    return -(-len(text or '') // AI_CHARS_PER_TOKEN)
+
+def build_prompt(goal, content, file_data, part=None):
+    return PROMPT_TEMPLATE.format(goal=goal, content=content, file_data=file_data,
+                                  part=f" (part {part[0]} of {part[1]})" if part else "")
+
+# Tokens left for file data once the goal, content and instructions are in the prompt
+def file_token_budget(goal, content):
+    return max(AI_MIN_CHUNK_TOKENS, AI_PROMPT_TOKENS - estimate_tokens(build_prompt(goal, content, "", (99, 99))))
+
+# Pieces of text of at most max_chars, cut at paragraph, then sentence, then
+# word boundaries. Cuts depend only on the text itself, so an edit to one
+# part of a document leaves the other chunks (and their cached results) unchanged.
+def _split(text, max_chars):
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+    for pattern in (PARAGRAPH_BREAK, SENTENCE_BREAK, re.compile(r"\s+")):
+        parts = [part for part in pattern.split(text) if part.strip()]
+        if len(parts) > 1:
+            break
+    else:
+        return [text[start:start + max_chars] for start in range(0, len(text), max_chars)]
+    chunks = []
+    current = ""
+    for part in parts:
+        if len(part) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split(part, max_chars))
+        elif current and len(current) + 2 + len(part) > max_chars:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current}\n\n{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+# File data as prompt-sized chunks. documents is {file name -> text} (or one
+# string); each file is split on its own and labelled with its name, and small
+# files share a chunk. At most AI_MAX_CHUNKS chunks are returned, so cost stays
+# bounded for very large uploads; the rest of the text is left out.
+def chunk_file_data(documents, token_budget):
+    if isinstance(documents, str):
+        documents = {None: documents}
+    max_chars = token_budget * AI_CHARS_PER_TOKEN
+    pieces = []
+    for name, text in documents.items():
+        label = f"[{name}]\n" if name else ""
+        pieces.extend(label + piece for piece in _split(text or "", max_chars - len(label)))
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 2 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]}\n\n{piece}"
+        else:
+            chunks.append(piece)
+    return chunks[:AI_MAX_CHUNKS]
+
+# Lowercased words of a task title, for duplicate detection
+def _title_key(title):
+    return " ".join(WORD_PATTERN.findall(str(title).lower()))
+
+# Numbers in a task title: "Phase 1 review" and "Phase 2 review" are different tasks
+def _title_numbers(key):
+    return tuple(word for word in key.split() if word.isdigit())
+
+# Merge task lists in order, dropping exact duplicates (ignoring case and
+# punctuation) and near duplicates whose titles are at least
+# AI_DUPLICATE_SIMILARITY alike and mention the same numbers; the first
+# wording of a task is kept
+def merge_tasks(task_lists, similarity=None):
+    similarity = AI_DUPLICATE_SIMILARITY if similarity is None else similarity
+    merged = []
+    keys = []  # (key, numbers) of the kept tasks
+    seen = set()
+    for tasks in task_lists:
+        for task in tasks or []:
+            if not isinstance(task, str) or not task.strip():
+                continue
+            key = _title_key(task)
+            if key in seen:
+                continue
+            numbers = _title_numbers(key)
+            matcher = SequenceMatcher(None, b=key)
+            duplicate = False
+            for other, other_numbers in keys:
+                if other_numbers != numbers:
+                    continue
+                matcher.set_seq1(other)
+                if matcher.real_quick_ratio() >= similarity and matcher.quick_ratio() >= similarity and matcher.ratio() >= similarity:
+                    duplicate = True
+                    break
+            seen.add(key)
+            if not duplicate:
+                keys.append((key, numbers))
+                merged.append(task.strip())
+    return merged
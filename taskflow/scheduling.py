@@ -0,0 +1,157 @@
+# Task dependencies and scheduling. A dependency (predecessor, successor)
+# is finish-to-start: the successor may not start before the day after its
+# predecessor ends (end dates are inclusive).
+#
+# DependencyGraph keeps adjacency sets in both directions, so every operation
+# touches only the part of the graph it needs: adding an edge searches
+# forward from the successor for a cycle, and propagate() visits only the
+# tasks downstream of the ones that moved, in topological order, stopping
+# wherever a task's dates don't change. Critical path analysis is one
+# backward pass over the whole plan and is cached by TaskModel per version.
+from collections import deque
+
+import pandas as pd
+
+ONE_DAY_NS = pd.Timedelta(days=1).value
+
+
+# Raised when a dependency would make a task (indirectly) depend on itself
+class CycleError(ValueError):
+    pass
+
+
+class DependencyGraph:
+    def __init__(self, edges=()):
+        self.successors = {}  # task id -> set of task ids
+        self.predecessors = {}  # task id -> set of task ids
+        for predecessor, successor in edges:
+            self._link(predecessor, successor)
+
+    def __len__(self):
+        return sum(len(successors) for successors in self.successors.values())
+
+    def __contains__(self, task_id):
+        return task_id in self.successors or task_id in self.predecessors
+
+    def _link(self, predecessor, successor):
+        self.successors.setdefault(predecessor, set()).add(successor)
+        self.predecessors.setdefault(successor, set()).add(predecessor)
+
+    # Add a dependency; returns False if it already existed
+    def add(self, predecessor, successor):
+        if successor in self.successors.get(predecessor, ()):
+            return False
+        if predecessor == successor or predecessor in self.downstream([successor]):
+            raise CycleError(f"Task #{predecessor} already depends on task #{successor}")
+        self._link(predecessor, successor)
+        return True
+
+    # Remove a dependency; returns False if there was none
+    def remove(self, predecessor, successor):
+        successors = self.successors.get(predecessor)
+        if not successors or successor not in successors:
+            return False
+        successors.discard(successor)
+        self.predecessors[successor].discard(predecessor)
+        if not successors:
+            del self.successors[predecessor]
+        if not self.predecessors[successor]:
+            del self.predecessors[successor]
+        return True
+
+    # Every task reachable from task_ids (not including them unless on a path)
+    def downstream(self, task_ids):
+        seen = set()
+        stack = list(task_ids)
+        while stack:
+            for successor in self.successors.get(stack.pop(), ()):
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return seen
+
+    # Topological order of task_ids (default: every task with a dependency),
+    # considering only the dependencies among them
+    def topological_order(self, task_ids=None):
+        if task_ids is None:
+            nodes = set(self.successors) | set(self.predecessors)
+            pending = {node: len(self.predecessors.get(node, ())) for node in nodes}
+        else:
+            nodes = set(task_ids)
+            pending = {node: len(self.predecessors.get(node, set()) & nodes) for node in nodes}
+        ready = deque(node for node, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for successor in self.successors.get(node, ()):
+                if successor in pending:
+                    pending[successor] -= 1
+                    if pending[successor] == 0:
+                        ready.append(successor)
+        return order
+
+    # New (start, end) for the tasks that must move after the tasks in moved
+    # changed dates: each successor starting before the day after a
+    # predecessor's end is pushed later, keeping its duration. starts and ends
+    # are datetime Series indexed by task id; undated tasks neither move nor
+    # push. The tasks in pinned (default: moved) keep their dates; the rest of
+    # moved may be pushed too, as when a new dependency chains tasks that have
+    # not moved themselves. Only the affected subgraph's dates are read, as
+    # integer nanoseconds.
+    def propagate(self, moved, starts, ends, pinned=None):
+        pinned = moved if pinned is None else pinned
+        affected = self.downstream(moved)
+        if not affected:
+            return {}
+        nodes = affected | set(moved)
+        needed = list(nodes.union(*(self.predecessors.get(task_id, ()) for task_id in affected)))
+        known = _nanoseconds(starts.reindex(needed), ends.reindex(needed))
+        shifted = set()
+        changed = set(moved)
+        for task_id in self.topological_order(nodes):
+            if task_id in pinned or task_id not in known:
+                continue
+            predecessors = self.predecessors.get(task_id, set())
+            if not predecessors & changed:
+                continue
+            ends_before = [known[predecessor][1] for predecessor in predecessors if predecessor in known]
+            start, end = known[task_id]
+            if ends_before and max(ends_before) + ONE_DAY_NS > start:
+                shift = max(ends_before) + ONE_DAY_NS - start
+                known[task_id] = (start + shift, end + shift)
+                shifted.add(task_id)
+                changed.add(task_id)
+        return {task_id: (pd.Timestamp(known[task_id][0]), pd.Timestamp(known[task_id][1])) for task_id in shifted}
+
+    # Ids of the dated tasks with no slack: delaying any of them delays the
+    # plan's last end date. starts and ends are datetime Series indexed by task id.
+    def critical_tasks(self, starts, ends):
+        dated = starts.notna() & ends.notna()
+        if not dated.any():
+            return set()
+        starts, ends = starts[dated], ends[dated]
+        finish = ends.max()
+        # Tasks without successors only have the plan's end to meet
+        critical = set(ends.index[(ends == finish) & ~ends.index.isin(list(self.successors))])
+        finish = finish.value
+        known = _nanoseconds(starts, ends)
+        latest_start = {}
+        for task_id in reversed(self.topological_order()):
+            if task_id not in known:
+                continue
+            start, end = known[task_id]
+            latest_finish = min(
+                (latest_start[successor] - ONE_DAY_NS for successor in self.successors.get(task_id, ()) if successor in latest_start),
+                default=finish
+            )
+            latest_start[task_id] = latest_finish - (end - start)
+            if latest_finish <= end:
+                critical.add(task_id)
+        return critical
+
+
+# {task id -> (start, end)} in nanoseconds for the tasks with both dates
+def _nanoseconds(starts, ends):
+    dated = starts.notna() & ends.notna()
+    return dict(zip(starts.index[dated.values], zip(starts[dated].values.astype('int64').tolist(), ends[dated].values.astype('int64').tolist())))
@@ -0,0 +1,78 @@
+# Typed task frames. Every task frame (loaded from a store, built from a
+# template, generated by AI or added by hand) goes through tasks_frame(), so
+# they all share one schema:
+#
+#   index        id: int64 task id assigned by the store, stable across edits and reloads
+#   Task         object (str)
+#   Status       category, TASK_STATUSES in workflow order
+#   Assigned To  category, the team members first, then any other assignee found
+#   Completed    bool
+#   Start Date   datetime64[ns], NaT when unset
+#   End Date     datetime64[ns], NaT when unset
+#
+# Categories only ever grow: a value missing from a frame's categories is
+# added (add_categories) before it is written, and frames are given the same
+# categories (align_categories) before they are combined, so concatenation
+# keeps the categorical dtype instead of falling back to object.
+import pandas as pd
+
+from taskflow.config import DATE_COLUMNS, DEFAULT_TEAM_MEMBERS, TASK_COLUMNS, TASK_STATUSES
+
+CATEGORY_COLUMNS = ['Status', 'Assigned To']
+
+
+# Categorical dtype with the known values first, followed by any other value present
+def category_dtype(known, values=()):
+    extra = [value for value in pd.unique(pd.Series(values, dtype=object)) if pd.notna(value)]
+    return pd.CategoricalDtype(list(dict.fromkeys([*known, *extra])))
+
+# Cast the schema columns present in frame to their dtypes. members seeds the
+# Assigned To categories (defaults to DEFAULT_TEAM_MEMBERS).
+def conform(frame, members=None):
+    known = {'Status': TASK_STATUSES, 'Assigned To': members or DEFAULT_TEAM_MEMBERS}
+    for column in frame.columns:
+        if column in CATEGORY_COLUMNS:
+            values = frame[column].astype(object)
+            frame[column] = values.astype(category_dtype(known[column], values))
+        elif column == 'Completed':
+            frame[column] = frame[column].fillna(False).astype(bool)
+        elif column in DATE_COLUMNS:
+            frame[column] = pd.to_datetime(frame[column]).astype('datetime64[ns]')
+    return frame
+
+# The one task frame constructor. data is anything pd.DataFrame accepts with
+# the given columns (rows, a dict of columns or another frame); ids become the
+# int64 "id" index.
+def tasks_frame(data=None, columns=None, ids=None, members=None):
+    frame = pd.DataFrame(data, columns=columns or TASK_COLUMNS)
+    if ids is not None:
+        frame.index = pd.Index(ids, dtype='int64', name='id')
+    return conform(frame, members)
+
+# Frame for new tasks with the given titles, all To Do and undated
+def new_tasks_frame(tasks, assigned_to='Unassigned', members=None):
+    return tasks_frame({
+        'Task': list(tasks),
+        'Status': 'To Do',
+        'Assigned To': assigned_to,
+        'Completed': False,
+        'Start Date': pd.NaT,
+        'End Date': pd.NaT
+    } if len(tasks) else None, members=members)
+
+# Add values missing from a categorical column's categories; returns the frame
+def add_categories(frame, column, values):
+    if isinstance(frame[column].dtype, pd.CategoricalDtype):
+        missing = [value for value in dict.fromkeys(values) if pd.notna(value) and value not in frame[column].cat.categories]
+        if missing:
+            frame[column] = frame[column].cat.add_categories(missing)
+    return frame
+
+# Give two frames the union of their categories, so they can be concatenated
+# or assigned into each other without losing the categorical dtype
+def align_categories(frame, other):
+    for column in CATEGORY_COLUMNS:
+        if column in frame.columns and column in other.columns:
+            frame = add_categories(frame, column, other[column].cat.categories)
+            other[column] = other[column].cat.set_categories(frame[column].cat.categories)
+    return frame, other
@@ -0,0 +1,136 @@
+# Full-text search helpers shared by the stores.
+#
+# The SQLite store keeps FTS5 tables in sync with its tables through
+# triggers; fts_query() turns what the user typed into an FTS5 query. Stores
+# without FTS use InvertedIndex, an incrementally maintained in-process
+# index with the same matching rules (every word must match, the last one
+# as a prefix) and BM25 ranking.
+import bisect
+import math
+import re
+import unicodedata
+from collections import Counter
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+SNIPPET_CHARS = 80
+
+
+# Lowercase words with diacritics removed, like FTS5's unicode61 tokenizer
+def tokenize(text):
+    return WORD_PATTERN.findall(fold(text))
+
+def fold(text):
+    decomposed = unicodedata.normalize('NFKD', str(text or '').lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+# FTS5 MATCH expression for user input: all words must match, the last one
+# as a prefix so results show up while typing; None when there is nothing to search
+def fts_query(text):
+    words = tokenize(text)
+    if not words:
+        return None
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+# Short excerpt of text around the first matching word, with matches in bold
+def make_snippet(text, words):
+    text = unicodedata.normalize('NFC', str(text or ''))
+    lowered = fold(text)
+    positions = [lowered.find(word) for word in words if word in lowered]
+    start = max(0, min(positions, default=0) - SNIPPET_CHARS // 4)
+    excerpt = text[start:start + SNIPPET_CHARS]
+    excerpt = WORD_PATTERN.sub(
+        lambda match: f"**{match[0]}**" if any(fold(match[0]).startswith(word) for word in words) else match[0], excerpt)
+    return ('…' if start else '') + excerpt + ('…' if start + SNIPPET_CHARS < len(text) else '')
+
+
+# Inverted index from words to documents. A document is any hashable key
+# with a dict of searchable text fields and a payload returned with hits;
+# add() replaces a document, so edits re-index only that document.
+class InvertedIndex:
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings = {}  # word -> {key -> term frequency}
+        self._words = []  # sorted vocabulary, for prefix lookups
+        self._documents = {}  # key -> (payload, texts, length, words)
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, key, payload, *texts):
+        self.remove(key)
+        texts = tuple(str(part) for part in texts if part)
+        counts = Counter(tokenize(' '.join(texts)))
+        for word, count in counts.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                bisect.insort(self._words, word)
+            postings[key] = count
+        length = sum(counts.values())
+        self._documents[key] = (payload, texts, length, tuple(counts))
+        self._total_length += length
+
+    def remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        _, _, length, words = document
+        self._total_length -= length
+        for word in words:
+            postings = self._postings[word]
+            del postings[key]
+            if not postings:
+                del self._postings[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+    # Remove every document whose key matches
+    def remove_where(self, predicate):
+        for key in [key for key in self._documents if predicate(key)]:
+            self.remove(key)
+
+    def _expand(self, prefix):
+        start = bisect.bisect_left(self._words, prefix)
+        end = bisect.bisect_left(self._words, prefix + '￿')
+        return self._words[start:end]
+
+    # Best matching (score, payload, snippet) tuples, highest score first
+    def search(self, text, limit=20):
+        words = tokenize(text)
+        if not words or not self._documents:
+            return []
+        count = len(self._documents)
+        average_length = self._total_length / count or 1
+        scores = None
+        for position, word in enumerate(words):
+            variants = self._expand(word) if position == len(words) - 1 else ([word] if word in self._postings else [])
+            word_scores = Counter()
+            for variant in variants:
+                postings = self._postings[variant]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    length = self._documents[key][2]
+                    word_scores[key] += idf * frequency * (self.K1 + 1) / (
+                        frequency + self.K1 * (1 - self.B + self.B * length / average_length))
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = Counter({key: score + word_scores[key] for key, score in scores.items() if key in word_scores})
+            if not scores:
+                return []
+        return [
+            (score, self._documents[key][0], make_snippet(self._matching_text(key, words), words))
+            for key, score in scores.most_common(limit)
+        ]
+
+    # The first of a document's texts that contains a searched word, for its snippet
+    def _matching_text(self, key, words):
+        texts = self._documents[key][1]
+        for text in texts:
+            if any(token.startswith(word) for token in tokenize(text) for word in words):
+                return text
+        return texts[0] if texts else ''
@@ -0,0 +1,627 @@
+# Shared in-memory plan state: task models, the process-wide plan cache, the
+# note autosaver and the sidebar plan index
+import atexit
+import bisect
+import itertools
+import os
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from datetime import datetime
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+
+from taskflow.config import AGGREGATE_COLUMNS, CHANGE_LOG_SIZE, DATE_COLUMNS, NOTE_AUTOSAVE_SECONDS, TASK_COLUMNS
+from taskflow.notes import NOTE_TITLES
+from taskflow.profiling import current_session_id, profiler
+from taskflow.scheduling import DependencyGraph
+from taskflow.schema import CATEGORY_COLUMNS, add_categories, align_categories, conform
+from taskflow.storage import WriteConflict, get_task_store, text_to_date
+
+# Who a store write is recorded as in the plan's history: the name entered
+# in the sidebar, else the session; None outside a session (background jobs)
+def current_actor():
+    session_id = current_session_id()
+    if session_id is None:
+        return None
+    return st.session_state.get('user_name') or f"Session {session_id[:8]}"
+
+# Run a method while holding the instance's lock
+def synchronized(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+# Task model: the one authoritative in-memory copy of a plan's tasks.
+# Edits are applied in place and tracked as dirty rows, so flushing to the
+# store and snapshotting cost scale with the rows touched, not the plan size.
+# Per-column counters for the Charts and People tabs are maintained on every
+# mutation instead of being recomputed per rerun. Models are shared by every
+# session on the server (see SharedPlanCache), so all access goes through the
+# model's lock and each mutation is appended to a versioned change log.
+# Rows written by other server processes are pulled in by refresh(), and
+# flush() only overwrites rows still at the version this model last saw.
+# The model also holds the plan's dependency graph: date edits push dependent
+# tasks later as part of the same update (see taskflow.scheduling).
+class TaskModel:
+    _instance_ids = itertools.count()
+
+    def __init__(self, store, plan):
+        self.store = store
+        self.plan = plan
+        self.key = f"{plan}#{next(TaskModel._instance_ids)}"
+        self.lock = threading.RLock()
+        self.version = 0
+        self._log = deque(maxlen=CHANGE_LOG_SIZE)  # (version, session id, kind, payload)
+        self._dirty = {}  # task id -> {column -> new value}
+        self._status_index = None
+        self._status_index_version = None
+        self._critical = None
+        self._critical_version = None
+        self._load()
+
+    # (Re)load every task of the plan from the store
+    @profiler.timed('store.load')
+    def _load(self):
+        self.revision, self.base_revision = self.store.plan_revision(self.plan)
+        frame = self.store.load_tasks(self.plan, versions=True)
+        self._row_versions = frame.pop('Version').to_dict()  # task id -> store version
+        self._frame = frame
+        self._dirty = {}
+        self._counts = {column: Counter(frame[column].tolist()) for column in AGGREGATE_COLUMNS}
+        self._load_dependencies()
+
+    def _load_dependencies(self):
+        edges, self.dependency_revision = self.store.load_dependencies(self.plan)
+        self.dependencies = DependencyGraph(edges)
+
+    @synchronized
+    def __len__(self):
+        return len(self._frame)
+
+    # Read-only view of the current tasks; copied lazily only if either side is
+    # modified when the app has turned on pandas copy-on-write, else copied now
+    @synchronized
+    def snapshot(self):
+        return self._frame.copy(deep=not pd.get_option('mode.copy_on_write'))
+
+    # Same filters as TaskStore.load_tasks, served from memory
+    @synchronized
+    def select(self, status=None, assignee=None, dated=None, columns=None):
+        frame = self._frame
+        mask = pd.Series(True, index=frame.index)
+        if status is not None:
+            mask &= frame['Status'] == status
+        if assignee is not None:
+            mask &= frame['Assigned To'] == assignee
+        if dated is not None:
+            has_dates = frame['Start Date'].notna() & frame['End Date'].notna()
+            mask &= has_dates if dated else ~has_dates
+        return frame.loc[mask, columns or TASK_COLUMNS]
+
+    # Server-side filtering and sorting for the paginated grid
+    @synchronized
+    def query(self, sort_by=None, ascending=True, status=None, assignee=None, search=None):
+        frame = self.select(status=status, assignee=assignee)
+        if search:
+            frame = frame[frame['Task'].str.contains(search, case=False, regex=False, na=False)]
+        if sort_by:
+            frame = frame.sort_values(sort_by, ascending=ascending, kind='stable')
+        return frame
+
+    # Task count, or counts per value of a column (most common first)
+    @synchronized
+    def count(self, by=None):
+        if by is None:
+            return len(self._frame)
+        if by in self._counts:
+            return pd.Series(dict(self._counts[by].most_common()), dtype='int64', name='count')
+        return self._frame[by].value_counts()
+
+    # Counts per value of an aggregate column as a hashable tuple, for memoizing figures
+    @synchronized
+    def count_items(self, by):
+        return tuple(self._counts[by].most_common())
+
+    @profiler.timed('store.add')
+    @synchronized
+    def add(self, tasks):
+        ids, revision = self.store.add_tasks(self.plan, tasks, actor=current_actor())
+        added = conform(tasks[TASK_COLUMNS].set_axis(pd.Index(ids, dtype='int64', name='id')))
+        self._append(added)
+        self._row_versions.update(dict.fromkeys(ids, revision))
+        self._written(revision)
+        for column in AGGREGATE_COLUMNS:
+            self._counts[column].update(added[column].tolist())
+        self._record('add', ids)
+        return ids
+
+    # This model's own write landed at revision: the next refresh starts after
+    # it, unless other processes wrote in between, whose rows it still has to pull
+    def _written(self, revision):
+        if revision == self.revision + 1:
+            self.revision = revision
+
+    # Append typed rows, keeping the frame's categorical columns categorical
+    def _append(self, added):
+        if self._frame.empty:
+            self._frame = added
+        else:
+            self._frame, added = align_categories(self._frame, added)
+            self._frame = pd.concat([self._frame, added])
+
+    # Apply {task id -> {column -> value}} and mark only the changed rows dirty.
+    # Tasks that depend on a task whose dates changed are moved with it.
+    @synchronized
+    def update(self, changes):
+        applied = self._apply(changes)
+        moved = [task_id for task_id, fields in applied.items() if task_id in self.dependencies and not fields.keys().isdisjoint(DATE_COLUMNS)]
+        if moved:
+            self._apply_shifts(moved, applied)
+        if applied:
+            self._record('update', applied)
+
+    # Move the tasks depending on moved as far as their dependencies require,
+    # adding the new dates to applied; see DependencyGraph.propagate for pinned
+    def _apply_shifts(self, moved, applied, pinned=None):
+        shifted = self.dependencies.propagate(moved, self._frame['Start Date'], self._frame['End Date'], pinned)
+        for task_id, fields in self._apply({
+            task_id: {'Start Date': start, 'End Date': end} for task_id, (start, end) in shifted.items()
+        }).items():
+            applied.setdefault(task_id, {}).update(fields)
+
+    def _apply(self, changes):
+        applied = {}
+        for task_id, fields in changes.items():
+            for column, value in fields.items():
+                old_value = self._frame.at[task_id, column]
+                if column in DATE_COLUMNS:
+                    value = text_to_date(value)
+                    if (pd.isna(old_value) and pd.isna(value)) or old_value == value:
+                        continue
+                elif column == 'Completed':
+                    value = bool(value)
+                if old_value != value:
+                    if column in CATEGORY_COLUMNS:
+                        self._frame = add_categories(self._frame, column, [value])
+                    self._frame.at[task_id, column] = value
+                    self._dirty.setdefault(task_id, {})[column] = value
+                    applied.setdefault(task_id, {})[column] = value
+                    if column in self._counts:
+                        counts = self._counts[column]
+                        counts[old_value] -= 1
+                        if counts[old_value] <= 0:
+                            del counts[old_value]
+                        counts[value] += 1
+        return applied
+
+    # Add (predecessor id, successor id) dependencies, moving successors that
+    # start too early. Raises ValueError for unknown tasks and CycleError
+    # (adding none of the edges) when one would create a cycle.
+    @synchronized
+    def add_dependencies(self, edges):
+        edges = [(int(predecessor), int(successor)) for predecessor, successor in edges]
+        unknown = {task_id for edge in edges for task_id in edge} - set(self._frame.index)
+        if unknown:
+            raise ValueError(f"No task #{', #'.join(map(str, sorted(unknown)))} in this plan")
+        added = []
+        try:
+            for predecessor, successor in edges:
+                if self.dependencies.add(predecessor, successor):
+                    added.append((predecessor, successor))
+        except Exception:
+            for predecessor, successor in added:
+                self.dependencies.remove(predecessor, successor)
+            raise
+        if not added:
+            return
+        self.dependency_revision = self.store.update_dependencies(self.plan, added=added, actor=current_actor())
+        self._written(self.dependency_revision)
+        # No task was moved by the user here, so any of them may be pushed,
+        # including predecessors that are successors of another new edge
+        applied = {}
+        self._apply_shifts({predecessor for predecessor, _ in added}, applied, pinned=())
+        self._record('dependencies', {'added': added, 'moved': applied})
+
+    @synchronized
+    def remove_dependencies(self, edges):
+        removed = [(int(predecessor), int(successor)) for predecessor, successor in edges
+                   if self.dependencies.remove(int(predecessor), int(successor))]
+        if removed:
+            self.dependency_revision = self.store.update_dependencies(self.plan, removed=removed, actor=current_actor())
+            self._written(self.dependency_revision)
+            self._record('dependencies', {'removed': removed})
+
+    # Put the tasks back to their values at a past revision of the plan
+    # (dependencies are not moved along); tasks added since are kept. The
+    # changes are left dirty for flush(action='restore'). Returns the number
+    # of tasks changed; raises ValueError when the history doesn't reach revision.
+    @synchronized
+    def restore(self, revision):
+        past = self.store.load_tasks_at(self.plan, revision)
+        if past is None:
+            raise ValueError(f"The history of {self.plan} doesn't reach back to revision {revision}")
+        kept = past.index.intersection(self._frame.index)
+        current, past = self._frame.loc[kept, TASK_COLUMNS], past.loc[kept, TASK_COLUMNS]
+        changes = {}
+        for column in TASK_COLUMNS:
+            old, new = current[column].astype(object), past[column].astype(object)
+            differs = ~((old == new) | (old.isna() & new.isna()))
+            for task_id, value in new[differs].items():
+                changes.setdefault(task_id, {})[column] = value
+        applied = self._apply(changes)
+        if applied:
+            self._record('update', applied)
+        return len(applied)
+
+    # Ids of the tasks on the critical path (none until the plan has
+    # dependencies), computed once per model version
+    @synchronized
+    def critical_tasks(self):
+        if self._critical_version != self.version:
+            self._critical = frozenset(
+                self.dependencies.critical_tasks(self._frame['Start Date'], self._frame['End Date']) if len(self.dependencies) else ()
+            )
+            self._critical_version = self.version
+        return self._critical
+
+    # Set one column to the same value for many tasks in a single vectorized update
+    @synchronized
+    def set_values(self, task_ids, column, value):
+        old_values = self._frame.loc[task_ids, column]
+        changed = old_values[old_values != value]
+        if changed.empty:
+            return
+        if column in CATEGORY_COLUMNS:
+            self._frame = add_categories(self._frame, column, [value])
+        self._frame.loc[changed.index, column] = value
+        for task_id in changed.index:
+            self._dirty.setdefault(task_id, {})[column] = value
+        if column in self._counts:
+            counts = self._counts[column]
+            for old_value, moved in changed.value_counts().items():
+                counts[old_value] -= moved
+                if counts[old_value] <= 0:
+                    del counts[old_value]
+            counts[value] += len(changed)
+        self._record('set_values', (list(changed.index), column, value))
+
+    # Task ids grouped by status, computed once per model version
+    @synchronized
+    def status_index(self):
+        if self._status_index_version != self.version:
+            self._status_index = self._frame.groupby('Status', sort=False, observed=True).groups
+            self._status_index_version = self.version
+        return self._status_index
+
+    # Log a change; changes pulled from the store have no local author session
+    def _record(self, kind, payload, remote=False):
+        self.version += 1
+        self._log.append((self.version, None if remote else current_session_id(), kind, payload))
+
+    # Change log entries after version, or None when the log no longer reaches back that far
+    @synchronized
+    def changes_since(self, version):
+        if version >= self.version:
+            return []
+        if not self._log or self._log[0][0] > version + 1:
+            return None
+        return [entry for entry in self._log if entry[0] > version]
+
+    # Pull in rows other server processes wrote since this model's revision
+    # (or reload everything if the plan was re-created). Rows changed remotely
+    # replace any unsaved local edits to them.
+    @profiler.timed('store.refresh')
+    @synchronized
+    def refresh(self):
+        revision, base_revision = self.store.plan_revision(self.plan)
+        if base_revision != self.base_revision:
+            self._load()
+            self._record('reload', None, remote=True)
+            return
+        if revision <= self.revision:
+            return
+        if self.store.dependency_revision(self.plan) > self.dependency_revision:
+            self._load_dependencies()
+            self._record('dependencies', None, remote=True)
+        changed = self.store.load_tasks(self.plan, since=self.revision, versions=True)
+        self.revision = revision
+        changed_versions = changed.pop('Version')
+        changed = changed[[task_id not in self._row_versions or self._row_versions[task_id] < version
+                           for task_id, version in changed_versions.items()]]
+        if changed.empty:
+            return
+        self._row_versions.update(changed_versions[changed.index].to_dict())
+        existing = changed.index.intersection(self._frame.index)
+        for column in AGGREGATE_COLUMNS:
+            counts = self._counts[column]
+            counts.subtract(self._frame.loc[existing, column].tolist())
+            counts.update(changed[column].tolist())
+            for value in [value for value, count in counts.items() if count <= 0]:
+                del counts[value]
+        for task_id in existing:
+            self._dirty.pop(task_id, None)
+        self._frame, changed = align_categories(self._frame, changed)
+        self._frame.loc[existing, TASK_COLUMNS] = changed.loc[existing, TASK_COLUMNS]
+        added = changed.drop(existing)
+        if not added.empty:
+            self._append(added)
+        self._record('refresh', list(changed.index), remote=True)
+
+    # Persist the dirty rows in one batch, recorded in the plan's history as
+    # action. Rows another process changed first are not written; their latest
+    # values are loaded and WriteConflict is raised.
+    @profiler.timed('store.flush')
+    @synchronized
+    def flush(self, action='update', detail=None):
+        if not self._dirty:
+            return
+        versions = {task_id: self._row_versions.get(task_id) for task_id in self._dirty}
+        revision, conflicts = self.store.update_tasks(self.plan, self._dirty, versions, actor=current_actor(), action=action, detail=detail)
+        written = set(self._dirty) - set(conflicts)
+        self._row_versions.update(dict.fromkeys(written, revision))
+        self._written(revision)
+        self._dirty = {}
+        if conflicts:
+            for task_id in conflicts:
+                self._row_versions[task_id] = -1
+            self.refresh()
+            raise WriteConflict(conflicts)
+
+    # Rows and bytes held by this model's task frame
+    @synchronized
+    def memory_usage(self):
+        return len(self._frame), int(self._frame.memory_usage(deep=True).sum())
+
+
+# Process-wide plan state shared by all sessions: one TaskModel per plan
+# (least recently used plans are flushed and evicted) plus a versioned log of
+# plan metadata changes, so sessions pull only what changed since they last looked.
+# Metadata changes made by other server processes are pulled from the store
+# into the same log by refresh_plans().
+class SharedPlanCache:
+    def __init__(self, store, max_plans=256):
+        self.store = store
+        self.max_plans = max_plans
+        self.meta_version = 0
+        self._lock = threading.Lock()
+        self._models = OrderedDict()
+        self._loading = {}  # plan -> Future of the model being loaded
+        self.hits = 0
+        self.misses = 0
+        self._meta_log = deque(maxlen=CHANGE_LOG_SIZE)  # (version, plan name, metadata)
+        self.store_meta_revision, _ = store.plans_since(0)
+
+    # The plan's model, loaded on first use. Loading reads the whole plan, so
+    # it runs outside the cache lock: sessions asking for other plans are not
+    # held up, and sessions asking for the same plan wait for the one load.
+    def model(self, plan):
+        with self._lock:
+            model = self._models.get(plan)
+            if model is not None:
+                self.hits += 1
+                self._models.move_to_end(plan)
+                return model
+            self.misses += 1
+            loading = self._loading.get(plan)
+            if loading is not None:
+                loading_here = False
+            else:
+                loading = self._loading[plan] = Future()
+                loading_here = True
+        if not loading_here:
+            return loading.result()
+        try:
+            model = TaskModel(self.store, plan)
+        except BaseException as error:
+            with self._lock:
+                del self._loading[plan]
+            loading.set_exception(error)
+            raise
+        with self._lock:
+            del self._loading[plan]
+            # A plan re-created while loading keeps its newer model
+            model = self._models.setdefault(plan, model)
+            self._models.move_to_end(plan)
+            evicted = self._evict()
+        loading.set_result(model)
+        self._flush(evicted)
+        return model
+
+    # {plan -> (rows, bytes)} for the models currently held
+    def memory_usage(self):
+        with self._lock:
+            models = list(self._models.items())
+        return {plan: model.memory_usage() for plan, model in models}
+
+    # Swap in a new model for a plan that was (re)created
+    def replace(self, plan, model):
+        with self._lock:
+            self._models[plan] = model
+            self._models.move_to_end(plan)
+            evicted = self._evict()
+        self._flush(evicted)
+
+    # Drop the least recently used models over max_plans; called with the
+    # lock held, the caller flushes the returned models after releasing it
+    def _evict(self):
+        evicted = []
+        while len(self._models) > self.max_plans:
+            evicted.append(self._models.popitem(last=False)[1])
+        return evicted
+
+    @staticmethod
+    def _flush(models):
+        for model in models:
+            try:
+                model.flush()
+            except WriteConflict:
+                pass  # the other writer's version is already in the store
+
+    def publish_plan(self, name, meta):
+        with self._lock:
+            self._publish(name, meta)
+
+    def _publish(self, name, meta):
+        self.meta_version += 1
+        self._meta_log.append((self.meta_version, name, dict(meta)))
+
+    # Publish plan metadata other server processes changed since the last refresh
+    def refresh_plans(self):
+        revision, changed = self.store.plans_since(self.store_meta_revision)
+        with self._lock:
+            if revision <= self.store_meta_revision:
+                return
+            self.store_meta_revision = revision
+            for name, meta in changed.items():
+                self._publish(name, meta)
+
+    # Metadata changes after version, or None when the log no longer reaches back that far
+    def plan_changes_since(self, version):
+        with self._lock:
+            if version >= self.meta_version:
+                return []
+            if not self._meta_log or self._meta_log[0][0] > version + 1:
+                return None
+            return [(name, meta) for entry_version, name, meta in self._meta_log if entry_version > version]
+
+@st.cache_resource
+def get_shared_plans():
+    return SharedPlanCache(get_task_store(), int(os.environ.get('TASKFLOW_SHARED_PLANS', 256)))
+
+# Debounced, batched autosave for plan notes, shared by every session. Edits
+# wait in memory (the latest text per note wins) until interval seconds after
+# the first one, then every pending note is written in one save_notes() call,
+# so typing causes at most one write per interval. flush() writes right away,
+# for explicit saves and at exit. Saved notes are also indexed for search.
+class NoteWriter:
+    def __init__(self, store, interval):
+        self.store = store
+        self.interval = interval
+        self.writes = 0
+        self._pending = {}  # (plan, kind) -> text
+        self._revisions = {}  # (plan, kind) -> last saved revision
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # keeps batches in submission order
+        self._timer = None
+        atexit.register(self.flush)
+
+    def submit(self, plan, kind, text):
+        with self._lock:
+            self._pending[(plan, kind)] = text
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    # (text, revision, unsaved): pending text when there is some, else the stored note
+    def load(self, plan, kind):
+        with self._lock:
+            if (plan, kind) in self._pending:
+                return self._pending[(plan, kind)], self._revisions.get((plan, kind), 0), True
+        text, revision = self.store.load_note(plan, kind)
+        return text, revision, False
+
+    @profiler.timed('notes.flush')
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return
+            try:
+                revisions = self.store.save_notes(batch)
+            except Exception:
+                # Keep the edits for the next attempt, unless newer text arrived meanwhile
+                with self._lock:
+                    for key, text in batch.items():
+                        self._pending.setdefault(key, text)
+                raise
+            self.writes += 1
+            with self._lock:
+                self._revisions.update(revisions)
+            for (plan, kind), text in batch.items():
+                self.store.index_document(plan, kind, NOTE_TITLES.get(kind, kind), text)
+
+@st.cache_resource
+def get_note_writer():
+    return NoteWriter(get_task_store(), NOTE_AUTOSAVE_SECONDS)
+
+# Secondary indexes over plan metadata for the sidebar filter tabs, kept up to
+# date on plan create/select/modify instead of rescanning every plan per rerun.
+# Each filter is a name-sorted list maintained with bisect; "Recent" is ordered
+# by last access time.
+class PlanIndex:
+    def __init__(self, plans):
+        self._entries = {}  # name -> (recent key, privacy, pinned, group)
+        self._recent_keys = []
+        self._recent = []
+        self._privacy = {}
+        self._pinned = []
+        self._grouped = []
+        for name, meta in plans.items():
+            self.add(name, meta)
+
+    # Most recently accessed first; plans never accessed (the store gives
+    # datetime.min, whose timestamp() raises) go last, by name
+    @staticmethod
+    def _recent_key(name, last_accessed):
+        if last_accessed is None or last_accessed == datetime.min:
+            return (0, name)
+        return (-last_accessed.timestamp(), name)
+
+    @staticmethod
+    def _insert(names, name):
+        bisect.insort(names, name)
+
+    @staticmethod
+    def _discard(names, name):
+        position = bisect.bisect_left(names, name)
+        if position < len(names) and names[position] == name:
+            del names[position]
+
+    def add(self, name, meta):
+        if name in self._entries:
+            self.remove(name)
+        recent_key = self._recent_key(name, meta.get('last_accessed'))
+        position = bisect.bisect_left(self._recent_keys, recent_key)
+        self._recent_keys.insert(position, recent_key)
+        self._recent.insert(position, name)
+        self._insert(self._privacy.setdefault(meta['privacy'], []), name)
+        if meta['pinned']:
+            self._insert(self._pinned, name)
+        if meta['group'] is not None:
+            self._insert(self._grouped, name)
+        self._entries[name] = (recent_key, meta['privacy'], bool(meta['pinned']), meta['group'])
+
+    def remove(self, name):
+        recent_key, privacy, pinned, group = self._entries.pop(name)
+        position = bisect.bisect_left(self._recent_keys, recent_key)
+        del self._recent_keys[position]
+        del self._recent[position]
+        self._discard(self._privacy[privacy], name)
+        if pinned:
+            self._discard(self._pinned, name)
+        if group is not None:
+            self._discard(self._grouped, name)
+
+    # Plan names for a sidebar filter tab
+    def filter(self, filter_name):
+        if filter_name == "Recent":
+            return self._recent
+        if filter_name == "Shared":
+            return self._privacy.get('Shared', [])
+        if filter_name == "Personal":
+            return self._privacy.get('Private', [])
+        if filter_name == "Pinned":
+            return self._pinned
+        if filter_name == "My Teams":
+            return self._grouped
+        raise ValueError(f"Unknown plan filter: {filter_name}")
@@ -0,0 +1,895 @@
+# Plan and task storage backends
+import bisect
+import importlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from taskflow.config import DATE_COLUMNS, PLAN_FIELDS, TASK_COLUMNS, TASK_DB_COLUMNS, TIMESTAMP_FORMAT
+from taskflow.history import describe_added, describe_changed, describe_dependencies, encode_snapshot, replay_snapshot, row_deltas, should_snapshot
+from taskflow.notes import next_revision, replay
+from taskflow.schema import tasks_frame
+from taskflow.search import InvertedIndex, fts_query
+
+
+# Storage form of a task date: "YYYY-MM-DD", or None when unset
+def date_to_text(value):
+    return None if pd.isna(value) else pd.Timestamp(value).strftime("%Y-%m-%d")
+
+# In-memory form of a task date: a Timestamp, or NaT when unset
+def text_to_date(value):
+    return pd.NaT if value is None or pd.isna(value) or value == "" else pd.Timestamp(value).normalize()
+
+# Storage form of any task field value
+def value_to_storage(column, value):
+    return int(bool(value)) if column == 'Completed' else date_to_text(value) if column in DATE_COLUMNS else value
+
+# Storage backend interface for plans and tasks.
+# Tasks are returned as DataFrames indexed by a stable task id, so views can
+# load only the rows they need instead of keeping every plan in session state.
+#
+# Every task write bumps the plan's revision and stamps the written rows with
+# it, so the row version doubles as an optimistic concurrency token and as a
+# cursor for loading only the rows changed since a revision. Plan metadata
+# carries a store-wide revision the same way. Task writes are also recorded
+# in the plan's history (see taskflow.history) with the actor who made them.
+# A networked backend implements this interface and is selected with
+# TASKFLOW_STORE=module:Class.
+class TaskStore:
+    def list_plans(self):
+        raise NotImplementedError
+
+    # (latest metadata revision, {name -> metadata} of plans changed after revision)
+    def plans_since(self, revision):
+        raise NotImplementedError
+
+    def plan_exists(self, name):
+        raise NotImplementedError
+
+    # Create a plan, replacing any existing plan (and its tasks) of the same name
+    def save_plan(self, name, meta):
+        raise NotImplementedError
+
+    def update_plan(self, name, **fields):
+        raise NotImplementedError
+
+    # (revision, base revision) of a plan; the base moves when the plan's tasks are replaced
+    def plan_revision(self, plan):
+        raise NotImplementedError
+
+    # since: only rows written after that revision; versions: include a Version column
+    def load_tasks(self, plan, status=None, assignee=None, dated=None, columns=None, since=None, versions=False):
+        raise NotImplementedError
+
+    # Task frames of at most chunk_size rows in id order, for exports that
+    # must not hold a whole plan in memory. Backends that can page should override this.
+    def iter_tasks(self, plan, chunk_size):
+        tasks = self.load_tasks(plan)
+        for start in range(0, len(tasks), chunk_size):
+            yield tasks.iloc[start:start + chunk_size]
+
+    # Returns (task ids, revision the rows were written at). action is 'add'
+    # or 'import', for the history.
+    def add_tasks(self, plan, tasks, actor=None, action='add'):
+        raise NotImplementedError
+
+    # Apply {task id -> {column -> value}}. With versions ({task id -> expected
+    # version}), rows changed by someone else since are skipped. Returns
+    # (revision the rows were written at, ids of the skipped rows). action is
+    # 'update' or 'restore', with an optional detail, for the history.
+    def update_tasks(self, plan, changes, versions=None, actor=None, action='update', detail=None):
+        raise NotImplementedError
+
+    # Tasks of every plan in one frame, with a Plan column before the given
+    # columns, for cross-plan reports
+    def load_all_tasks(self, columns=None):
+        raise NotImplementedError
+
+    # Changes whenever a task of any plan is written, so cross-plan reports
+    # can be cached until the data changes
+    def data_version(self):
+        raise NotImplementedError
+
+    # Full-text search over task titles and assignees, plan names and indexed
+    # documents. Returns up to limit hits, best first, as dicts with kind
+    # ('task', 'plan' or a document kind), plan, ref (task id or document
+    # title), title, snippet and score. Raises NotImplementedError for
+    # backends without search.
+    def search(self, text, limit=20):
+        raise NotImplementedError
+
+    # Add or replace a searchable document attached to a plan, such as
+    # whiteboard notes or the text of an uploaded file. Backends without
+    # search may ignore it.
+    def index_document(self, plan, kind, title, body):
+        pass
+
+    # A plan's task dependencies as (predecessor id, successor id) pairs (see
+    # taskflow.scheduling) and the plan revision they were last changed at
+    def load_dependencies(self, plan):
+        raise NotImplementedError
+
+    # Add and remove dependencies in one batch; returns the revision written
+    def update_dependencies(self, plan, added=(), removed=(), actor=None):
+        raise NotImplementedError
+
+    def dependency_revision(self, plan):
+        raise NotImplementedError
+
+    # Text and revision number of a plan's note, such as its whiteboard (see
+    # taskflow.notes); ('', 0) for a note never saved
+    def load_note(self, plan, kind):
+        raise NotImplementedError
+
+    # Save {(plan, kind) -> text} as one batch, appending a revision to each
+    # note whose text changed. Returns {(plan, kind) -> revision}.
+    def save_notes(self, notes):
+        raise NotImplementedError
+
+    # A plan's activity, newest first: dicts with revision, time, actor,
+    # action (see taskflow.history.HISTORY_ACTIONS), tasks (how many were
+    # affected) and detail
+    def load_history(self, plan, limit=50):
+        raise NotImplementedError
+
+    # A plan's tasks as they were at revision, or None when its history
+    # doesn't reach back that far
+    def load_tasks_at(self, plan, revision):
+        raise NotImplementedError
+
+    # Helper shared by the backends to build a typed task frame (see
+    # taskflow.schema) from (id, *columns) rows
+    @staticmethod
+    def _frame(rows, columns=None):
+        columns = columns or TASK_COLUMNS
+        return tasks_frame([row[1:] for row in rows], columns, ids=[row[0] for row in rows])
+
+
+# Optimistic concurrency failure: the tasks were changed by another writer
+class WriteConflict(Exception):
+    def __init__(self, task_ids):
+        super().__init__(f"{len(task_ids)} task(s) were changed by someone else")
+        self.task_ids = task_ids
+
+
+# In-memory backend, used for tests and throwaway sessions (single process only)
+class InMemoryTaskStore(TaskStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans = {}
+        self._plan_revisions = {}  # plan -> [revision, base revision, metadata revision]
+        self._tasks = {}  # plan -> {task id -> row dict}
+        self._next_id = 1
+        self._meta_revision = 0
+        self._search = InvertedIndex()
+        self._notes = {}  # (plan, kind) -> [(revision, snapshot, start, stop, body)] since the last snapshot
+        self._dependencies = {}  # plan -> [set of (predecessor, successor), revision]
+        self._history = {}  # plan -> {'entries', 'snapshots' (revision, size, data), 'deltas' (revision, *delta), 'pending'}
+
+    def list_plans(self):
+        with self._lock:
+            return {name: dict(meta) for name, meta in self._plans.items()}
+
+    def plans_since(self, revision):
+        with self._lock:
+            changed = {name: dict(self._plans[name]) for name, revisions in self._plan_revisions.items() if revisions[2] > revision}
+            return self._meta_revision, changed
+
+    def plan_exists(self, name):
+        with self._lock:
+            return name in self._plans
+
+    def save_plan(self, name, meta):
+        with self._lock:
+            self._plans[name] = {field: meta.get(field) for field in PLAN_FIELDS}
+            for task_id in self._tasks.get(name, {}):
+                self._search.remove(('task', task_id))
+            self._tasks[name] = {}
+            self._dependencies.pop(name, None)
+            # A re-created plan starts without the old plan's history, notes and documents
+            self._history.pop(name, None)
+            for key in [key for key in self._notes if key[0] == name]:
+                del self._notes[key]
+            self._search.remove_where(lambda key: len(key) == 3 and key[1] == name)
+            self._search.add(('plan', name), {'kind': 'plan', 'plan': name, 'ref': name, 'title': name}, name)
+            revision = self._plan_revisions.get(name, [0])[0] + 1
+            self._meta_revision += 1
+            self._plan_revisions[name] = [revision, revision, self._meta_revision]
+            self._record_history(name, revision, None, 'create', 0)
+            self._snapshot(name, revision)
+
+    def update_plan(self, name, **fields):
+        with self._lock:
+            self._plans[name].update(fields)
+            self._meta_revision += 1
+            self._plan_revisions[name][2] = self._meta_revision
+
+    def plan_revision(self, plan):
+        with self._lock:
+            return tuple(self._plan_revisions.get(plan, [0, 0])[:2])
+
+    def _bump(self, plan):
+        revisions = self._plan_revisions.setdefault(plan, [0, 0, 0])
+        revisions[0] += 1
+        return revisions[0]
+
+    def load_tasks(self, plan, status=None, assignee=None, dated=None, columns=None, since=None, versions=False):
+        columns = columns or TASK_COLUMNS
+        with self._lock:
+            rows = []
+            for task_id, row in self._tasks.get(plan, {}).items():
+                if since is not None and row['Version'] <= since:
+                    continue
+                if status is not None and row['Status'] != status:
+                    continue
+                if assignee is not None and row['Assigned To'] != assignee:
+                    continue
+                if dated is not None and (pd.notna(row['Start Date']) and pd.notna(row['End Date'])) != dated:
+                    continue
+                rows.append([task_id] + [row[column] for column in columns] + ([row['Version']] if versions else []))
+        return self._frame(rows, columns + ['Version'] if versions else columns)
+
+    def add_tasks(self, plan, tasks, actor=None, action='add'):
+        with self._lock:
+            plan_tasks = self._tasks.setdefault(plan, {})
+            revision = self._bump(plan)
+            ids = []
+            for record in tasks.to_dict('records'):
+                row = {column: record.get(column) for column in TASK_COLUMNS}
+                for column in DATE_COLUMNS:
+                    row[column] = date_to_text(row[column])
+                row['Version'] = revision
+                plan_tasks[self._next_id] = row
+                self._index_task(plan, self._next_id, row)
+                ids.append(self._next_id)
+                self._next_id += 1
+            if ids:
+                self._record_history(plan, revision, actor, action, len(ids),
+                                     describe_added([plan_tasks[task_id]['Task'] for task_id in ids]),
+                                     row_deltas([self._stored_row(task_id, plan_tasks[task_id]) for task_id in ids]))
+            return ids, revision
+
+    def update_tasks(self, plan, changes, versions=None, actor=None, action='update', detail=None):
+        with self._lock:
+            plan_tasks = self._tasks.get(plan, {})
+            revision = self._bump(plan)
+            conflicts = []
+            written = {}
+            for task_id, fields in changes.items():
+                row = plan_tasks.get(task_id)
+                if row is None or (versions is not None and row['Version'] != versions.get(task_id)):
+                    conflicts.append(task_id)
+                    continue
+                row.update({
+                    column: date_to_text(value) if column in DATE_COLUMNS else value for column, value in fields.items()
+                })
+                row['Version'] = revision
+                written[task_id] = fields
+                if 'Task' in fields or 'Assigned To' in fields:
+                    self._index_task(plan, task_id, row)
+            if written:
+                self._record_history(plan, revision, actor, action, len(written), detail or describe_changed(written), [
+                    (task_id, column, value_to_storage(column, value)) for task_id, fields in written.items() for column, value in fields.items()
+                ])
+            return revision, conflicts
+
+    def load_all_tasks(self, columns=None):
+        columns = columns or TASK_COLUMNS
+        with self._lock:
+            rows = [
+                [task_id, plan] + [row[column] for column in columns]
+                for plan, plan_tasks in self._tasks.items() for task_id, row in plan_tasks.items()
+            ]
+        return self._frame(rows, ['Plan'] + columns)
+
+    def data_version(self):
+        with self._lock:
+            return len(self._plan_revisions), sum(revisions[0] for revisions in self._plan_revisions.values())
+
+    def _index_task(self, plan, task_id, row):
+        self._search.add(('task', task_id), {'kind': 'task', 'plan': plan, 'ref': task_id, 'title': row['Task']},
+                         row['Task'], row['Assigned To'])
+
+    def search(self, text, limit=20):
+        with self._lock:
+            hits = self._search.search(text, limit)
+        return [{**payload, 'snippet': snippet, 'score': round(score, 3)} for score, payload, snippet in hits]
+
+    def index_document(self, plan, kind, title, body):
+        with self._lock:
+            self._search.add((kind, plan, title), {'kind': kind, 'plan': plan, 'ref': title, 'title': title}, title, body)
+
+    def load_dependencies(self, plan):
+        with self._lock:
+            edges, revision = self._dependencies.get(plan, [set(), 0])
+            return list(edges), revision
+
+    def update_dependencies(self, plan, added=(), removed=(), actor=None):
+        with self._lock:
+            dependencies = self._dependencies.setdefault(plan, [set(), 0])
+            dependencies[0].difference_update(removed)
+            dependencies[0].update(added)
+            dependencies[1] = self._bump(plan)
+            self._record_history(plan, dependencies[1], actor, 'dependencies', len(added) + len(removed),
+                                 describe_dependencies(added, removed))
+            return dependencies[1]
+
+    def dependency_revision(self, plan):
+        with self._lock:
+            return self._dependencies.get(plan, [set(), 0])[1]
+
+    @staticmethod
+    def _stored_row(task_id, row):
+        return (task_id, *(value_to_storage(column, row[column]) for column in TASK_COLUMNS))
+
+    # Append an activity entry and the write's deltas (None for writes that
+    # don't change task fields), or a snapshot in their place
+    def _record_history(self, plan, revision, actor, action, count, detail=None, deltas=None):
+        history = self._history.setdefault(plan, {'entries': [], 'snapshots': [], 'deltas': [], 'pending': 0})
+        history['entries'].append({'revision': revision, 'time': datetime.now(), 'actor': actor, 'action': action,
+                                   'tasks': count, 'detail': detail})
+        if deltas is None:
+            return
+        snapshots = history['snapshots']
+        if should_snapshot(history['pending'], len(deltas), snapshots[-1][1] if snapshots else None):
+            self._snapshot(plan, revision)
+        else:
+            history['deltas'].extend((revision, *delta) for delta in deltas)
+            history['pending'] += len(deltas)
+
+    def _snapshot(self, plan, revision):
+        history = self._history[plan]
+        rows = [self._stored_row(task_id, row) for task_id, row in self._tasks.get(plan, {}).items()]
+        history['snapshots'].append((revision, len(rows), encode_snapshot(rows)))
+        history['pending'] = 0
+
+    def load_history(self, plan, limit=50):
+        with self._lock:
+            entries = self._history.get(plan, {}).get('entries', [])
+            return [dict(entry) for entry in reversed(entries[-limit:])]
+
+    def load_tasks_at(self, plan, revision):
+        with self._lock:
+            history = self._history.get(plan)
+            if history is None:
+                return None
+            snapshots = history['snapshots']
+            position = bisect.bisect_right(snapshots, revision, key=lambda snapshot: snapshot[0])
+            if not position:
+                return None
+            start, _, data = snapshots[position - 1]
+            deltas = history['deltas']
+            first = bisect.bisect_right(deltas, start, key=lambda delta: delta[0])
+            last = bisect.bisect_right(deltas, revision, key=lambda delta: delta[0])
+            selected = [delta[1:] for delta in deltas[first:last]]
+        return self._frame(replay_snapshot(data, selected))
+
+    def load_note(self, plan, kind):
+        with self._lock:
+            revisions = self._notes.get((plan, kind), [])
+            return replay(revision[1:] for revision in revisions), revisions[-1][0] if revisions else 0
+
+    def save_notes(self, notes):
+        saved = {}
+        with self._lock:
+            for key, text in notes.items():
+                revisions = self._notes.setdefault(key, [])
+                old = replay(revision[1:] for revision in revisions)
+                number = revisions[-1][0] if revisions else 0
+                if text != old or not revisions:
+                    number += 1
+                    revision = next_revision(old, text, max(0, len(revisions) - 1))
+                    if revision[0]:
+                        revisions.clear()
+                    revisions.append((number, *revision))
+                saved[key] = number
+        return saved
+
+
+# SQLite backend (default). Plans and tasks live in two tables, with the
+# task table indexed on plan together with status, assignee, dates and
+# version. The database runs in WAL mode so several server processes can
+# share one file: readers never block, and writers wait up to
+# TASKFLOW_DB_BUSY_TIMEOUT seconds for each other.
+# History is an activity table, a task_changes delta log and compressed
+# plan_snapshots (see taskflow.history), written in each task write's transaction.
+# Search uses FTS5 tables over the tasks, plans and documents tables, kept
+# in sync in the same transaction as the data: by triggers, except for new
+# tasks, which add_tasks indexes with one statement per batch (a per-row
+# trigger made bulk imports several times slower).
+class SQLiteTaskStore(TaskStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS plans (
+            name TEXT PRIMARY KEY,
+            privacy TEXT,
+            last_accessed TEXT,
+            shared_with TEXT,
+            template TEXT,
+            pinned INTEGER,
+            group_name TEXT,
+            ai_assisted INTEGER,
+            revision INTEGER NOT NULL DEFAULT 0,
+            base_revision INTEGER NOT NULL DEFAULT 0,
+            meta_revision INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan TEXT NOT NULL REFERENCES plans(name),
+            task TEXT,
+            status TEXT,
+            assigned_to TEXT,
+            completed INTEGER,
+            start_date TEXT,
+            end_date TEXT,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            plan TEXT NOT NULL,
+            predecessor INTEGER NOT NULL,
+            successor INTEGER NOT NULL,
+            PRIMARY KEY (predecessor, successor)
+        );
+        CREATE TABLE IF NOT EXISTS note_revisions (
+            plan TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            snapshot INTEGER NOT NULL,
+            start INTEGER,
+            stop INTEGER,
+            body TEXT,
+            saved_at TEXT,
+            PRIMARY KEY (plan, kind, revision)
+        );
+        CREATE TABLE IF NOT EXISTS plan_history (
+            plan TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            saved_at TEXT,
+            actor TEXT,
+            action TEXT NOT NULL,
+            tasks INTEGER,
+            detail TEXT,
+            PRIMARY KEY (plan, revision)
+        );
+        CREATE TABLE IF NOT EXISTS task_changes (
+            plan TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            task_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            value
+        );
+        CREATE TABLE IF NOT EXISTS plan_snapshots (
+            plan TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            tasks INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (plan, revision)
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            title TEXT NOT NULL,
+            body TEXT,
+            UNIQUE (plan, kind, title)
+        );
+    """
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_tasks_plan_status ON tasks(plan, status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_plan_assignee ON tasks(plan, assigned_to);
+        CREATE INDEX IF NOT EXISTS idx_tasks_plan_dates ON tasks(plan, start_date, end_date);
+        CREATE INDEX IF NOT EXISTS idx_tasks_plan_version ON tasks(plan, version);
+        CREATE INDEX IF NOT EXISTS idx_tasks_plan_id ON tasks(plan, id);
+        CREATE INDEX IF NOT EXISTS idx_plans_meta_revision ON plans(meta_revision);
+        CREATE INDEX IF NOT EXISTS idx_task_dependencies_plan ON task_dependencies(plan);
+        CREATE INDEX IF NOT EXISTS idx_task_changes_plan_revision ON task_changes(plan, revision);
+    """
+    # External-content FTS5 indexes and the triggers that maintain them. REPLACE
+    # on plans removes the old row, which only fires the delete trigger with
+    # recursive_triggers on.
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            task, assigned_to, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS plans_fts USING fts5(
+            name, content='plans', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+            title, body, content='documents', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task, assigned_to) VALUES ('delete', old.id, old.task, old.assigned_to);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF task, assigned_to ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task, assigned_to) VALUES ('delete', old.id, old.task, old.assigned_to);
+            INSERT INTO tasks_fts (rowid, task, assigned_to) VALUES (new.id, new.task, new.assigned_to);
+        END;
+        CREATE TRIGGER IF NOT EXISTS plans_fts_insert AFTER INSERT ON plans BEGIN
+            INSERT INTO plans_fts (rowid, name) VALUES (new.rowid, new.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS plans_fts_delete AFTER DELETE ON plans BEGIN
+            INSERT INTO plans_fts (plans_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+            INSERT INTO documents_fts (documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        END;
+    """
+    SEARCH_TABLES = ['tasks_fts', 'plans_fts', 'documents_fts']
+    # One query per indexed table: (kind, plan, ref, title, snippet, bm25 score)
+    SEARCH_QUERIES = [
+        """SELECT 'task', tasks.plan, tasks.id, tasks.task, snippet(tasks_fts, -1, '**', '**', '…', 12), bm25(tasks_fts)
+           FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid WHERE tasks_fts MATCH ? ORDER BY rank LIMIT ?""",
+        """SELECT 'plan', plans.name, plans.name, plans.name, snippet(plans_fts, 0, '**', '**', '…', 12), bm25(plans_fts)
+           FROM plans_fts JOIN plans ON plans.rowid = plans_fts.rowid WHERE plans_fts MATCH ? ORDER BY rank LIMIT ?""",
+        """SELECT documents.kind, documents.plan, documents.title, documents.title,
+                  snippet(documents_fts, 1, '**', '**', '…', 12), bm25(documents_fts)
+           FROM documents_fts JOIN documents ON documents.id = documents_fts.rowid WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?"""
+    ]
+    # Columns added since the first schema, for upgrading existing databases
+    ADDED_COLUMNS = {
+        'plans': {
+            'revision': "INTEGER NOT NULL DEFAULT 0",
+            'base_revision': "INTEGER NOT NULL DEFAULT 0",
+            'meta_revision': "INTEGER NOT NULL DEFAULT 0",
+            'dependency_revision': "INTEGER NOT NULL DEFAULT 0",
+            'history_changes': "INTEGER NOT NULL DEFAULT 0"
+        },
+        'tasks': {'version': "INTEGER NOT NULL DEFAULT 0"}
+    }
+    PLAN_COLUMNS = "name, privacy, last_accessed, shared_with, template, pinned, group_name, ai_assisted"
+    # Next store-wide metadata revision, assigned inside the writing statement so it is atomic
+    NEXT_META_REVISION = "(SELECT COALESCE(MAX(meta_revision), 0) + 1 FROM plans)"
+
+    def __init__(self, path, busy_timeout=30.0):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA recursive_triggers=ON")
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+            for table, columns in self.ADDED_COLUMNS.items():
+                existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for column, definition in columns.items():
+                    if column not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self._conn.executescript(self.INDEXES)
+        self._searchable = self._create_search_index()
+
+    # Create the FTS5 tables (built once from existing rows for databases that
+    # predate search); False when this SQLite was compiled without FTS5
+    def _create_search_index(self):
+        existing = {row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        try:
+            with self._conn:
+                self._conn.executescript(self.SEARCH_SCHEMA)
+                for table in self.SEARCH_TABLES:
+                    if table not in existing:
+                        self._conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+        except sqlite3.OperationalError as error:
+            if 'fts5' not in str(error):
+                raise
+            return False
+        return True
+
+    @staticmethod
+    def _plan_meta(row):
+        return {
+            'privacy': row[1],
+            'last_accessed': datetime.fromisoformat(row[2]) if row[2] else datetime.min,
+            'shared_with': json.loads(row[3] or '[]'),
+            'template': row[4],
+            'pinned': bool(row[5]),
+            'group': row[6],
+            'ai_assisted': bool(row[7])
+        }
+
+    def list_plans(self):
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {self.PLAN_COLUMNS} FROM plans").fetchall()
+        return {row[0]: self._plan_meta(row) for row in rows}
+
+    def plans_since(self, revision):
+        with self._lock:
+            latest = self._conn.execute("SELECT COALESCE(MAX(meta_revision), 0) FROM plans").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {self.PLAN_COLUMNS} FROM plans WHERE meta_revision > ? AND meta_revision <= ?", (revision, latest)
+            ).fetchall()
+        return latest, {row[0]: self._plan_meta(row) for row in rows}
+
+    def plan_exists(self, name):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM plans WHERE name = ?", (name,)).fetchone() is not None
+
+    def save_plan(self, name, meta):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE plan = ?", (name,))
+            self._conn.execute("DELETE FROM task_dependencies WHERE plan = ?", (name,))
+            # A re-created plan starts without the old plan's history, notes and documents
+            for table in ('plan_history', 'task_changes', 'plan_snapshots', 'note_revisions', 'documents'):
+                self._conn.execute(f"DELETE FROM {table} WHERE plan = ?", (name,))
+            # Keep the revision counting up across re-creation so stale readers notice
+            previous = self._conn.execute("SELECT revision FROM plans WHERE name = ?", (name,)).fetchone()
+            revision = (previous[0] if previous else 0) + 1
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO plans ({self.PLAN_COLUMNS}, revision, base_revision, meta_revision) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {self.NEXT_META_REVISION})",
+                (name, meta.get('privacy'), self._timestamp(meta.get('last_accessed')), json.dumps(meta.get('shared_with') or []),
+                 meta.get('template'), int(bool(meta.get('pinned'))), meta.get('group'), int(bool(meta.get('ai_assisted'))),
+                 revision, revision)
+            )
+            self._record_history(name, revision, None, 'create', 0)
+            self._snapshot(name, revision)
+
+    def update_plan(self, name, **fields):
+        if 'last_accessed' in fields:
+            fields['last_accessed'] = self._timestamp(fields['last_accessed'])
+        if 'shared_with' in fields:
+            fields['shared_with'] = json.dumps(fields['shared_with'] or [])
+        if 'group' in fields:
+            fields['group_name'] = fields.pop('group')
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE plans SET {assignments}, meta_revision = {self.NEXT_META_REVISION} WHERE name = ?", (*fields.values(), name)
+            )
+
+    @staticmethod
+    def _timestamp(value):
+        return value.strftime(TIMESTAMP_FORMAT) if isinstance(value, datetime) else value
+
+    def plan_revision(self, plan):
+        with self._lock:
+            row = self._conn.execute("SELECT revision, base_revision FROM plans WHERE name = ?", (plan,)).fetchone()
+        return tuple(row) if row else (0, 0)
+
+    # Bump the plan's revision inside the caller's write transaction
+    def _bump(self, plan):
+        self._conn.execute("UPDATE plans SET revision = revision + 1 WHERE name = ?", (plan,))
+        row = self._conn.execute("SELECT revision FROM plans WHERE name = ?", (plan,)).fetchone()
+        return row[0] if row else 0
+
+    def load_tasks(self, plan, status=None, assignee=None, dated=None, columns=None, since=None, versions=False):
+        columns = columns or TASK_COLUMNS
+        selected = [TASK_DB_COLUMNS[column] for column in columns] + (['version'] if versions else [])
+        query = f"SELECT id, {', '.join(selected)} FROM tasks WHERE plan = ?"
+        params = [plan]
+        if since is not None:
+            query += " AND version > ?"
+            params.append(since)
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if assignee is not None:
+            query += " AND assigned_to = ?"
+            params.append(assignee)
+        if dated is True:
+            query += " AND start_date IS NOT NULL AND end_date IS NOT NULL"
+        elif dated is False:
+            query += " AND (start_date IS NULL OR end_date IS NULL)"
+        query += " ORDER BY id"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return self._frame(rows, columns + ['Version'] if versions else columns)
+
+    # Keyset pagination over the plan's rows
+    def iter_tasks(self, plan, chunk_size):
+        selected = ', '.join(TASK_DB_COLUMNS[column] for column in TASK_COLUMNS)
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {selected} FROM tasks WHERE plan = ? AND id > ? ORDER BY id LIMIT ?",
+                    (plan, last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield self._frame(rows)
+            last_id = rows[-1][0]
+
+    def add_tasks(self, plan, tasks, actor=None, action='add'):
+        rows = [
+            (plan, record['Task'], record['Status'], record['Assigned To'], int(bool(record['Completed'])),
+             date_to_text(record['Start Date']), date_to_text(record['End Date']))
+            for record in tasks[TASK_COLUMNS].to_dict('records')
+        ]
+        ids = []
+        with self._lock, self._conn:
+            revision = self._bump(plan)
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT INTO tasks (plan, task, status, assigned_to, completed, start_date, end_date, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*row, revision)
+                )
+                ids.append(cursor.lastrowid)
+            if ids and self._searchable:
+                self._conn.execute(
+                    "INSERT INTO tasks_fts (rowid, task, assigned_to) SELECT id, task, assigned_to FROM tasks WHERE plan = ? AND id BETWEEN ? AND ?",
+                    (plan, ids[0], ids[-1])
+                )
+            if ids:
+                self._record_history(plan, revision, actor, action, len(ids), describe_added([row[1] for row in rows]),
+                                     row_deltas([(task_id, *row[1:]) for task_id, row in zip(ids, rows)]))
+        return ids, revision
+
+    def update_tasks(self, plan, changes, versions=None, actor=None, action='update', detail=None):
+        conflicts = []
+        written = {}
+        deltas = []
+        with self._lock, self._conn:
+            revision = self._bump(plan)
+            for task_id, fields in changes.items():
+                assignments = ", ".join(f"{TASK_DB_COLUMNS[column]} = ?" for column in fields)
+                values = [value_to_storage(column, value) for column, value in fields.items()]
+                query = f"UPDATE tasks SET {assignments}, version = ? WHERE plan = ? AND id = ?"
+                params = [*values, revision, plan, int(task_id)]
+                if versions is not None:
+                    query += " AND version = ?"
+                    params.append(int(versions.get(task_id, -1)))
+                if self._conn.execute(query, params).rowcount == 0:
+                    conflicts.append(task_id)
+                else:
+                    written[task_id] = fields
+                    deltas.extend((int(task_id), column, value) for column, value in zip(fields, values))
+            if written:
+                self._record_history(plan, revision, actor, action, len(written), detail or describe_changed(written), deltas)
+        return revision, conflicts
+
+    def load_all_tasks(self, columns=None):
+        columns = columns or TASK_COLUMNS
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, plan, {', '.join(TASK_DB_COLUMNS[column] for column in columns)} FROM tasks ORDER BY id"
+            ).fetchall()
+        return self._frame(rows, ['Plan'] + columns)
+
+    def data_version(self):
+        with self._lock:
+            return tuple(self._conn.execute("SELECT COUNT(*), COALESCE(SUM(revision), 0) FROM plans").fetchone())
+
+    def search(self, text, limit=20):
+        if not self._searchable:
+            raise NotImplementedError("SQLite was built without FTS5")
+        query = fts_query(text)
+        if query is None:
+            return []
+        with self._lock:
+            rows = [row for sql in self.SEARCH_QUERIES for row in self._conn.execute(sql, (query, limit)).fetchall()]
+        rows.sort(key=lambda row: row[5])
+        return [
+            {'kind': kind, 'plan': plan, 'ref': ref, 'title': title, 'snippet': snippet, 'score': round(-score, 3)}
+            for kind, plan, ref, title, snippet, score in rows[:limit]
+        ]
+
+    def index_document(self, plan, kind, title, body):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE plan = ? AND kind = ? AND title = ?", (plan, kind, title))
+            self._conn.execute("INSERT INTO documents (plan, kind, title, body) VALUES (?, ?, ?, ?)", (plan, kind, title, body))
+
+    def load_dependencies(self, plan):
+        with self._lock:
+            edges = self._conn.execute("SELECT predecessor, successor FROM task_dependencies WHERE plan = ?", (plan,)).fetchall()
+            revision = self._conn.execute("SELECT dependency_revision FROM plans WHERE name = ?", (plan,)).fetchone()
+        return edges, revision[0] if revision else 0
+
+    def update_dependencies(self, plan, added=(), removed=(), actor=None):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM task_dependencies WHERE predecessor = ? AND successor = ?", list(removed))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO task_dependencies (plan, predecessor, successor) VALUES (?, ?, ?)",
+                [(plan, predecessor, successor) for predecessor, successor in added]
+            )
+            revision = self._bump(plan)
+            self._conn.execute("UPDATE plans SET dependency_revision = ? WHERE name = ?", (revision, plan))
+            self._record_history(plan, revision, actor, 'dependencies', len(added) + len(removed), describe_dependencies(added, removed))
+        return revision
+
+    def dependency_revision(self, plan):
+        with self._lock:
+            row = self._conn.execute("SELECT dependency_revision FROM plans WHERE name = ?", (plan,)).fetchone()
+        return row[0] if row else 0
+
+    # Append an activity entry and the write's deltas (None for writes that
+    # don't change task fields), or a snapshot in their place, inside the
+    # caller's write transaction
+    def _record_history(self, plan, revision, actor, action, count, detail=None, deltas=None):
+        self._conn.execute("INSERT OR REPLACE INTO plan_history VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (plan, revision, self._timestamp(datetime.now()), actor, action, count, detail))
+        if deltas is None:
+            return
+        latest = self._conn.execute("SELECT tasks FROM plan_snapshots WHERE plan = ? ORDER BY revision DESC LIMIT 1", (plan,)).fetchone()
+        pending = self._conn.execute("SELECT history_changes FROM plans WHERE name = ?", (plan,)).fetchone()
+        if should_snapshot(pending[0] if pending else 0, len(deltas), latest[0] if latest else None):
+            self._snapshot(plan, revision)
+        else:
+            self._conn.executemany("INSERT INTO task_changes VALUES (?, ?, ?, ?, ?)", [(plan, revision, *delta) for delta in deltas])
+            self._conn.execute("UPDATE plans SET history_changes = history_changes + ? WHERE name = ?", (len(deltas), plan))
+
+    def _snapshot(self, plan, revision):
+        selected = ', '.join(TASK_DB_COLUMNS[column] for column in TASK_COLUMNS)
+        rows = self._conn.execute(f"SELECT id, {selected} FROM tasks WHERE plan = ? ORDER BY id", (plan,)).fetchall()
+        self._conn.execute("INSERT OR REPLACE INTO plan_snapshots VALUES (?, ?, ?, ?)", (plan, revision, len(rows), encode_snapshot(rows)))
+        self._conn.execute("UPDATE plans SET history_changes = 0 WHERE name = ?", (plan,))
+
+    def load_history(self, plan, limit=50):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT revision, saved_at, actor, action, tasks, detail FROM plan_history WHERE plan = ? ORDER BY revision DESC LIMIT ?",
+                (plan, limit)
+            ).fetchall()
+        return [
+            {'revision': revision, 'time': datetime.strptime(saved_at, TIMESTAMP_FORMAT), 'actor': actor, 'action': action,
+             'tasks': tasks, 'detail': detail}
+            for revision, saved_at, actor, action, tasks, detail in rows
+        ]
+
+    def load_tasks_at(self, plan, revision):
+        with self._lock:
+            snapshot = self._conn.execute(
+                "SELECT revision, data FROM plan_snapshots WHERE plan = ? AND revision <= ? ORDER BY revision DESC LIMIT 1", (plan, revision)
+            ).fetchone()
+            if snapshot is None:
+                return None
+            deltas = self._conn.execute(
+                "SELECT task_id, field, value FROM task_changes WHERE plan = ? AND revision > ? AND revision <= ? ORDER BY revision, rowid",
+                (plan, snapshot[0], revision)
+            ).fetchall()
+        return self._frame(replay_snapshot(snapshot[1], deltas))
+
+    # A note's revisions since its last snapshot (older ones are deleted when a snapshot is written)
+    def _note_revisions(self, plan, kind):
+        return self._conn.execute(
+            "SELECT revision, snapshot, start, stop, body FROM note_revisions WHERE plan = ? AND kind = ? ORDER BY revision",
+            (plan, kind)
+        ).fetchall()
+
+    def load_note(self, plan, kind):
+        with self._lock:
+            revisions = self._note_revisions(plan, kind)
+        return replay(revision[1:] for revision in revisions), revisions[-1][0] if revisions else 0
+
+    def save_notes(self, notes):
+        saved = {}
+        with self._lock, self._conn:
+            # Take the write lock before reading, so two processes can't append the same revision
+            self._conn.execute("BEGIN IMMEDIATE")
+            for (plan, kind), text in notes.items():
+                revisions = self._note_revisions(plan, kind)
+                old = replay(revision[1:] for revision in revisions)
+                number = revisions[-1][0] if revisions else 0
+                if text != old or not revisions:
+                    number += 1
+                    revision = next_revision(old, text, max(0, len(revisions) - 1))
+                    if revision[0]:
+                        self._conn.execute("DELETE FROM note_revisions WHERE plan = ? AND kind = ?", (plan, kind))
+                    self._conn.execute(
+                        "INSERT INTO note_revisions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (plan, kind, number, *revision, self._timestamp(datetime.now()))
+                    )
+                saved[(plan, kind)] = number
+        return saved
+
+
+# Store selected with TASKFLOW_STORE: "sqlite" (default; TASKFLOW_DB_PATH),
+# "memory", or "module:Class" for another backend, constructed with TASKFLOW_STORE_URL
+def create_task_store():
+    backend = os.environ.get('TASKFLOW_STORE', 'sqlite')
+    if backend == 'memory':
+        return InMemoryTaskStore()
+    if ':' in backend:
+        module_name, class_name = backend.split(':', 1)
+        return getattr(importlib.import_module(module_name), class_name)(os.environ.get('TASKFLOW_STORE_URL'))
+    return SQLiteTaskStore(os.environ.get('TASKFLOW_DB_PATH', 'taskflow.db'),
+                           float(os.environ.get('TASKFLOW_DB_BUSY_TIMEOUT', 30)))
+
+# One store per server process
+@st.cache_resource
+def get_task_store():
+    return create_task_store()
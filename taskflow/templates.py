@@ -0,0 +1,83 @@
+# Plan template registry
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from taskflow.config import TEMPLATE_DIR
+from taskflow.schema import new_tasks_frame
+
+# Plan templates are loaded from JSON (or YAML, when PyYAML is installed)
+# files in TASKFLOW_TEMPLATE_DIR. Each file holds one category:
+#   {"category": "Premium", "templates": {"Name": {"plan_name": ..., "description": ...,
+#    "tasks": [...], "ai_assisted": false, "defaults": {plan metadata overrides}}}}
+DEFAULT_PLAN_META = {
+    'privacy': 'Shared',
+    'shared_with': ['Leadership'],
+    'pinned': False,
+    'group': None
+}
+
+# Template registry: parses the template files once per process and builds
+# each template's task frame on first use. Instantiating a template hands out
+# a copy-on-write clone of that frame, so creating a plan costs the same no
+# matter how many templates are installed.
+class TemplateRegistry:
+    def __init__(self, directory):
+        self.templates = {}  # name -> spec
+        self.categories = {}  # category -> [template names]
+        self._frames = {}
+        self._lock = threading.Lock()
+        for file_name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            path = os.path.join(directory, file_name)
+            if file_name.endswith('.json'):
+                with open(path, encoding='utf-8') as file:
+                    self._register(json.load(file), path)
+            elif file_name.endswith(('.yaml', '.yml')):
+                import yaml  # Optional dependency, only needed for YAML templates
+                with open(path, encoding='utf-8') as file:
+                    self._register(yaml.safe_load(file), path)
+
+    def _register(self, document, path):
+        category = document.get('category', 'Other')
+        for name, spec in document.get('templates', {}).items():
+            tasks = spec.get('tasks')
+            if not isinstance(tasks, list) or not all(isinstance(task, str) for task in tasks):
+                raise ValueError(f"Template {name!r} in {path} needs a list of task titles")
+            self.templates[name] = {
+                'category': category,
+                'plan_name': spec.get('plan_name', f"{name} Plan"),
+                'description': spec.get('description', ''),
+                'tasks': tasks,
+                'ai_assisted': bool(spec.get('ai_assisted', False)),
+                'defaults': spec.get('defaults', {})
+            }
+            self.categories.setdefault(category, []).append(name)
+
+    def get(self, name):
+        return self.templates.get(name)
+
+    # Task frame for a template; callers get a lazy (copy-on-write) clone, or a
+    # full copy when copy-on-write is off
+    def frame(self, name):
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = new_tasks_frame(self.templates[name]['tasks'])
+            return self._frames[name].copy(deep=not pd.get_option('mode.copy_on_write'))
+
+    def instantiate(self, name):
+        spec = self.templates[name]
+        meta = {**DEFAULT_PLAN_META, **spec['defaults']}
+        meta.update({
+            'last_accessed': datetime.now(),
+            'template': name,
+            'ai_assisted': spec['ai_assisted']
+        })
+        return meta, self.frame(name)
+
+@st.cache_resource
+def get_template_registry():
+    return TemplateRegistry(TEMPLATE_DIR)
@@ -0,0 +1,372 @@
+# Bulk import and export of plans as CSV, JSON Lines, JSON or Parquet.
+#
+# Files are flat: one row per task, with the plan's name and metadata
+# repeated on every row, so the same layout works for all formats and for
+# tools that only know spreadsheets:
+#
+#   Plan, Task, Status, Assigned To, Completed, Start Date, End Date,
+#   privacy, shared_with, template, pinned, group
+#
+# A plan without tasks is written as one row with an empty Task. Both
+# directions work in chunks of TRANSFER_CHUNK_ROWS rows: exports page through
+# the store and append to the file, imports read the file chunk by chunk and
+# write each chunk straight to the store, so no session ever holds a whole
+# file or plan. Import headers are matched loosely (case, "_" and common
+# synonyms such as "title" or "assignee"); rows that fail validation are
+# skipped and reported.
+#
+#     python -m taskflow.transfer export plans.parquet --plan "Workplace Strategy"
+#     python -m taskflow.transfer import old-tool.csv --plan "Migrated" --mode rename
+import argparse
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from taskflow.config import DATE_COLUMNS, TASK_COLUMNS, TRANSFER_CHUNK_ROWS
+from taskflow.profiling import profiler
+from taskflow.schema import tasks_frame
+
+PLAN_COLUMN = 'Plan'
+META_COLUMNS = ['privacy', 'shared_with', 'template', 'pinned', 'group']
+FILE_COLUMNS = [PLAN_COLUMN] + TASK_COLUMNS + META_COLUMNS
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'json', '.parquet': 'parquet', '.pq': 'parquet'}
+EXPORT_FORMATS = {'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet'}
+IMPORT_MODES = ['append', 'replace', 'rename']
+MAX_REPORTED_ERRORS = 20
+
+# Accepted spellings of each column, after lower-casing and turning "_"/"-" into spaces
+COLUMN_ALIASES = {
+    PLAN_COLUMN: ['plan', 'plan name', 'project', 'project name'],
+    'Task': ['task', 'title', 'task name', 'name', 'summary'],
+    'Status': ['status', 'state'],
+    'Assigned To': ['assigned to', 'assignee', 'owner', 'assigned'],
+    'Completed': ['completed', 'done', 'complete', 'is completed'],
+    'Start Date': ['start date', 'start', 'begin', 'start on'],
+    'End Date': ['end date', 'end', 'due', 'due date', 'finish', 'finish date'],
+    'privacy': ['privacy', 'visibility'],
+    'shared_with': ['shared with', 'shared'],
+    'template': ['template'],
+    'pinned': ['pinned', 'pin'],
+    'group': ['group', 'team']
+}
+STATUS_ALIASES = {
+    'to do': 'To Do', 'todo': 'To Do', 'open': 'To Do', 'new': 'To Do', 'not started': 'To Do', 'backlog': 'To Do',
+    'in progress': 'In Progress', 'doing': 'In Progress', 'started': 'In Progress', 'active': 'In Progress',
+    'completed': 'Completed', 'complete': 'Completed', 'done': 'Completed', 'closed': 'Completed', 'finished': 'Completed'
+}
+TRUE_VALUES = {'true', 'yes', 'y', '1', 'x', 'done', 'completed'}
+FALSE_VALUES = {'false', 'no', 'n', '0', ''}
+PRIVACY_VALUES = {'shared': 'Shared', 'private': 'Private'}
+DEFAULT_META = {'privacy': 'Shared', 'shared_with': [], 'template': 'Custom', 'pinned': False, 'group': None}
+
+
+def detect_format(file_name):
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type {extension or file_name!r}; use one of {', '.join(sorted(FORMATS))}")
+    return FORMATS[extension]
+
+# Flat file rows for one chunk of a plan's tasks (or the marker row of an empty plan)
+def _file_rows(plan, meta, tasks):
+    if tasks is None:
+        rows = pd.DataFrame({column: [None] for column in TASK_COLUMNS})
+        rows['Completed'] = False
+    else:
+        rows = tasks[TASK_COLUMNS].reset_index(drop=True)
+        for column in ['Status', 'Assigned To']:
+            rows[column] = rows[column].astype(object)
+    rows.insert(0, PLAN_COLUMN, plan)
+    rows['privacy'] = meta.get('privacy')
+    rows['shared_with'] = json.dumps(meta.get('shared_with') or [])
+    rows['template'] = meta.get('template')
+    rows['pinned'] = bool(meta.get('pinned'))
+    rows['group'] = meta.get('group')
+    return rows
+
+# Appends chunks of flat rows to one file
+class _ChunkWriter:
+    def __init__(self, path, file_format):
+        self.path = path
+        self.format = file_format
+        self.rows = 0
+        self._parquet = None
+        if file_format != 'parquet':
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+
+    def write(self, rows):
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(rows, schema=_parquet_schema(), preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            rows = rows.copy()
+            for column in DATE_COLUMNS:
+                rows[column] = rows[column].dt.strftime("%Y-%m-%d") if rows[column].dtype.kind == "M" else rows[column]
+            if self.format == 'csv':
+                rows.to_csv(self._file, header=self.rows == 0, index=False)
+            else:
+                rows['shared_with'] = rows['shared_with'].map(json.loads)
+                if not rows.empty:
+                    self._file.write(rows.to_json(orient='records', lines=True, force_ascii=False))
+        self.rows += len(rows)
+
+    def close(self):
+        if self.format == 'parquet':
+            if self._parquet is None:
+                self.write(_file_rows('', {}, None).iloc[:0])
+            self._parquet.close()
+        else:
+            self._file.close()
+
+def _parquet_schema():
+    import pyarrow as pa
+    return pa.schema([
+        (PLAN_COLUMN, pa.string()), ('Task', pa.string()), ('Status', pa.string()), ('Assigned To', pa.string()),
+        ('Completed', pa.bool_()), ('Start Date', pa.timestamp('ns')), ('End Date', pa.timestamp('ns')),
+        ('privacy', pa.string()), ('shared_with', pa.string()), ('template', pa.string()), ('pinned', pa.bool_()),
+        ('group', pa.string())
+    ])
+
+# Write the given plans (default: all) to path; returns the number of rows written
+@profiler.timed('transfer.export')
+def export_plans(store, path, plans=None, file_format=None, chunk_size=TRANSFER_CHUNK_ROWS):
+    file_format = file_format or detect_format(path)
+    if file_format == 'json':
+        file_format = 'jsonl'
+    all_plans = store.list_plans()
+    writer = _ChunkWriter(path, file_format)
+    try:
+        for plan in plans or sorted(all_plans):
+            meta = all_plans[plan]
+            empty = True
+            for tasks in store.iter_tasks(plan, chunk_size):
+                writer.write(_file_rows(plan, meta, tasks))
+                empty = False
+            if empty:
+                writer.write(_file_rows(plan, meta, None))
+    finally:
+        writer.close()
+    return writer.rows
+
+# Raw chunks of a file (a path or a binary file object) as DataFrames
+def read_chunks(source, file_format, chunk_size=TRANSFER_CHUNK_ROWS):
+    if file_format == 'csv':
+        yield from pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    elif file_format == 'jsonl':
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+    elif file_format == 'json':
+        # A JSON array has to be parsed whole; prefer JSON Lines for large files
+        if hasattr(source, 'read'):
+            records = json.load(source)
+        else:
+            with open(source, encoding='utf-8') as file:
+                records = json.load(file)
+        if isinstance(records, dict):
+            records = records.get('tasks', [records])
+        for start in range(0, len(records), chunk_size):
+            yield pd.DataFrame.from_records(records[start:start + chunk_size])
+    elif file_format == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unknown import format: {file_format}")
+
+# {file column -> schema column} for the columns that could be matched
+def map_columns(columns):
+    lookup = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for name in columns:
+        column = lookup.get(str(name).strip().lower().replace('_', ' ').replace('-', ' '))
+        if column is not None and column not in mapping.values():
+            mapping[name] = column
+    return mapping
+
+def _missing(value):
+    return value is None or (not isinstance(value, (str, list, tuple)) and pd.isna(value))
+
+# Stripped text, None where blank
+def _text(values):
+    text = values.astype('string').str.strip()
+    return text.astype(object).where(text.notna() & (text != ''), None)
+
+def _blank(values):
+    return _text(values).isna()
+
+# True/False for yes/no style values (blank is False), None where unrecognized
+def _flags(values):
+    flags = {**dict.fromkeys(TRUE_VALUES, True), **dict.fromkeys(FALSE_VALUES, False)}
+    text = values.astype('string').str.strip().str.lower().fillna('')
+    return text.map(flags).astype(object).where(text.isin(flags.keys()), None)
+
+def _people(value):
+    if isinstance(value, (list, tuple)):
+        return [str(person) for person in value]
+    if _missing(value) or not str(value).strip():
+        return []
+    value = str(value).strip()
+    if value.startswith('['):
+        try:
+            return [str(person) for person in json.loads(value)]
+        except ValueError:
+            pass
+    return [person.strip() for person in value.split(',') if person.strip()]
+
+# Validate one raw chunk. Returns (rows in FILE_COLUMNS with typed task columns,
+# [(row number, message)]); rows are numbered from first_row.
+def validate_chunk(chunk, mapping, default_plan, first_row=1):
+    chunk = chunk.rename(columns=mapping).reindex(columns=list(mapping.values())).reset_index(drop=True)
+    rows = pd.DataFrame(index=chunk.index)
+    errors = pd.Series(None, index=chunk.index, dtype=object)
+
+    def fail(mask, message):
+        errors[mask & errors.isna()] = message
+
+    def column(name):
+        return chunk[name] if name in chunk.columns else pd.Series(None, index=chunk.index, dtype=object)
+
+    plans = _text(column(PLAN_COLUMN))
+    rows[PLAN_COLUMN] = plans.fillna(default_plan) if default_plan else plans
+    fail(rows[PLAN_COLUMN].isna(), "no plan name")
+    rows['Task'] = _text(column('Task'))
+
+    statuses = _text(column('Status'))
+    rows['Status'] = statuses.map(lambda value: value if value is None else STATUS_ALIASES.get(value.lower()))
+    fail(statuses.notna() & rows['Status'].isna(), "unknown status")
+    completed = _flags(column('Completed'))
+    fail(completed.isna(), "Completed is not a yes/no value")
+    completed = completed.map(bool)
+    if 'Completed' in chunk.columns:
+        rows['Status'] = rows['Status'].where(rows['Status'].notna() | ~completed, 'Completed')
+    else:
+        completed = rows['Status'] == 'Completed'
+    rows['Status'] = rows['Status'].fillna('To Do')
+    rows['Completed'] = completed
+    rows['Assigned To'] = _text(column('Assigned To')).fillna('Unassigned')
+
+    for name in DATE_COLUMNS:
+        values = column(name)
+        dates = pd.to_datetime(values.where(~_blank(values), None), errors='coerce', format='mixed')
+        fail(dates.isna() & ~_blank(values), f"{name} is not a date")
+        rows[name] = dates.dt.normalize()
+    fail(rows['End Date'] < rows['Start Date'], "End Date is before Start Date")
+
+    privacy = _text(column('privacy'))
+    rows['privacy'] = privacy.map(lambda value: value if value is None else PRIVACY_VALUES.get(value.lower()))
+    fail(privacy.notna() & rows['privacy'].isna(), "privacy must be Shared or Private")
+    rows['shared_with'] = column('shared_with').map(_people)
+    rows['template'] = _text(column('template'))
+    rows['pinned'] = _flags(column('pinned'))
+    fail(rows['pinned'].isna(), "pinned is not a yes/no value")
+    rows['group'] = _text(column('group'))
+
+    valid = errors.isna()
+    reported = [(first_row + int(index), message) for index, message in errors[~valid].items()]
+    return rows[valid], reported
+
+def _unique_name(store, name, taken):
+    candidate, suffix = name, 2
+    while candidate in taken or store.plan_exists(candidate):
+        candidate = f"{name} ({suffix})"
+        suffix += 1
+    return candidate
+
+# Plan metadata from the first file row seen for a plan
+def _plan_meta(row):
+    meta = dict(DEFAULT_META)
+    for field in META_COLUMNS:
+        value = row[field]
+        if field == 'shared_with':
+            if value:
+                meta[field] = value
+        elif value is not None and not pd.isna(value):
+            meta[field] = bool(value) if field == 'pinned' else value
+    meta.update({'last_accessed': datetime.now(), 'ai_assisted': False})
+    return meta
+
+# Import a file (a path or a binary file object) into the store chunk by chunk.
+# Rows without a Plan column value go to default_plan. mode decides what
+# happens to a plan that already exists: "append" adds the tasks to it,
+# "replace" re-creates it with only the imported tasks, "rename" imports into
+# a new plan named "Name (2)". Returns a report dict.
+@profiler.timed('transfer.import')
+def import_plans(store, source, file_format, default_plan=None, mode='append', chunk_size=TRANSFER_CHUNK_ROWS, members=None):
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode}")
+    report = {'plans': {}, 'imported': 0, 'rejected': 0, 'skipped': 0, 'errors': []}
+    targets = {}  # plan name in the file -> plan name in the store
+    mapping = None
+    next_row = 1
+    for chunk in read_chunks(source, file_format, chunk_size):
+        if mapping is None:
+            mapping = map_columns(chunk.columns)
+            if 'Task' not in mapping.values():
+                raise ValueError(f"No task column found; expected one of: {', '.join(COLUMN_ALIASES['Task'])}")
+            if PLAN_COLUMN not in mapping.values() and not default_plan:
+                raise ValueError("The file has no Plan column, so a plan name is required")
+        rows, errors = validate_chunk(chunk, mapping, default_plan, next_row)
+        next_row += len(chunk)
+        report['rejected'] += len(errors)
+        report['errors'].extend(errors[:MAX_REPORTED_ERRORS - len(report['errors'])])
+
+        for plan, plan_rows in rows.groupby(PLAN_COLUMN, sort=False):
+            if plan not in targets:
+                exists = store.plan_exists(plan)
+                target = _unique_name(store, plan, set(targets.values())) if exists and mode == 'rename' else plan
+                if not exists or mode != 'append':
+                    store.save_plan(target, _plan_meta(plan_rows.iloc[0]))
+                targets[plan] = target
+                report['plans'][target] = 0
+            tasks = plan_rows[plan_rows['Task'].notna()]
+            report['skipped'] += len(plan_rows) - len(tasks)
+            if not tasks.empty:
+                store.add_tasks(targets[plan], tasks_frame(tasks[TASK_COLUMNS], members=members), action='import')
+                report['plans'][targets[plan]] += len(tasks)
+                report['imported'] += len(tasks)
+    return report
+
+# One-line summary of an import report
+def describe_report(report):
+    summary = f"Imported {report['imported']:,} tasks into {len(report['plans'])} plan(s)"
+    if report['skipped']:
+        summary += f"; {report['skipped']:,} rows without a task title were skipped"
+    if report['rejected']:
+        summary += f"; {report['rejected']:,} rows were rejected"
+    return summary + "."
+
+
+def main(argv=None):
+    from taskflow.storage import create_task_store
+
+    parser = argparse.ArgumentParser(description="Import or export TaskFlow plans")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="write plans to a .csv, .jsonl or .parquet file")
+    export_parser.add_argument('path')
+    export_parser.add_argument('--plan', action='append', help="plan to export (repeatable; default: all plans)")
+    import_parser = commands.add_parser('import', help="read plans from a .csv, .jsonl, .json or .parquet file")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--plan', help="plan for rows without a Plan column")
+    import_parser.add_argument('--mode', choices=IMPORT_MODES, default='append', help="what to do with plans that already exist")
+    parser.add_argument('--chunk-size', type=int, default=TRANSFER_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    store = create_task_store()
+    if args.command == 'export':
+        rows = export_plans(store, args.path, args.plan, chunk_size=args.chunk_size)
+        print(f"Wrote {rows:,} rows to {args.path}")
+        return 0
+    report = import_plans(store, args.path, detect_format(args.path), args.plan, args.mode, args.chunk_size)
+    print(describe_report(report))
+    for plan, count in report['plans'].items():
+        print(f"  {plan}: {count:,} tasks")
+    for row, message in report['errors']:
+        print(f"  row {row}: {message}")
+    return 0 if not report['rejected'] else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
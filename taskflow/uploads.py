@@ -0,0 +1,110 @@
+# Per-session upload spool and background text extraction
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import streamlit as st
+
+from taskflow.caching import LRUCache
+from taskflow.config import EXTRACTION_PROCESSES, MAX_FILE_CHARS
+from taskflow.extraction import extract_text
+from taskflow.profiling import profiler
+
+# Extraction resources: a process pool for parsing large PDFs and a thread
+# pool that drives extractions without blocking the script run
+@st.cache_resource
+def get_extraction_pool():
+    return ProcessPoolExecutor(max_workers=EXTRACTION_PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+
+@st.cache_resource
+def get_extraction_executor():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="taskflow-extract")
+
+@st.cache_resource
+def get_extraction_cache():
+    return LRUCache(maxsize=int(os.environ.get('TASKFLOW_EXTRACTION_CACHE_SIZE', 64)))
+
+@profiler.timed('extraction.file')
+def run_extraction_job(cache, cache_key, name, path, process_pool):
+    text = extract_text(name, path, MAX_FILE_CHARS, process_pool)
+    cache.put(cache_key, text)
+    return text
+
+# Function to extract text from a spooled upload in the background, keyed by
+# the file's content hash so the same upload is only extracted once
+def start_file_extraction(name, path, file_digest):
+    cache = get_extraction_cache()
+    cache_key = (file_digest, name.rsplit('.', 1)[-1].lower(), MAX_FILE_CHARS)
+    cached_text = cache.get(cache_key)
+    if cached_text is not None:
+        future = Future()
+        future.set_result(cached_text)
+        return future
+    return get_extraction_executor().submit(profiler.bind(run_extraction_job), cache, cache_key, name, path, get_extraction_pool())
+
+def _remove_directories(*directories):
+    for directory in directories:
+        shutil.rmtree(directory, ignore_errors=True)
+
+# Per-session upload store. Uploaded files are copied to a private temporary
+# directory in blocks (hashing as they go) and extracted from disk, so only
+# file names, digests and extraction futures stay in session memory. Files are
+# keyed by name and digest: uploading the same file again keeps the copy
+# already spooled, while a changed file with the same name replaces the old
+# one. The directory is emptied on clear. Prepared exports go to a second
+# directory that clearing the uploads leaves alone; both are removed when the
+# session's spool is garbage collected or the server exits.
+class UploadSpool:
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, root=None):
+        self.directory = tempfile.mkdtemp(prefix="taskflow-uploads-", dir=root)
+        self.export_directory = tempfile.mkdtemp(prefix="taskflow-exports-", dir=root)
+        self.files = {}  # (name, digest) -> {'name', 'path', 'digest', 'size', 'extraction'}
+        self._spooled = 0
+        self._finalizer = weakref.finalize(self, _remove_directories, self.directory, self.export_directory)
+
+    @profiler.timed('upload.spool')
+    def add(self, uploaded_file):
+        path = os.path.join(self.directory, f"{self._spooled}-{os.path.basename(uploaded_file.name)}")
+        self._spooled += 1
+        digest = hashlib.sha256()
+        uploaded_file.seek(0)
+        with open(path, 'wb') as spooled:
+            while block := uploaded_file.read(self.BLOCK_SIZE):
+                digest.update(block)
+                spooled.write(block)
+        key = (uploaded_file.name, digest.hexdigest())
+        if key in self.files:
+            os.remove(path)
+            return self.files[key]
+        for old_key in [old_key for old_key in self.files if old_key[0] == uploaded_file.name]:
+            self._remove(old_key)
+        entry = {'name': uploaded_file.name, 'path': path, 'digest': key[1], 'size': os.path.getsize(path)}
+        entry['extraction'] = start_file_extraction(uploaded_file.name, path, entry['digest'])
+        self.files[key] = entry
+        return entry
+
+    def _remove(self, key):
+        entry = self.files.pop(key)
+        entry['extraction'].cancel()
+        if os.path.exists(entry['path']):
+            os.remove(entry['path'])
+
+    # Combined digest of every spooled file, for the generation cache key
+    def digest(self):
+        return hashlib.sha256("".join(entry['digest'] for entry in self.files.values()).encode('utf-8')).hexdigest() if self.files else ""
+
+    def extractions(self):
+        return {entry['name']: entry['extraction'] for entry in self.files.values()}
+
+    def clear(self):
+        for entry in self.files.values():
+            entry['extraction'].cancel()
+        self.files = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
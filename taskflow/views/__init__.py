@@ -0,0 +1 @@
+# One module per tab of the app; each exposes render(plan, plan_data, task_model)
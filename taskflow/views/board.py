@@ -0,0 +1,39 @@
+# Board tab: Kanban-style columns with batched moves
+import pandas as pd
+import streamlit as st
+
+from taskflow.config import BOARD_PAGE_SIZE, TASK_STATUSES
+from taskflow.plans import apply_board_moves
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"Board View for {plan}")
+    if len(task_model):
+        statuses = TASK_STATUSES
+        status_index = task_model.status_index()
+        board_tasks = task_model.snapshot()
+
+        # Per-column pagination
+        cols = st.columns(len(statuses))
+        column_pages = {}
+        for i, status in enumerate(statuses):
+            with cols[i]:
+                st.write(f"**{status}** ({len(status_index.get(status, []))})")
+                page_count = max(1, -(-len(status_index.get(status, [])) // BOARD_PAGE_SIZE))
+                page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, key=f"board_page_{status}") if page_count > 1 else 1
+                page_start = (min(page_number, page_count) - 1) * BOARD_PAGE_SIZE
+                column_pages[status] = status_index.get(status, pd.Index([]))[page_start:page_start + BOARD_PAGE_SIZE]
+
+        # Cards with a "Move to" choice each; all moves are applied in one submission
+        with st.form("board_moves"):
+            cols = st.columns(len(statuses))
+            shown_tasks = {}
+            for i, status in enumerate(statuses):
+                with cols[i]:
+                    for index in column_pages[status]:
+                        row = board_tasks.loc[index]
+                        st.write(f"- {row['Task']} (Assigned to: {row['Assigned To']})")
+                        st.selectbox("Move to", statuses, index=statuses.index(status), key=f"move_{index}")
+                        shown_tasks[index] = status
+            st.form_submit_button("Apply Moves", on_click=apply_board_moves, args=(plan, shown_tasks))
+    else:
+        st.write("No tasks to display in the board view.")
@@ -0,0 +1,23 @@
+# Charts tab: progress bar, status pie and tasks per assignee
+import streamlit as st
+
+from taskflow.figures import assignee_bar_figure, status_pie_figure
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"Progress Charts for {plan}")
+    total_tasks = task_model.count()
+    if total_tasks:
+        # Simple Progress Bar
+        completed_tasks = int(task_model.count('Completed').get(True, 0))
+        st.progress(completed_tasks / total_tasks)
+        st.write(f"Progress: {completed_tasks}/{total_tasks} tasks completed")
+
+        # Pie Chart for Task Status
+        fig = status_pie_figure(task_model.count_items('Status'))
+        st.plotly_chart(fig)
+
+        # Bar Chart for Tasks per Assignee
+        fig2 = assignee_bar_figure(task_model.count_items('Assigned To'))
+        st.plotly_chart(fig2)
+    else:
+        st.write("No tasks to display in the charts view.")
@@ -0,0 +1,77 @@
+# Diagnostics tab: rerun timings, memory use and cache hit rates
+import sys
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+from taskflow.ai import get_ai_cache
+from taskflow.profiling import current_session_id, profiler
+from taskflow.state import get_shared_plans
+from taskflow.uploads import get_extraction_cache
+
+# Rough in-memory size of a value in bytes, following containers and object attributes
+def approx_size(value, _seen=None):
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(key, _seen) + approx_size(item, _seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        size += sum(approx_size(item, _seen) for item in value)
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        size += approx_size(vars(value), _seen)
+    return size
+
+def render(plan, plan_data, task_model):
+    shared_plans = get_shared_plans()
+    st.subheader("Diagnostics")
+    session_spans = profiler.spans(session=current_session_id())
+    completed_runs = [record['run'] for record in session_spans if record['name'] == 'rerun']
+    if completed_runs:
+        spans_df = pd.DataFrame(session_spans)
+        st.write("**Last rerun**")
+        last_run = spans_df[spans_df['run'] == completed_runs[-1]].sort_values('start')
+        st.dataframe(last_run[['name', 'depth', 'parent', 'duration_ms', 'thread']], hide_index=True)
+        st.write(f"**Latency per section** (last {len(completed_runs)} reruns of this session, ms)")
+        latency = spans_df.groupby('name')['duration_ms'].describe(percentiles=[0.5, 0.95])
+        st.dataframe(latency[['count', 'mean', '50%', '95%', 'max']].sort_values('mean', ascending=False))
+    else:
+        st.write("No completed reruns recorded yet." if profiler.enabled else "Profiling is off (TASKFLOW_PROFILE=0).")
+
+    st.write("**Memory per plan** (shared task models)")
+    plan_memory = shared_plans.memory_usage()
+    st.dataframe(pd.DataFrame(
+        [(plan, rows, size / 1024) for plan, (rows, size) in plan_memory.items()],
+        columns=['Plan', 'Tasks', 'KB']
+    ), hide_index=True)
+    st.write("**Session state**")
+    st.dataframe(pd.DataFrame(
+        [(str(key), approx_size(value) / 1024) for key, value in st.session_state.items()],
+        columns=['Key', 'KB']
+    ).sort_values('KB', ascending=False), hide_index=True)
+
+    st.write("**Cache hit rates**")
+    cache_stats = [
+        ('Plan models', shared_plans.hits, shared_plans.misses),
+        ('AI results', get_ai_cache().hits, get_ai_cache().misses),
+        ('File extraction', get_extraction_cache().hits, get_extraction_cache().misses)
+    ]
+    st.dataframe(pd.DataFrame(
+        [(name, hits, misses, hits / (hits + misses) if hits + misses else None) for name, hits, misses in cache_stats],
+        columns=['Cache', 'Hits', 'Misses', 'Hit rate']
+    ), hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Export session spans (JSON lines)", profiler.to_jsonl(session_spans),
+                           file_name="taskflow-spans.jsonl", mime="application/x-ndjson")
+    with col2:
+        st.download_button("Export all spans (JSON lines)", profiler.to_jsonl(profiler.spans()),
+                           file_name="taskflow-spans-all.jsonl", mime="application/x-ndjson")
@@ -0,0 +1,13 @@
+# Goals tab: the plan's goals, autosaved to the task store
+import streamlit as st
+
+from taskflow.plans import autosave_note, save_note
+from taskflow.views.notes import render_note
+
+# A plan without saved goals starts from the goal entered in the Grid tab
+def render(plan, plan_data, task_model):
+    st.subheader(f"Goals for {plan}")
+    widget_key = render_note(plan, 'goals', "Describe your project goals:", on_change=autosave_note,
+                             default=st.session_state.get('plan_goal') or "")
+    st.button("Save Goals", on_click=save_note, args=(plan, 'goals', widget_key))
+    st.write("In a real application, this could include goal progress tracking, milestones, or KPIs.")
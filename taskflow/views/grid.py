@@ -0,0 +1,185 @@
+# Grid tab: goal input, AI task generation, the paginated task editor and custom tasks
+import time
+
+import streamlit as st
+
+from taskflow.ai import cancel_task_generation, start_task_generation
+from taskflow.config import AI_POLL_SECONDS, GRID_PAGE_SIZE, GRID_PAGE_SIZES, TASK_COLUMNS, TASK_STATUSES
+from taskflow.fragments import fragment, fragment_rerun, request_app_rerun, rerun_app, rerun_fragment
+from taskflow.plans import add_custom_task, add_generated_tasks, apply_grid_edits
+from taskflow.profiling import profiler
+from taskflow.storage import get_task_store
+from taskflow.templates import get_template_registry
+
+# A running generation job, polled every AI_POLL_SECONDS by rerunning only
+# this fragment. Once the job is done its tasks and messages are kept in the
+# session and the app reruns to show them (a full run draws them right after).
+@fragment(run_every=AI_POLL_SECONDS)
+def render_generation_progress(fallback_tasks):
+    ai_job = st.session_state.ai_job
+    if ai_job is None:
+        return
+    if not ai_job['future'].done():
+        st.info(f"Generating tasks... ({time.monotonic() - ai_job['started']:.0f}s)")
+        st.button("Cancel generation", on_click=cancel_generation)
+        return
+    st.session_state.ai_job = None
+    messages = []
+    try:
+        st.session_state.generated_tasks = ai_job['future'].result()
+    except Exception as e:
+        messages.append(('error', f"Error generating tasks with Google AI Studio API: {e}"))
+        st.session_state.generated_tasks = []
+    if not st.session_state.generated_tasks:
+        messages.append(('warning', "No tasks generated. Using fallback tasks."))
+        st.session_state.generated_tasks = list(fallback_tasks)
+    st.session_state.generation_messages = messages
+    if fragment_rerun():
+        rerun_app()
+
+# Cancelling re-enables the Generate button, outside the progress fragment
+def cancel_generation():
+    cancel_task_generation()
+    request_app_rerun()
+
+# The goal text is kept in st.session_state.plan_goal for the Goals tab.
+def render(plan, plan_data, task_model):
+    templates = get_template_registry()
+    st.subheader(f"Tasks for {plan}")
+
+    # Goal and Content Input
+    st.write("Share Your Goal and Relevant Content")
+    st.write("Describe the goal of your plan and Project Manager will generate tasks for you.")
+    goal = st.text_area("Enter your project goal", f"Conduct a {plan_data['template'].lower()} on largest custom interior design firms" if plan_data['template'] != 'Custom' else "Define your project goal")
+    st.session_state.plan_goal = goal
+    content = st.text_input("Add relevant content or notes", "Focus on market positioning and customer base")
+
+    # File Upload
+    st.write("Add files for better results")
+    upload_spool = st.session_state.upload_spool
+    uploaded_files = st.file_uploader("Upload files", type=["txt", "pdf", "docx"], accept_multiple_files=True,
+                                      key=f"file_uploader_{st.session_state.uploader_version}")
+    if uploaded_files:
+        # Spool the files to disk and start extracting them (a changed file
+        # replaces the one uploaded under its name), then reset the uploader
+        # so Streamlit releases its in-memory copies
+        for uploaded_file in uploaded_files:
+            upload_spool.add(uploaded_file)
+        st.session_state.uploader_version += 1
+        rerun_fragment()
+
+    # Display Uploaded Files
+    if upload_spool.files:
+        st.write("**Uploaded Files:**")
+        for entry in upload_spool.files.values():
+            file_name, extraction = entry['name'], entry['extraction']
+            if not extraction.done():
+                state = "extracting..."
+            elif extraction.exception() is not None:
+                state = "extraction failed"
+                st.error(f"Error reading file {file_name}: {extraction.exception()}")
+            else:
+                state = f"{len(extraction.result()):,} characters"
+                # Make the file's text findable from the sidebar search, once
+                if not entry.get('indexed'):
+                    get_task_store().index_document(plan, 'file', file_name, extraction.result())
+                    entry['indexed'] = True
+            st.write(f"- {file_name} ({entry['size'] / 1024:,.0f} KB, {state})")
+        st.button("Clear Uploaded Files", on_click=upload_spool.clear)
+
+    # Generate Tasks with Google AI Studio API
+    fallback_tasks = (templates.get(plan_data['template']) or {'tasks': ['Default Task']})['tasks']
+    if plan_data.get('ai_assisted', False) and st.button("Generate Tasks from Goal", disabled=st.session_state.ai_job is not None):
+        if goal and st.session_state.ai_job is None:
+            # Extracted content from uploaded files (futures, resolved by the generation job)
+            file_data = upload_spool.extractions() or ""
+
+            # Generate tasks in the background; cached results come back immediately
+            cached_tasks = start_task_generation(goal, content, file_data, upload_spool.digest())
+            if cached_tasks is not None:
+                st.session_state.generated_tasks = cached_tasks
+            else:
+                # Redraw with the Generate button disabled and the job's progress
+                rerun_app()
+
+    # Show progress of a running generation job, or collect its result
+    if st.session_state.ai_job is not None:
+        render_generation_progress(fallback_tasks)
+    for level, text in st.session_state.pop('generation_messages', []):
+        getattr(st, level)(text)
+
+    # Display Generated Tasks with Checkboxes
+    if st.session_state.generated_tasks:
+        st.write("**Based on the goal and provided content, I've created a custom set of tasks.**")
+        st.write("**Team tasks**")
+        st.write("**Task Title**")
+        for task in st.session_state.generated_tasks:
+            st.checkbox(task, key=f"generated_{task}")
+
+        # Assign All to Project Manager
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.button("Assign all to Project Manager", on_click=add_generated_tasks, args=(plan, 'Project Manager'))
+        with col2:
+            st.button("Add Selected Tasks", on_click=add_generated_tasks, args=(plan,), kwargs={'selected_only': True})
+        if st.session_state.get('generated_warning'):
+            st.warning(st.session_state.pop('generated_warning'))
+        st.info("AI-generated content may be incorrect")
+
+    # Display and Manage Existing Tasks as one paginated, editable table
+    if len(task_model):
+        st.subheader("Existing Tasks")
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            search = st.text_input("Search tasks", key="grid_search")
+        with col2:
+            status_filter = st.selectbox("Status", ['All'] + TASK_STATUSES, key="grid_status")
+        with col3:
+            assignee_filter = st.selectbox("Assigned To", ['All'] + st.session_state.team_members, key="grid_assignee")
+        col4, col5, col6, col7 = st.columns(4)
+        with col4:
+            sort_by = st.selectbox("Sort by", ['None'] + TASK_COLUMNS, key="grid_sort_by")
+        with col5:
+            ascending = st.toggle("Ascending", value=True, key="grid_ascending")
+        with col6:
+            page_size = st.selectbox("Rows per page", GRID_PAGE_SIZES, index=GRID_PAGE_SIZES.index(GRID_PAGE_SIZE), key="grid_page_size")
+
+        with profiler.span('grid.query'):
+            matching_tasks = task_model.query(
+                sort_by=None if sort_by == 'None' else sort_by,
+                ascending=ascending,
+                status=None if status_filter == 'All' else status_filter,
+                assignee=None if assignee_filter == 'All' else assignee_filter,
+                search=search
+            )
+        total_rows = len(matching_tasks)
+        page_count = max(1, -(-total_rows // page_size))
+        with col7:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="grid_page")
+        page_start = (min(page_number, page_count) - 1) * page_size
+        page_tasks = matching_tasks.iloc[page_start:page_start + page_size]
+
+        editor_key = f"grid_editor_{st.session_state.get('grid_editor_version', 0)}"
+        with profiler.span('grid.editor'):
+            st.data_editor(
+                page_tasks,
+                key=editor_key,
+                num_rows="fixed",
+                column_config={
+                    'Task': st.column_config.TextColumn("Task", required=True),
+                    'Status': st.column_config.SelectboxColumn("Status", options=TASK_STATUSES, required=True),
+                    'Assigned To': st.column_config.SelectboxColumn("Assigned To", options=st.session_state.team_members, required=True),
+                    'Completed': st.column_config.CheckboxColumn("Completed"),
+                    'Start Date': st.column_config.DateColumn("Start Date"),
+                    'End Date': st.column_config.DateColumn("End Date")
+                },
+                on_change=apply_grid_edits,
+                args=(plan, editor_key, list(page_tasks.index))
+            )
+        st.caption(f"Showing {len(page_tasks)} of {total_rows} tasks")
+
+    # Add Custom Task
+    with st.form("add_custom_task"):
+        st.text_input("Add a custom task", key="custom_task")
+        st.selectbox("Assign to", st.session_state.team_members, index=0, key="custom_assigned_to")
+        st.form_submit_button("Add Custom Task", on_click=add_custom_task, args=(plan,))
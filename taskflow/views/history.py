@@ -0,0 +1,65 @@
+# History tab: who changed what in the plan, and the plan as of any recorded revision
+import pandas as pd
+import streamlit as st
+
+from taskflow.config import HISTORY_FEED_SIZE, TIMESTAMP_FORMAT
+from taskflow.history import HISTORY_ACTIONS, diff_tasks
+from taskflow.plans import restore_plan_version
+from taskflow.storage import get_task_store
+
+MAX_CHANGES_SHOWN = 500
+
+
+# Before/After cell text: dates without a time, blank when unset
+def format_value(value):
+    if pd.isna(value):
+        return ''
+    return value.strftime('%Y-%m-%d') if isinstance(value, pd.Timestamp) else str(value)
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"History of {plan}")
+    store = get_task_store()
+    try:
+        entries = store.load_history(plan, limit=HISTORY_FEED_SIZE)
+    except NotImplementedError:
+        st.write("History is unavailable with this task store.")
+        return
+    if not entries:
+        st.write("No changes recorded yet.")
+        return
+
+    # Activity feed
+    feed = pd.DataFrame(entries)
+    st.dataframe(pd.DataFrame({
+        'Revision': feed['revision'],
+        'When': feed['time'].dt.strftime(TIMESTAMP_FORMAT),
+        'Who': feed['actor'].fillna('-'),
+        'What': feed['action'].map(HISTORY_ACTIONS).fillna(feed['action']),
+        'Tasks': feed['tasks'],
+        'Details': feed['detail'].fillna('')
+    }), hide_index=True, use_container_width=True)
+
+    # The plan as of a revision, what that revision changed, and restoring it;
+    # replayed from the history only while switched on
+    if not st.toggle("View the plan as of a revision", key="show_history_version"):
+        return
+    revisions = {f"Revision {entry['revision']} ({entry['time'].strftime(TIMESTAMP_FORMAT)})": entry['revision'] for entry in entries}
+    revision = revisions[st.selectbox("Revision", list(revisions), key=f"history_revision_{plan}")]
+    tasks = store.load_tasks_at(plan, revision)
+    if tasks is None:
+        st.write(f"The recorded history of {plan} starts after revision {revision}.")
+        return
+    st.dataframe(tasks, use_container_width=True)
+    before = store.load_tasks_at(plan, revision - 1)
+    if before is not None:
+        changes = diff_tasks(before, tasks)
+        st.write(f"**Changes in revision {revision}:** {len(changes):,}")
+        if not changes.empty:
+            shown = changes.head(MAX_CHANGES_SHOWN)
+            st.dataframe(shown.assign(Before=shown['Before'].map(format_value), After=shown['After'].map(format_value)),
+                         hide_index=True, use_container_width=True)
+    st.button("Restore this version", on_click=restore_plan_version, args=(plan, revision),
+              help="Edits the tasks back to these values; tasks added since are kept")
+    if st.session_state.get('history_message'):
+        level, text = st.session_state.pop('history_message')
+        getattr(st, level)(text)
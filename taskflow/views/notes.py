@@ -0,0 +1,19 @@
+# Text area for a plan note (see taskflow/notes.py), shared by the Whiteboard and Goals tabs
+import streamlit as st
+
+from taskflow.state import get_note_writer
+
+# Draws the note's text area and its save state; returns the widget key.
+# The widget is seeded from the store once per session and plan, after
+# which it holds the user's text; edits go to on_change(plan, kind, widget key).
+def render_note(plan, kind, label, on_change, default=''):
+    widget_key = f"note_{kind}_{plan}"
+    text, revision, unsaved = get_note_writer().load(plan, kind)
+    if widget_key not in st.session_state:
+        st.session_state[widget_key] = text if revision or unsaved else default
+    st.text_area(label, key=widget_key, on_change=on_change, args=(plan, kind, widget_key))
+    if unsaved:
+        st.caption("Saving...")
+    elif revision:
+        st.caption(f"Saved (revision {revision})")
+    return widget_key
@@ -0,0 +1,43 @@
+# People tab: team members and their task counts, in this plan and across all plans
+import time
+
+import streamlit as st
+
+from taskflow.config import WORKLOAD_CAPACITY
+from taskflow.storage import get_task_store
+from taskflow.workload import get_workload
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"People in {plan}")
+    st.write("**Team Members:**")
+    member_counts = task_model.count('Assigned To')
+    for member in st.session_state.team_members:
+        if member != 'Unassigned':
+            st.write(f"- {member}")
+            tasks_assigned = int(member_counts.get(member, 0))
+            if tasks_assigned:
+                st.write(f"  Tasks Assigned: {tasks_assigned}")
+            else:
+                st.write("  No tasks assigned.")
+    st.write("**Shared with:**")
+    for shared in plan_data['shared_with']:
+        st.write(f"- {shared}")
+
+    # Workload across every plan, built only while switched on and cached
+    # until a task of any plan changes
+    st.divider()
+    if st.toggle("Workload across all plans", key="show_workload"):
+        capacity = st.number_input("Open tasks at once before a member is over-allocated", min_value=1,
+                                   value=WORKLOAD_CAPACITY, key="workload_capacity")
+        start = time.perf_counter()
+        summary, periods = get_workload(get_task_store().data_version(), int(capacity))
+        st.dataframe(summary, use_container_width=True)
+        st.caption(f"{int(summary['Tasks'].sum()):,} tasks in {(time.perf_counter() - start) * 1000:.0f} ms")
+        overallocated = list(summary.index[summary['Over-allocated days'] > 0])
+        if overallocated:
+            member = st.selectbox("Over-allocated periods for", overallocated, key="workload_member")
+            member_periods = periods[periods['Member'] == member].drop(columns='Member')
+            st.dataframe(member_periods.assign(From=member_periods['From'].dt.date, To=member_periods['To'].dt.date),
+                         hide_index=True, use_container_width=True)
+        else:
+            st.write("No one is over-allocated.")
@@ -0,0 +1,108 @@
+# Sidebar: search, plan filters, plan creation from templates and plan details
+import os
+import time
+
+import streamlit as st
+
+from taskflow.config import SEARCH_RESULTS, TEMPLATE_DIR, TIMESTAMP_FORMAT
+from taskflow.fragments import fragment
+from taskflow.plans import create_plan_from_template, discard_export, import_plan_file, open_search_hit, prepare_export, select_plan
+from taskflow.profiling import profiler
+from taskflow.storage import get_task_store
+from taskflow.templates import get_template_registry
+from taskflow.transfer import EXPORT_FORMATS, FORMATS, IMPORT_MODES
+
+# Plan Management Sidebar with Filtering Tabs. Drawn inside `with st.sidebar`
+# as a fragment: searching and browsing plans don't rerun the tabs.
+@fragment
+def render():
+    templates = get_template_registry()
+    st.header("My Plans")
+    st.text_input("Your name", key="user_name", placeholder="Shown in plan history")
+    render_search()
+
+    # Filtering Tabs
+    filter_tabs = ["Recent", "Shared", "Personal", "Pinned", "My Teams"]
+    selected_filter = st.tabs(filter_tabs)
+
+    # Display each tab's plans (read from the plan index) in its own selectbox;
+    # choosing a plan in any tab makes it the current plan
+    with profiler.span('sidebar.filters'):
+        for filter_name, filter_tab in zip(filter_tabs, selected_filter):
+            with filter_tab:
+                filtered_plans = st.session_state.plan_index.filter(filter_name)
+                if filtered_plans:
+                    widget_key = f"select_plan_{filter_name}"
+                    st.selectbox("Select Plan", filtered_plans,
+                                 index=filtered_plans.index(st.session_state.current_plan) if st.session_state.current_plan in filtered_plans else None,
+                                 key=widget_key, on_change=select_plan, args=(widget_key,))
+                else:
+                    st.write("No plans match this filter.")
+
+    if st.session_state.current_plan not in st.session_state.plans:
+        st.session_state.current_plan = None
+
+    # Create New Plan with Templates
+    with st.expander("Create New Plan"):
+        template_labels = {f"{category}: {name}": name for category, names in templates.categories.items() for name in names}
+        if template_labels:
+            selected_template = template_labels[st.selectbox("Template", list(template_labels), key="new_plan_template")]
+            st.caption(templates.get(selected_template)['description'])
+            new_plan_name = st.text_input("Plan name", value=templates.get(selected_template)['plan_name'], key=f"new_plan_name_{selected_template}")
+            st.button("Create Plan", on_click=create_plan_from_template, args=(selected_template, new_plan_name))
+        else:
+            st.write(f"No templates found in {TEMPLATE_DIR}.")
+
+    # Import plans from a file, or export the current plan or all plans
+    with st.expander("Import / Export"):
+        uploader_key = f"import_file_{st.session_state.import_uploader_version}"
+        st.file_uploader("Plan file", type=sorted({extension[1:] for extension in FORMATS}), key=uploader_key)
+        st.text_input("Plan name for rows without a Plan column", key="import_plan_name")
+        st.selectbox("If a plan already exists", IMPORT_MODES, key="import_mode",
+                     help="append: add the tasks to it; replace: re-create it with only the imported tasks; rename: import as \"Name (2)\"")
+        st.button("Import", on_click=import_plan_file, args=(uploader_key,))
+        if st.session_state.get('import_message'):
+            level, text, errors = st.session_state.pop('import_message')
+            getattr(st, level)(text)
+            for row, message in errors:
+                st.caption(f"Row {row}: {message}")
+
+        st.divider()
+        scopes = ["Current plan", "All plans"] if st.session_state.current_plan else ["All plans"]
+        st.radio("Export", scopes, key="export_scope", horizontal=True)
+        st.selectbox("Format", list(EXPORT_FORMATS), key="export_format")
+        st.button("Prepare export", on_click=prepare_export, args=(st.session_state.current_plan,))
+        export_file = st.session_state.get('export_file')
+        if export_file and os.path.exists(export_file['path']):
+            with open(export_file['path'], 'rb') as exported:
+                st.download_button(f"Download {export_file['name']} ({export_file['rows']:,} rows)", exported,
+                                   file_name=export_file['name'], on_click=discard_export)
+
+# Search across every plan's name, tasks and indexed documents; each hit
+# has a button that opens its plan (and, for tasks, finds the task in the grid)
+def render_search():
+    query = st.text_input("Search all plans", key="global_search", placeholder="Tasks, plans, notes, files")
+    if not query.strip():
+        return
+    start = time.perf_counter()
+    try:
+        with profiler.span('sidebar.search'):
+            hits = get_task_store().search(query, limit=SEARCH_RESULTS)
+    except NotImplementedError:
+        st.caption("Search is unavailable with this task store.")
+        return
+    st.caption(f"{len(hits)} result{'s' if len(hits) != 1 else ''} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for position, hit in enumerate(hits):
+        col1, col2 = st.columns([4, 1])
+        col1.markdown(f"{hit['snippet']}  \n:gray[{hit['kind'].capitalize()} · {hit['plan']}]")
+        col2.button("Open", key=f"search_hit_{position}", on_click=open_search_hit, args=(hit,))
+
+# Display Plan Metadata
+def render_plan_details(plan_data):
+    st.sidebar.subheader("Plan Details")
+    st.sidebar.write(f"**Template:** {plan_data['template']}")
+    st.sidebar.write(f"**Privacy:** {plan_data['privacy']}")
+    st.sidebar.write(f"**Last Accessed:** {plan_data['last_accessed'].strftime(TIMESTAMP_FORMAT)}")
+    st.sidebar.write(f"**Shared with:** {', '.join(plan_data['shared_with'])}")
+    st.sidebar.write(f"**Pinned:** {plan_data['pinned']}")
+    st.sidebar.write(f"**Group:** {plan_data['group'] if plan_data['group'] else 'None'}")
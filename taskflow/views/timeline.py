@@ -0,0 +1,61 @@
+# Timeline tab: bulk dating of undated tasks, task dependencies and the Gantt
+# chart with the critical path
+import streamlit as st
+
+from taskflow.figures import timeline_figure
+from taskflow.plans import apply_bulk_dates, apply_dependency_change
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"Timeline View for {plan}")
+    if len(task_model):
+        # Set dates for undated tasks in bulk
+        undated_tasks = task_model.select(dated=False, columns=['Task'])
+        if not undated_tasks.empty:
+            with st.form("bulk_dates_form"):
+                st.write(f"{len(undated_tasks)} tasks have no dates yet.")
+                task_labels = {f"{row['Task']} (#{index})": index for index, row in undated_tasks.iterrows()}
+                st.multiselect("Tasks to schedule (leave empty for all undated tasks)", list(task_labels), key="bulk_tasks")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.date_input("Start Date", key="bulk_start")
+                with col2:
+                    st.date_input("End Date", key="bulk_end")
+                st.form_submit_button("Set Dates", on_click=apply_bulk_dates, args=(plan, task_labels))
+            if st.session_state.get('bulk_dates_error'):
+                st.warning(st.session_state.pop('bulk_dates_error'))
+
+        # Finish-to-start dependencies between tasks, by task id (the grid's id column)
+        with st.expander(f"Dependencies ({len(task_model.dependencies)})"):
+            st.write("A task cannot start before the tasks it depends on have ended. Moving a task moves the tasks that depend on it.")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.number_input("Task id", min_value=1, step=1, key="dependency_predecessor")
+            with col2:
+                st.number_input("must finish before task id", min_value=1, step=1, key="dependency_successor")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("Add dependency", on_click=apply_dependency_change, args=(plan, 'add'))
+            with col2:
+                st.button("Remove dependency", on_click=apply_dependency_change, args=(plan, 'remove'))
+            if st.session_state.get('dependency_error'):
+                st.warning(st.session_state.pop('dependency_error'))
+
+        # Create Gantt chart for the tasks overlapping the visible date window
+        tasks_with_dates = task_model.select(dated=True, columns=['Task', 'Assigned To', 'Start Date', 'End Date'])
+        if not tasks_with_dates.empty:
+            first_date = tasks_with_dates['Start Date'].min().date()
+            last_date = tasks_with_dates['End Date'].max().date()
+            window = st.date_input("Visible dates", value=(first_date, last_date), key=f"timeline_window_{plan}")
+            window_start, window_end = (window[0], window[-1]) if window else (first_date, last_date)
+            critical_tasks = task_model.critical_tasks()
+            fig = timeline_figure(task_model.key, task_model.version, window_start, window_end, tasks_with_dates, critical_tasks)
+            if fig is not None:
+                if critical_tasks:
+                    st.caption(f"{len(critical_tasks)} task(s) on the critical path, outlined in red: delaying any of them delays the plan's end.")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.write("No tasks fall inside the selected dates.")
+        else:
+            st.write("Please set start and end dates for tasks to view the timeline.")
+    else:
+        st.write("No tasks to display in the timeline view.")
@@ -0,0 +1,11 @@
+# Whiteboard tab: plan notes, autosaved to the task store
+import streamlit as st
+
+from taskflow.plans import autosave_note, save_note
+from taskflow.views.notes import render_note
+
+def render(plan, plan_data, task_model):
+    st.subheader(f"Whiteboard for {plan}")
+    widget_key = render_note(plan, 'whiteboard', "Add notes or ideas here:", on_change=autosave_note)
+    st.button("Save Whiteboard Notes", on_click=save_note, args=(plan, 'whiteboard', widget_key))
+    st.write("In a real application, this could integrate a drawing tool or collaborative whiteboard like Miro or Jamboard.")
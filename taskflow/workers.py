@@ -0,0 +1,55 @@
+# Run several TaskFlow servers against one shared SQLite database.
+#
+#     python -m taskflow.workers 4 --port 8501 --db taskflow.db
+#
+# starts `streamlit run taskflow-v1.py` on ports 8501-8504 with
+# TASKFLOW_STORE=sqlite and TASKFLOW_DB_PATH pointing at the shared file, and
+# stops them all on Ctrl+C. Put a load balancer with sticky sessions in front
+# (see DEPLOYMENT.md).
+import argparse
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / 'taskflow-v1.py'
+
+
+# Command line and environment for worker number index
+def worker_command(index, port, db_path, extra_args=()):
+    command = [
+        sys.executable, '-m', 'streamlit', 'run', str(APP_PATH),
+        '--server.port', str(port + index),
+        '--server.headless', 'true',
+        *extra_args
+    ]
+    env = dict(os.environ, TASKFLOW_STORE='sqlite', TASKFLOW_DB_PATH=str(Path(db_path).resolve()))
+    return command, env
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run N TaskFlow workers sharing one SQLite database")
+    parser.add_argument('workers', type=int, help="number of server processes")
+    parser.add_argument('--port', type=int, default=8501, help="port of the first worker; the rest follow consecutively")
+    parser.add_argument('--db', default=os.environ.get('TASKFLOW_DB_PATH', 'taskflow.db'), help="shared database file")
+    args, extra_args = parser.parse_known_args(argv)
+
+    processes = []
+    for index in range(args.workers):
+        command, env = worker_command(index, args.port, args.db, extra_args)
+        processes.append(subprocess.Popen(command, env=env))
+        print(f"worker {index + 1}: http://localhost:{args.port + index}", flush=True)
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        for process in processes:
+            process.wait()
+
+if __name__ == '__main__':
+    main()
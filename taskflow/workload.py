@@ -0,0 +1,76 @@
+# Workload across every plan: per-member task counts and over-allocation,
+# the periods in which a member has more open dated tasks at once than their
+# capacity.
+#
+# Over-allocation is found with an interval sweep over one combined task
+# table: each open dated task becomes a +1 event on its start date and a -1
+# event the day after its (inclusive) end date; sorting the events by member
+# and date and taking a cumulative sum per member gives the number of tasks
+# in progress between consecutive events. Everything is vectorized, so the
+# cost is one sort of 2 x tasks events whatever the number of plans.
+import pandas as pd
+import streamlit as st
+
+from taskflow.profiling import profiler
+from taskflow.storage import get_task_store
+
+WORKLOAD_COLUMNS = ['Status', 'Assigned To', 'Completed', 'Start Date', 'End Date']
+ONE_DAY = pd.Timedelta(days=1)
+
+
+# Per-member counts: plans, tasks, open tasks and tasks per status
+def member_summary(tasks):
+    members = tasks['Assigned To'].astype(object)
+    summary = pd.DataFrame({
+        'Plans': tasks.groupby(members)['Plan'].nunique(),
+        'Tasks': members.value_counts(),
+        'Open': members[~tasks['Completed']].value_counts()
+    })
+    by_status = pd.crosstab(members, tasks['Status'].astype(object))
+    return summary.join(by_status).fillna(0).astype('int64').sort_values('Tasks', ascending=False)
+
+# Start (+1) and end (-1, the day after the inclusive end date) events of the
+# open dated tasks, sorted per member and date, with the number of Tasks in
+# progress from each event's Date until the member's next event
+def sweep(tasks):
+    dated = tasks[~tasks['Completed'] & tasks['Start Date'].notna() & tasks['End Date'].notna()]
+    members = dated['Assigned To'].astype(object)
+    events = pd.concat([
+        pd.DataFrame({'Member': members, 'Date': dated['Start Date'], 'Change': 1}),
+        pd.DataFrame({'Member': members, 'Date': dated['End Date'] + ONE_DAY, 'Change': -1})
+    ], ignore_index=True)
+    # Ends sort before starts on the same day: a task ending the day before another starts doesn't overlap it
+    events = events.sort_values(['Member', 'Date', 'Change'], kind='stable', ignore_index=True)
+    by_member = events.groupby('Member', sort=False)
+    events['Tasks'] = by_member['Change'].cumsum()
+    events['Until'] = by_member['Date'].shift(-1)
+    return events
+
+# Periods in which a member has more than capacity open tasks at once: one
+# row per period with Member, From, To (inclusive) and Tasks in progress
+def overallocated_periods(events, capacity=1):
+    periods = events[(events['Tasks'] > capacity) & (events['Until'] > events['Date'])]
+    return pd.DataFrame({
+        'Member': periods['Member'],
+        'From': periods['Date'],
+        'To': periods['Until'] - ONE_DAY,
+        'Tasks': periods['Tasks']
+    }).reset_index(drop=True)
+
+# Member summary with peak concurrency and over-allocated days, and the
+# over-allocated periods
+@profiler.timed('workload.build')
+def build_workload(tasks, capacity=1):
+    summary = member_summary(tasks)
+    events = sweep(tasks)
+    periods = overallocated_periods(events, capacity)
+    summary['Peak concurrent'] = events.groupby('Member')['Tasks'].max()
+    summary['Over-allocated days'] = ((periods['To'] - periods['From']).dt.days + 1).groupby(periods['Member']).sum()
+    summary = summary.fillna(0).astype('int64')
+    return summary, periods
+
+# Workload of every plan in the store, cached per store data version and capacity
+@st.cache_resource(max_entries=8)
+def get_workload(data_version, capacity):
+    tasks = get_task_store().load_all_tasks(WORKLOAD_COLUMNS)
+    return build_workload(tasks, capacity)
@@ -0,0 +1,34 @@
+# Shared fixtures: plans in a throwaway store, so no test touches taskflow.db
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow.schema import tasks_frame  # noqa: E402
+from taskflow.storage import InMemoryTaskStore, SQLiteTaskStore  # noqa: E402
+
+PLAN_META = {'privacy': 'Private', 'template': 'Custom', 'shared_with': [], 'pinned': False,
+             'group': None, 'ai_assisted': False}
+
+
+# Save a plan holding tasks given as (title, start, end) with dates as
+# 'YYYY-MM-DD'; returns the task ids
+def save_plan(store, plan, tasks):
+    store.save_plan(plan, dict(PLAN_META, last_accessed=datetime.now()))
+    titles, starts, ends = zip(*tasks)
+    task_ids, _ = store.add_tasks(plan, tasks_frame({
+        'Task': list(titles), 'Status': 'To Do', 'Assigned To': 'Unassigned', 'Completed': False,
+        'Start Date': pd.to_datetime(list(starts)), 'End Date': pd.to_datetime(list(ends))
+    }))
+    return task_ids
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return InMemoryTaskStore()
+    return SQLiteTaskStore(str(tmp_path / 'taskflow.db'))
@@ -0,0 +1,175 @@
+# The AI client against a local HTTP stub: retries, timeouts, and failed or
+# malformed responses
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import taskflow.ai as ai
+from taskflow.ai import GenerationCancelled, generate_tasks_with_google_ai
+
+TASKS = ["Draft the agenda", "Book the room"]
+
+
+def reply(status=200, body=None, delay=0):
+    if body is None:
+        body = json.dumps({'text': json.dumps(TASKS)})
+    return status, body, delay
+
+
+# Serves the scripted replies in order, then repeats the last one; records
+# each request's JSON payload and headers
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.replies = [reply()]
+        self.requests = []
+        self.released = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/generate"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server.requests.append((payload, dict(self.headers)))
+        status, body, delay = server.replies[min(len(server.requests), len(server.replies)) - 1]
+        if delay:
+            server.released.wait(delay)
+        data = body.encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(ai, 'GOOGLE_AI_STUDIO_API_URL', server.url)
+    monkeypatch.setattr(ai, 'AI_TIMEOUT', (1, 0.5))
+    monkeypatch.setattr(ai, 'AI_MAX_ATTEMPTS', 3)
+    monkeypatch.setattr(ai, 'AI_BACKOFF_SECONDS', 0.01)
+    yield server
+    server.released.set()
+    server.shutdown()
+    server.server_close()
+
+
+def generate(**kwargs):
+    return generate_tasks_with_google_ai("Plan an offsite", "Two days, twenty people", "", **kwargs)
+
+
+def test_returns_the_generated_tasks(stub):
+    assert generate() == TASKS
+    (payload, headers), = stub.requests
+    assert "Plan an offsite" in payload['prompt']
+    assert payload['max_tokens'] == ai.AI_MODEL_PARAMS['max_tokens']
+    assert headers['Authorization'].startswith('Bearer ')
+
+
+@pytest.mark.parametrize('status', sorted(ai.AI_RETRY_STATUSES))
+def test_retries_transient_failures(stub, status):
+    stub.replies = [reply(status, '{}'), reply()]
+    assert generate() == TASKS
+    assert len(stub.requests) == 2
+
+
+def test_raises_after_the_last_attempt(stub):
+    stub.replies = [reply(503, '{}')]
+    with pytest.raises(requests.HTTPError) as error:
+        generate()
+    assert error.value.response.status_code == 503
+    assert len(stub.requests) == ai.AI_MAX_ATTEMPTS
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.replies = [reply(400, '{"error": "bad prompt"}')]
+    with pytest.raises(requests.HTTPError):
+        generate()
+    assert len(stub.requests) == 1
+
+
+def test_retries_a_timed_out_request(stub):
+    stub.replies = [reply(delay=5), reply()]
+    assert generate() == TASKS
+    assert len(stub.requests) == 2
+
+
+def test_raises_timeout_when_every_attempt_times_out(stub):
+    stub.replies = [reply(delay=5)]
+    with pytest.raises(requests.Timeout):
+        generate()
+    assert len(stub.requests) == ai.AI_MAX_ATTEMPTS
+
+
+def test_retries_refused_connections(monkeypatch):
+    with socket.socket() as unused:
+        unused.bind(('127.0.0.1', 0))
+        port = unused.getsockname()[1]
+    monkeypatch.setattr(ai, 'GOOGLE_AI_STUDIO_API_URL', f"http://127.0.0.1:{port}/generate")
+    monkeypatch.setattr(ai, 'AI_BACKOFF_SECONDS', 0.01)
+    attempts = []
+
+    class CountingSession(requests.Session):
+        def post(self, *args, **kwargs):
+            attempts.append(args)
+            return super().post(*args, **kwargs)
+
+    with pytest.raises(requests.ConnectionError):
+        generate(session=CountingSession())
+    assert len(attempts) == ai.AI_MAX_ATTEMPTS
+
+
+def test_malformed_response_body_raises(stub):
+    stub.replies = [reply(body='<html>Service Unavailable</html>')]
+    with pytest.raises(ValueError):
+        generate()
+    assert len(stub.requests) == 1
+
+
+def test_malformed_task_list_raises(stub):
+    stub.replies = [reply(body=json.dumps({'text': 'Here are your tasks: 1. Draft the agenda'}))]
+    with pytest.raises(ValueError):
+        generate()
+
+
+def test_missing_task_list_means_no_tasks(stub):
+    stub.replies = [reply(body='{}')]
+    assert generate() == []
+
+
+def test_cancelling_stops_retrying(stub):
+    stub.replies = [reply(503, '{}')]
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(GenerationCancelled):
+        generate(cancel_event=cancel_event)
+    assert not stub.requests
+
+
+def test_cancelling_during_backoff(stub, monkeypatch):
+    monkeypatch.setattr(ai, 'AI_BACKOFF_SECONDS', 30)
+    stub.replies = [reply(503, '{}')]
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+    with pytest.raises(GenerationCancelled):
+        generate(cancel_event=cancel_event)
+    assert len(stub.requests) == 1
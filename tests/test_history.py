@@ -0,0 +1,49 @@
+# Plan history: past revisions, restores and re-created plans
+from conftest import save_plan
+from taskflow.state import TaskModel
+
+
+def test_recreated_plan_drops_old_history_notes_and_documents(store):
+    save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02')])
+    store.save_notes({('Alpha', 'whiteboard'): 'Old ideas'})
+    store.index_document('Alpha', 'file', 'brief.txt', 'quarterly zeppelin budget')
+    save_plan(store, 'Alpha', [('Kickoff', '2024-02-01', '2024-02-02')])
+    assert [entry['action'] for entry in store.load_history('Alpha')] == ['add', 'create']
+    assert store.load_note('Alpha', 'whiteboard') == ('', 0)
+    assert store.search('zeppelin') == []
+    revision, _ = store.plan_revision('Alpha')
+    assert list(store.load_tasks_at('Alpha', revision - 1)['Task']) == []
+    assert store.load_tasks_at('Alpha', 1) is None
+
+
+# Revisions 2 and 4 are snapshots, 3 and 5 deltas on top of them
+def edited_plan(store, monkeypatch):
+    monkeypatch.setattr('taskflow.history.HISTORY_SNAPSHOT_CHANGES', 2)
+    task_ids = save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02'),
+                                          ('Review budget', '2024-01-03', '2024-01-04')])
+    for title in ['Draft charter', 'Draft scope', 'Draft plan']:
+        store.update_tasks('Alpha', {task_ids[0]: {'Task': title}})
+    return task_ids
+
+
+def test_load_tasks_at_across_snapshots(store, monkeypatch):
+    edited_plan(store, monkeypatch)
+    assert store.plan_revision('Alpha')[0] == 5
+    titles = {revision: list(store.load_tasks_at('Alpha', revision)['Task']) for revision in range(1, 6)}
+    assert titles == {1: [], 2: ['Draft brief', 'Review budget'], 3: ['Draft charter', 'Review budget'],
+                      4: ['Draft scope', 'Review budget'], 5: ['Draft plan', 'Review budget']}
+    assert [entry['action'] for entry in store.load_history('Alpha')] == ['update'] * 3 + ['add', 'create']
+
+
+def test_restore_across_a_snapshot(store, monkeypatch):
+    task_ids = edited_plan(store, monkeypatch)
+    model = TaskModel(store, 'Alpha')
+    model.update({task_ids[1]: {'Status': 'Completed', 'Completed': True}})
+    assert model.restore(3) == 2
+    model.flush(action='restore', detail="to revision 3")
+    tasks = store.load_tasks('Alpha')
+    assert list(tasks['Task']) == ['Draft charter', 'Review budget']
+    assert list(tasks['Status']) == ['To Do', 'To Do']
+    assert store.load_history('Alpha', limit=1)[0]['action'] == 'restore'
+    # Restoring what the plan already looks like changes nothing
+    assert model.restore(store.plan_revision('Alpha')[0]) == 0
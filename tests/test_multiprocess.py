@@ -0,0 +1,114 @@
+# Several server processes sharing one SQLite file: conflicting flushes raise
+# WriteConflict and refresh() pulls in what the other processes wrote
+import multiprocessing
+
+import pytest
+
+from conftest import save_plan
+from taskflow.state import TaskModel
+from taskflow.storage import SQLiteTaskStore, WriteConflict
+
+PLAN = 'Shared'
+TASKS = [('a', '2024-01-01', '2024-01-02'), ('b', '2024-01-03', '2024-01-04')]
+PROCESSES = 4
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / 'taskflow.db')
+    save_plan(SQLiteTaskStore(path), PLAN, TASKS)
+    return path
+
+
+def run(target, *args):
+    process = multiprocessing.get_context('spawn').Process(target=target, args=args)
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+
+
+# Child processes: each opens its own store on the file, like a server worker
+
+def edit_task(path, task_id, status):
+    model = TaskModel(SQLiteTaskStore(path), PLAN)
+    model.update({task_id: {'Status': status}})
+    model.flush()
+
+
+def add_task(path, title):
+    model = TaskModel(SQLiteTaskStore(path), PLAN)
+    model.add(model.snapshot().iloc[:1].assign(Task=title))
+
+
+def race(path, barrier, results, worker):
+    model = TaskModel(SQLiteTaskStore(path), PLAN)
+    task_id = model.snapshot().index[0]
+    model.update({task_id: {'Task': f"Worker {worker}"}})
+    barrier.wait()
+    try:
+        model.flush()
+        results.put((worker, 'written'))
+    except WriteConflict as error:
+        results.put((worker, list(error.task_ids)))
+
+
+def test_conflicting_flush_raises_and_loads_the_other_write(db):
+    model = TaskModel(SQLiteTaskStore(db), PLAN)
+    first, second = model.snapshot().index
+    run(edit_task, db, first, 'In Progress')
+
+    model.update({first: {'Status': 'Completed'}, second: {'Status': 'Completed'}})
+    with pytest.raises(WriteConflict) as conflict:
+        model.flush()
+    assert list(conflict.value.task_ids) == [first]
+    assert model.snapshot()['Status'].to_dict() == {first: 'In Progress', second: 'Completed'}
+    assert TaskModel(SQLiteTaskStore(db), PLAN).snapshot()['Status'].to_dict() == {first: 'In Progress', second: 'Completed'}
+
+
+def test_only_one_of_racing_flushes_is_written(db):
+    context = multiprocessing.get_context('spawn')
+    barrier, results = context.Barrier(PROCESSES), context.Queue()
+    processes = [context.Process(target=race, args=(db, barrier, results, worker)) for worker in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    outcomes = dict(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    written = [worker for worker, outcome in outcomes.items() if outcome == 'written']
+    assert len(written) == 1
+    task_id = TaskModel(SQLiteTaskStore(db), PLAN).snapshot().index[0]
+    assert all(outcome == [task_id] for worker, outcome in outcomes.items() if worker not in written)
+    assert TaskModel(SQLiteTaskStore(db), PLAN).snapshot().at[task_id, 'Task'] == f"Worker {written[0]}"
+
+
+def test_refresh_picks_up_other_process_writes(db):
+    model = TaskModel(SQLiteTaskStore(db), PLAN)
+    first, second = model.snapshot().index
+    run(edit_task, db, second, 'In Progress')
+    run(add_task, db, 'c')
+
+    model.refresh()
+    tasks = model.snapshot()
+    assert tasks.at[second, 'Status'] == 'In Progress'
+    assert tasks['Task'].tolist() == ['a', 'b', 'c']
+    assert model.count('Status')['In Progress'] == 1
+
+
+def test_flush_advances_the_revision(db):
+    store = SQLiteTaskStore(db)
+    model = TaskModel(store, PLAN)
+    first, second = model.snapshot().index
+    model.update({first: {'Status': 'Completed'}})
+    model.flush()
+    assert model.revision == store.plan_revision(PLAN)[0]
+
+    # Another process wrote before this flush: its write is still pulled in
+    run(edit_task, db, second, 'In Progress')
+    model.update({first: {'Status': 'To Do'}})
+    model.flush()
+    assert model.revision < store.plan_revision(PLAN)[0]
+    model.refresh()
+    assert model.revision == store.plan_revision(PLAN)[0]
+    assert model.snapshot()['Status'].to_dict() == {first: 'To Do', second: 'In Progress'}
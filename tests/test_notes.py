@@ -0,0 +1,59 @@
+# Plan notes: deltas, compaction into snapshots and replay from the store
+import atexit
+
+import pytest
+
+from conftest import save_plan
+from taskflow.notes import next_revision, replay, text_delta
+from taskflow.state import NoteWriter
+
+
+def test_text_delta_and_replay():
+    old, new = "Plan the offsite in May", "Plan the team offsite in June"
+    start, stop, body = text_delta(old, new)
+    assert (start, stop, body) == (9, 23, "team offsite in June")
+    assert replay([(1, None, None, old), (0, start, stop, body)]) == new
+    assert text_delta("same", "same") == (4, 4, "")
+    assert replay([]) == ''
+
+
+def test_next_revision_compacts(monkeypatch):
+    monkeypatch.setattr('taskflow.notes.NOTE_COMPACT_REVISIONS', 3)
+    text = "A long enough whiteboard note"
+    assert next_revision(text, text + "!", 0) == (0, len(text), len(text), "!")
+    assert next_revision(text, text + "!", 2) == (1, None, None, text + "!")
+    # An edit replacing most of the text is saved as a snapshot
+    assert next_revision(text, "Short", 0) == (1, None, None, "Short")
+
+
+@pytest.fixture
+def plan(store):
+    save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02')])
+    return 'Alpha'
+
+
+def test_notes_replay_across_compactions(store, plan, monkeypatch):
+    monkeypatch.setattr('taskflow.notes.NOTE_COMPACT_REVISIONS', 4)
+    text = "Ideas:"
+    for number in range(11):
+        text += f"\n- idea {number}"
+        assert store.save_notes({(plan, 'whiteboard'): text}) == {(plan, 'whiteboard'): number + 1}
+        assert store.load_note(plan, 'whiteboard') == (text, number + 1)
+    # Unchanged text doesn't add a revision; other notes are kept apart
+    assert store.save_notes({(plan, 'whiteboard'): text, (plan, 'goals'): "Ship it"}) == {
+        (plan, 'whiteboard'): 11, (plan, 'goals'): 1}
+    assert store.load_note(plan, 'goals') == ("Ship it", 1)
+    assert store.load_note(plan, 'missing') == ('', 0)
+
+
+def test_note_writer_debounces_and_indexes(store, plan):
+    writer = NoteWriter(store, interval=60)
+    atexit.unregister(writer.flush)
+    writer.submit(plan, 'goals', "Draft")
+    writer.submit(plan, 'goals', "Draft the zeppelin plan")
+    assert writer.load(plan, 'goals') == ("Draft the zeppelin plan", 0, True)
+    assert store.load_note(plan, 'goals') == ('', 0)
+    writer.flush()
+    assert writer.writes == 1
+    assert writer.load(plan, 'goals') == ("Draft the zeppelin plan", 1, False)
+    assert [hit['kind'] for hit in store.search('zeppelin')] == ['goals']
@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import save_plan
+from taskflow.state import SharedPlanCache
+from taskflow.storage import InMemoryTaskStore
+
+TASKS = [('a', '2024-01-01', '2024-01-02')]
+
+
+# Loading the plan 'Slow' blocks until release is set
+class SlowStore(InMemoryTaskStore):
+    def __init__(self):
+        super().__init__()
+        self.loading = threading.Event()
+        self.release = threading.Event()
+        self.loads = 0
+        self.fail = False
+
+    def load_tasks(self, plan, **kwargs):
+        if plan == 'Slow':
+            self.loads += 1
+            self.loading.set()
+            assert self.release.wait(10)
+            if self.fail:
+                raise OSError("disk unavailable")
+        return super().load_tasks(plan, **kwargs)
+
+
+@pytest.fixture
+def store():
+    store = SlowStore()
+    save_plan(store, 'Slow', TASKS)
+    save_plan(store, 'Fast', TASKS)
+    return store
+
+
+def test_other_plans_load_while_one_is_loading(store):
+    cache = SharedPlanCache(store)
+    with ThreadPoolExecutor(2) as pool:
+        slow = pool.submit(cache.model, 'Slow')
+        assert store.loading.wait(10)
+        assert len(cache.model('Fast')) == 1
+        assert not slow.done()
+        store.release.set()
+        assert len(slow.result(10)) == 1
+
+
+def test_sessions_wait_for_the_same_load(store):
+    cache = SharedPlanCache(store)
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(cache.model, 'Slow')
+        assert store.loading.wait(10)
+        others = [pool.submit(cache.model, 'Slow') for _ in range(3)]
+        store.release.set()
+        models = {id(future.result(10)) for future in [first, *others]}
+    assert len(models) == 1
+    assert store.loads == 1
+    assert cache.model('Slow') is first.result()
+
+
+def test_failed_load_is_raised_to_every_waiter_and_retried(store):
+    cache = SharedPlanCache(store)
+    store.fail = True
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(cache.model, 'Slow')
+        assert store.loading.wait(10)
+        second = pool.submit(cache.model, 'Slow')
+        store.release.set()
+        for future in (first, second):
+            with pytest.raises(OSError):
+                future.result(10)
+    store.fail = False
+    assert len(cache.model('Slow')) == 1
+
+
+def test_least_recently_used_models_are_flushed_and_evicted(store):
+    cache = SharedPlanCache(store, max_plans=1)
+    store.release.set()
+    slow = cache.model('Slow')
+    task_id = slow.snapshot().index[0]
+    slow.update({task_id: {'Status': 'Completed'}})
+    cache.model('Fast')
+    assert store.load_tasks('Slow').at[task_id, 'Status'] == 'Completed'
+    assert cache.model('Slow') is not slow
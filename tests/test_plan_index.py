@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from conftest import PLAN_META
+from taskflow.state import PlanIndex
+
+
+def test_recent_orders_by_last_access_with_never_accessed_plans_last(store):
+    store.save_plan('Old', dict(PLAN_META, last_accessed=datetime(2024, 1, 1)))
+    store.save_plan('New', dict(PLAN_META, last_accessed=datetime(2024, 6, 1)))
+    store.save_plan('Unopened', dict(PLAN_META, last_accessed=None))
+    store.save_plan('Imported', dict(PLAN_META, last_accessed=None))
+    index = PlanIndex(store.list_plans())
+    assert index.filter('Recent') == ['New', 'Old', 'Imported', 'Unopened']
+
+    index.add('Unopened', dict(PLAN_META, last_accessed=datetime(2024, 7, 1)))
+    assert index.filter('Recent') == ['Unopened', 'New', 'Old', 'Imported']
+    index.remove('Imported')
+    assert index.filter('Recent') == ['Unopened', 'New', 'Old']
@@ -0,0 +1,58 @@
+# Prompt budgeting: chunking file text and merging the tasks generated per chunk
+from taskflow.config import AI_CHARS_PER_TOKEN, AI_MAX_CHUNKS
+from taskflow.prompts import chunk_file_data, estimate_tokens, merge_tasks
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('a' * (AI_CHARS_PER_TOKEN + 1)) == 2
+
+
+def test_small_files_share_a_chunk():
+    assert chunk_file_data({'a.txt': 'Alpha.', 'b.txt': 'Beta.'}, 100) == ["[a.txt]\nAlpha.\n\n[b.txt]\nBeta."]
+    assert chunk_file_data({'a.txt': '  '}, 100) == []
+
+
+def test_chunks_fit_the_budget_and_cut_at_boundaries():
+    paragraphs = [f"Paragraph {number} " + "word " * 30 for number in range(20)]
+    text = "\n\n".join(paragraphs)
+    chunks = chunk_file_data({'report.txt': text}, 100)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 * AI_CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.startswith('[report.txt]\nParagraph') for chunk in chunks)
+    assert "".join(chunks).count("Paragraph") == 20
+
+
+def test_oversized_paragraphs_are_split_by_sentence_then_word():
+    sentences = " ".join(f"Sentence {number} goes here." for number in range(50))
+    chunks = chunk_file_data(sentences, 10)
+    assert all(len(chunk) <= 10 * AI_CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.endswith('.') for chunk in chunks)
+    unbroken = chunk_file_data('x' * 100, 10)
+    assert unbroken == ['x' * 40, 'x' * 40, 'x' * 20]
+
+
+def test_chunk_count_is_capped():
+    assert len(chunk_file_data('word ' * 100000, 10)) == AI_MAX_CHUNKS
+
+
+def test_editing_one_part_keeps_the_other_chunks():
+    paragraphs = [f"Section {number}. " + "detail " * 50 for number in range(6)]
+    before = chunk_file_data("\n\n".join(paragraphs), 150)
+    paragraphs[-1] += "One more sentence."
+    after = chunk_file_data("\n\n".join(paragraphs), 150)
+    assert before[:-1] == after[:-1]
+
+
+def test_merge_tasks_drops_duplicates_keeping_the_first_wording():
+    merged = merge_tasks([
+        ["Draft the project brief", "Review budget", "", None],
+        ["draft the project brief!", "Review the budget", "Schedule kickoff meeting"],
+        ["Schedule kick-off meeting"],
+    ])
+    assert merged == ["Draft the project brief", "Review budget", "Schedule kickoff meeting"]
+
+
+def test_merge_tasks_keeps_numbered_tasks_apart():
+    assert merge_tasks([["Phase 1 review"], ["Phase 2 review", "Phase 1 review."]]) == ["Phase 1 review", "Phase 2 review"]
+    assert merge_tasks([["Review budget"], ["Review the budget"]], similarity=1.0) == ["Review budget", "Review the budget"]
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from conftest import save_plan
+from taskflow.scheduling import DependencyGraph
+from taskflow.state import TaskModel
+
+# b starts before a ends and c before b ends, so chaining a -> b -> c moves both
+CHAIN = [('a', '2024-01-01', '2024-01-05'), ('b', '2024-01-03', '2024-01-04'), ('c', '2024-01-02', '2024-01-02')]
+CHAINED = [('2024-01-01', '2024-01-05'), ('2024-01-06', '2024-01-07'), ('2024-01-08', '2024-01-08')]
+
+
+def dates(model):
+    tasks = model.snapshot()
+    return [(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')) for start, end in zip(tasks['Start Date'], tasks['End Date'])]
+
+
+def test_propagate_keeps_pinned_tasks():
+    graph = DependencyGraph([(1, 2), (2, 3)])
+    starts = pd.Series(pd.to_datetime(['2024-01-01', '2024-01-03', '2024-01-02']), index=[1, 2, 3])
+    ends = pd.Series(pd.to_datetime(['2024-01-05', '2024-01-04', '2024-01-02']), index=[1, 2, 3])
+    assert set(graph.propagate([1, 2], starts, ends)) == {3}
+    shifted = graph.propagate([1, 2], starts, ends, pinned=())
+    assert shifted == {2: (pd.Timestamp('2024-01-06'), pd.Timestamp('2024-01-07')),
+                       3: (pd.Timestamp('2024-01-08'), pd.Timestamp('2024-01-08'))}
+
+
+def test_batched_dependencies_move_tasks_like_one_by_one(store):
+    a, b, c = save_plan(store, 'Batched', CHAIN)
+    batched = TaskModel(store, 'Batched')
+    batched.add_dependencies([(a, b), (b, c)])
+
+    a, b, c = save_plan(store, 'Single', CHAIN)
+    single = TaskModel(store, 'Single')
+    single.add_dependencies([(a, b)])
+    single.add_dependencies([(b, c)])
+
+    assert dates(batched) == dates(single) == CHAINED
@@ -0,0 +1,50 @@
+# Sidebar search: FTS5 (SQLite) and the InvertedIndex (in-memory store) stay in
+# step with task edits, re-created plans and plans imported under a new name
+import io
+
+from conftest import save_plan
+from taskflow.search import InvertedIndex
+from taskflow.transfer import import_plans
+
+
+def hits(store, text):
+    return sorted((hit['kind'], hit['plan'], hit['title']) for hit in store.search(text))
+
+
+def test_task_edits_update_search(store):
+    task_ids = save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02'),
+                                          ('Review budget', '2024-01-03', '2024-01-04')])
+    store.update_tasks('Alpha', {task_ids[0]: {'Task': 'Write charter', 'Assigned To': 'Mira'}})
+    assert hits(store, 'brief') == []
+    assert hits(store, 'charter') == [('task', 'Alpha', 'Write charter')]
+    assert hits(store, 'mira') == [('task', 'Alpha', 'Write charter')]
+    assert hits(store, 'budg') == [('task', 'Alpha', 'Review budget')]
+
+
+def test_recreated_plan_is_searched_once(store):
+    save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02')])
+    store.index_document('Alpha', 'file', 'notes.txt', 'zeppelin hangar')
+    save_plan(store, 'Alpha', [('Book venue', '2024-02-01', '2024-02-02')])
+    assert hits(store, 'alpha') == [('plan', 'Alpha', 'Alpha')]
+    assert hits(store, 'brief') == []
+    assert hits(store, 'zeppelin') == []
+    assert hits(store, 'venue') == [('task', 'Alpha', 'Book venue')]
+
+
+def test_plan_imported_under_new_name_is_searchable(store):
+    save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02')])
+    report = import_plans(store, io.BytesIO(b"Task\nDraft outline\n"), 'csv', 'Alpha', 'rename')
+    assert list(report['plans']) == ['Alpha (2)']
+    assert hits(store, 'draft') == [('task', 'Alpha', 'Draft brief'), ('task', 'Alpha (2)', 'Draft outline')]
+    assert ('plan', 'Alpha (2)', 'Alpha (2)') in hits(store, 'alpha')
+
+
+def test_inverted_index_remove_where():
+    index = InvertedIndex()
+    index.add(('file', 'Alpha', 'a.txt'), 'a', 'shared word')
+    index.add(('file', 'Beta', 'b.txt'), 'b', 'shared word')
+    index.remove_where(lambda key: key[1] == 'Alpha')
+    assert len(index) == 1
+    assert [payload for _, payload, _ in index.search('shared')] == ['b']
+    index.remove_where(lambda key: True)
+    assert index.search('shared') == []
@@ -0,0 +1,64 @@
+# Plan import and export: validation, import modes and format round trips
+import io
+
+import pandas as pd
+import pytest
+
+from conftest import save_plan
+from taskflow.config import TASK_COLUMNS
+from taskflow.transfer import EXPORT_FORMATS, export_plans, import_plans
+
+CSV = b"""title,state,owner,done,start,due,privacy
+Draft brief,doing,Mira,no,2024-01-01,2024-01-05,private
+Review budget,,,yes,2024-01-02,2024-01-03,
+Bad status,someday,,,,,
+Bad dates,,,,2024-02-05,2024-02-01,
+,,,,,,
+"""
+
+
+def test_import_validates_rows(store):
+    report = import_plans(store, io.BytesIO(CSV), 'csv', 'Alpha')
+    assert report['imported'] == 2
+    assert report['skipped'] == 1
+    assert report['errors'] == [(3, "unknown status"), (4, "End Date is before Start Date")]
+    tasks = store.load_tasks('Alpha').sort_values('Task')
+    assert list(tasks['Status']) == ['In Progress', 'Completed']
+    assert list(tasks['Completed']) == [False, True]
+    assert list(tasks['Assigned To']) == ['Mira', 'Unassigned']
+    assert store.list_plans()['Alpha']['privacy'] == 'Private'
+
+
+def test_import_needs_a_task_column_and_plan(store):
+    with pytest.raises(ValueError, match="No task column"):
+        import_plans(store, io.BytesIO(b"owner\nMira\n"), 'csv', 'Alpha')
+    with pytest.raises(ValueError, match="plan name is required"):
+        import_plans(store, io.BytesIO(b"task\nDraft brief\n"), 'csv')
+    with pytest.raises(ValueError, match="Unknown import mode"):
+        import_plans(store, io.BytesIO(b"task\nDraft brief\n"), 'csv', 'Alpha', 'merge')
+
+
+@pytest.mark.parametrize('mode, expected', [('append', ['Draft brief', 'Kickoff']), ('replace', ['Kickoff'])])
+def test_import_modes(store, mode, expected):
+    save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-02')])
+    report = import_plans(store, io.BytesIO(b"task\nKickoff\n"), 'csv', 'Alpha', mode)
+    assert list(report['plans']) == ['Alpha']
+    assert sorted(store.load_tasks('Alpha')['Task']) == expected
+
+
+@pytest.mark.parametrize('file_format', list(EXPORT_FORMATS))
+def test_export_import_round_trip(store, tmp_path, file_format):
+    task_ids = save_plan(store, 'Alpha', [('Draft brief', '2024-01-01', '2024-01-05'),
+                                          ('Review budget', '2024-01-02', '2024-01-03')])
+    store.update_tasks('Alpha', {task_ids[1]: {'Status': 'Completed', 'Completed': True, 'Assigned To': 'Mira'}})
+    store.save_plan('Empty', {'privacy': 'Shared', 'shared_with': ['Leadership'], 'pinned': True})
+    path = str(tmp_path / f"plans{EXPORT_FORMATS[file_format]}")
+    assert export_plans(store, path, file_format=file_format) == 3
+
+    with open(path, 'rb') as exported:
+        report = import_plans(store, exported, file_format, mode='rename')
+    assert report['plans'] == {'Alpha (2)': 2, 'Empty (2)': 0}
+    original, copy = (store.load_tasks(plan)[TASK_COLUMNS].reset_index(drop=True) for plan in ['Alpha', 'Alpha (2)'])
+    pd.testing.assert_frame_equal(copy, original, check_categorical=False)
+    meta = store.list_plans()['Empty (2)']
+    assert meta['shared_with'] == ['Leadership'] and meta['pinned']
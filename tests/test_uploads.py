@@ -0,0 +1,25 @@
+# Upload spool: files are keyed by name and content
+import io
+import os
+
+from taskflow.uploads import UploadSpool
+
+
+def upload(name, data):
+    uploaded_file = io.BytesIO(data)
+    uploaded_file.name = name
+    return uploaded_file
+
+
+def test_changed_file_replaces_the_upload_with_its_name(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+    first = spool.add(upload('brief.txt', b'first draft'))
+    assert spool.add(upload('brief.txt', b'first draft')) is first
+    spool.add(upload('notes.txt', b'notes'))
+    second = spool.add(upload('brief.txt', b'second draft'))
+    assert [entry['name'] for entry in spool.files.values()] == ['notes.txt', 'brief.txt']
+    assert not os.path.exists(first['path'])
+    assert second['size'] == len(b'second draft')
+    assert spool.extractions()['brief.txt'].result(timeout=10) == 'second draft'
+    spool.clear()
+    assert spool.files == {} and os.listdir(spool.directory) == []
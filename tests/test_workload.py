@@ -0,0 +1,42 @@
+# Workload: per-member summary and the over-allocation sweep across plans
+import pandas as pd
+
+from conftest import save_plan
+from taskflow.workload import WORKLOAD_COLUMNS, build_workload
+
+
+# Mira has A1 (Jan 1-5), A2 (Jan 3-4), B1 (Jan 4-8) and B3 (Jan 9-10) open:
+# two tasks on Jan 3, three on Jan 4, two on Jan 5, and B3 starts the day after
+# B1 ends. Omar's A3 is completed and B2 (Jan 3) never overlaps anything.
+def workload_tasks(store):
+    alpha = save_plan(store, 'Alpha', [('A1', '2024-01-01', '2024-01-05'), ('A2', '2024-01-03', '2024-01-04'),
+                                       ('A3', '2024-01-01', '2024-01-02')])
+    beta = save_plan(store, 'Beta', [('B1', '2024-01-04', '2024-01-08'), ('B2', '2024-01-03', '2024-01-03'),
+                                     ('B3', '2024-01-09', '2024-01-10')])
+    store.update_tasks('Alpha', {alpha[0]: {'Assigned To': 'Mira'}, alpha[1]: {'Assigned To': 'Mira'},
+                                 alpha[2]: {'Assigned To': 'Omar', 'Status': 'Completed', 'Completed': True}})
+    store.update_tasks('Beta', {beta[0]: {'Assigned To': 'Mira'}, beta[1]: {'Assigned To': 'Omar'},
+                                beta[2]: {'Assigned To': 'Mira'}})
+    return store.load_all_tasks(WORKLOAD_COLUMNS)
+
+
+def test_member_summary(store):
+    summary, _ = build_workload(workload_tasks(store))
+    assert summary.loc['Mira'].to_dict() == {'Plans': 2, 'Tasks': 4, 'Open': 4, 'Completed': 0, 'To Do': 4,
+                                             'Peak concurrent': 3, 'Over-allocated days': 3}
+    assert summary.loc['Omar'].to_dict() == {'Plans': 2, 'Tasks': 2, 'Open': 1, 'Completed': 1, 'To Do': 1,
+                                             'Peak concurrent': 1, 'Over-allocated days': 0}
+
+
+def test_overallocated_periods(store):
+    tasks = workload_tasks(store)
+    _, periods = build_workload(tasks)
+    expected = pd.DataFrame({'Member': ['Mira'] * 3,
+                             'From': pd.to_datetime(['2024-01-03', '2024-01-04', '2024-01-05']),
+                             'To': pd.to_datetime(['2024-01-03', '2024-01-04', '2024-01-05']),
+                             'Tasks': [2, 3, 2]})
+    pd.testing.assert_frame_equal(periods, expected, check_dtype=False)
+    _, periods = build_workload(tasks, capacity=2)
+    assert periods[['Member', 'Tasks']].values.tolist() == [['Mira', 3]]
+    _, periods = build_workload(tasks, capacity=3)
+    assert periods.empty